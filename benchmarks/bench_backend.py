@@ -0,0 +1,43 @@
+"""
+numpy backend against the numba backend (compiled fused kernels, multithreaded for large arrays).
+
+Usage: python benchmarks/bench_backend.py
+"""
+import timeit
+
+import numpy as np
+
+from twopiece.backend import use_backend
+from twopiece.scale import tpnorm, tplaplace, tpgennorm, tpsas
+from twopiece.sinharcsinh import sinhasinh
+
+
+def best_time(func, repeat=5):
+    return min(timeit.repeat(func, number=1, repeat=repeat))
+
+
+def main():
+    cases = [
+        ('tpnorm', tpnorm(loc=0.5, sigma1=1.0, sigma2=2.0)),
+        ('tplaplace', tplaplace(loc=0.5, sigma1=1.0, sigma2=2.0)),
+        ('tpgennorm', tpgennorm(loc=0.5, sigma1=1.0, sigma2=2.0, shape=1.5)),
+        ('tpsas', tpsas(loc=0.5, sigma1=1.0, sigma2=2.0, shape=0.8)),
+        ('sinhasinh', sinhasinh(loc=0.5, scale=2.0, delta=1.5, epsilon=0.2)),
+    ]
+    print(f"{'distribution':<14}{'method':<8}{'size':>10}{'numpy (ms)':>12}{'numba (ms)':>12}{'speed up':>10}")
+    for size in [10 ** 4, 10 ** 6, 10 ** 7]:
+        x = np.random.default_rng(2022).uniform(-6, 6, size)
+        q = np.random.default_rng(2022).random(size)
+        for name, dist in cases:
+            for method, values in [('pdf', x), ('cdf', x), ('ppf', q)]:
+                func = getattr(dist, method)
+                with use_backend('numba'):
+                    func(values[:10])  # compile
+                    compiled = best_time(lambda: func(values))
+                reference = best_time(lambda: func(values))
+                print(f'{name:<14}{method:<8}{size:>10}{1e3 * reference:>12.2f}{1e3 * compiled:>12.2f}'
+                      f'{reference / compiled:>10.1f}')
+
+
+if __name__ == '__main__':
+    main()
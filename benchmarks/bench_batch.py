@@ -0,0 +1,34 @@
+"""
+Wall time of fitting many independent series sequentially and with fit_batch on thread and process pools.
+
+Usage: python benchmarks/bench_batch.py
+"""
+import os
+import time
+
+import numpy as np
+
+from twopiece.batch import fit_batch
+from twopiece.scale import tpstudent
+
+
+def main(series=400, length=2000):
+    np.random.seed(0)
+    dist = tpstudent(loc=0.0, sigma1=1.0, sigma2=2.0, shape=5.0)
+    samples = dist.random_sample((series, length))
+
+    start = time.perf_counter()
+    for data in samples:
+        dist.fit(data)
+    t_sequential = time.perf_counter() - start
+    print(f'{series} series of {length}: sequential {t_sequential:.2f}s')
+
+    for executor in ('thread', 'process'):
+        for chunksize in (1, 16):
+            result = fit_batch(dist, samples, executor=executor, chunksize=chunksize)
+            print(f'  {executor} pool, {os.cpu_count()} workers, chunksize={chunksize}: {result.elapsed:.2f}s '
+                  f'(fit time {result.fit_time:.2f}s)  x{t_sequential / result.elapsed:.1f}')
+
+
+if __name__ == '__main__':
+    main()
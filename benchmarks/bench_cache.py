@@ -0,0 +1,30 @@
+"""
+Construction cost of the classes with shape parameters with and without the cache of frozen base distributions.
+
+Usage: python benchmarks/bench_cache.py
+"""
+import timeit
+
+from twopiece.cache import FROZEN_CACHE
+from twopiece.scale import tpstudent
+from twopiece.double import dtpstudent
+
+
+def main(number=2000):
+    cases = [
+        ('tpstudent', lambda: tpstudent(loc=0.0, sigma1=1.0, sigma2=2.0, shape=4.0)),
+        ('dtpstudent', lambda: dtpstudent(loc=0.0, sigma1=1.0, sigma2=2.0, shape1=3.0, shape2=5.0)),
+    ]
+    maxsize = FROZEN_CACHE.maxsize
+    for name, construct in cases:
+        FROZEN_CACHE.resize(0)
+        t_uncached = min(timeit.repeat(construct, number=number, repeat=3)) / number
+        FROZEN_CACHE.resize(maxsize)
+        t_cached = min(timeit.repeat(construct, number=number, repeat=3)) / number
+        print(f'{name}: uncached {t_uncached * 1e6:.1f}us  cached {t_cached * 1e6:.1f}us  '
+              f'x{t_uncached / t_cached:.0f}')
+    print(FROZEN_CACHE.info())
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,40 @@
+"""
+Wall time and peak memory (tracemalloc) of random_sample against random_sample_chunked for a large sample.
+
+Usage: python benchmarks/bench_chunked.py
+"""
+import os
+import time
+import tracemalloc
+
+import numpy as np
+
+from twopiece.scale import tpstudent
+
+
+def measure(func):
+    tracemalloc.start()
+    start = time.perf_counter()
+    func()
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return elapsed, peak
+
+
+def main(size=5 * 10 ** 7):
+    dist = tpstudent(loc=0.0, sigma1=1.0, sigma2=2.0, shape=4.0)
+    out = np.empty(size)
+    output_mb = out.nbytes / 2 ** 20
+
+    elapsed, peak = measure(lambda: dist.random_sample(size, random_state=0))
+    print(f'random_sample n={size}: {elapsed:.2f}s  peak {peak / 2 ** 20:.0f}MB (output {output_mb:.0f}MB)')
+    for workers in sorted({1, 2, os.cpu_count() or 1}):
+        elapsed, peak = measure(lambda: dist.random_sample_chunked(size, out=out, random_state=0,
+                                                                   max_workers=workers))
+        print(f'random_sample_chunked into out, {workers} threads: {elapsed:.2f}s  '
+              f'peak {peak / 2 ** 20:.0f}MB on top of out')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,35 @@
+"""
+Per-call cost of the closed form base distributions against scipy.stats on small and large arrays.
+
+Usage: python benchmarks/bench_closedform.py
+"""
+import timeit
+
+import numpy as np
+import scipy.stats
+
+from twopiece.scale import tpnorm, tplaplace, tplogistic, tpcauchy, pdf_tp_generic, cdf_tp_generic, qqf_tp_generic
+
+
+def main(sizes=(10, 1000, 10 ** 6)):
+    families = [(tpnorm, scipy.stats.norm), (tplaplace, scipy.stats.laplace),
+                (tplogistic, scipy.stats.logistic), (tpcauchy, scipy.stats.cauchy)]
+    for size in sizes:
+        x = np.linspace(-5, 5, size)
+        q = np.linspace(0.001, 0.999, size)
+        number = max(1, 10 ** 5 // size)
+        print(f'size={size}')
+        for dist, f in families:
+            z = dist(loc=0.0, sigma1=1.0, sigma2=2.0)
+            for name, fast, slow in (
+                    ('pdf', lambda: z.pdf(x), lambda: pdf_tp_generic(x, f.pdf, 0.0, 1.0, 2.0)),
+                    ('cdf', lambda: z.cdf(x), lambda: cdf_tp_generic(x, f.cdf, 0.0, 1.0, 2.0)),
+                    ('ppf', lambda: z.ppf(q), lambda: qqf_tp_generic(q, f.ppf, 0.0, 1.0, 2.0))):
+                t_fast = min(timeit.repeat(fast, number=number, repeat=3)) / number
+                t_slow = min(timeit.repeat(slow, number=number, repeat=3)) / number
+                print(f'  {dist.__name__}.{name}: scipy {t_slow * 1e6:.1f}us  closed form {t_fast * 1e6:.1f}us  '
+                      f'x{t_slow / t_fast:.1f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,27 @@
+"""
+Fan charts per second: quantile bands of many scenario fans computed in one vectorised call.
+
+Usage: python benchmarks/bench_fan.py
+"""
+import timeit
+
+import numpy as np
+
+from twopiece.fan import fan_chart
+
+
+def main(horizons=12, repeat=5):
+    rng = np.random.default_rng(2022)
+    print(f"{'scenarios':>10}{'time (ms)':>12}{'fans per second':>18}")
+    for scenarios in [1, 100, 1000, 10000]:
+        mode = rng.normal(2.0, 0.5, (scenarios, horizons))
+        uncertainty = rng.uniform(0.5, 1.5, (scenarios, horizons))
+        skewness = rng.uniform(-0.5, 0.5, (scenarios, horizons))
+        number = max(1, 1000 // scenarios)
+        best = min(timeit.repeat(lambda: fan_chart(mode, uncertainty, skewness), number=number, repeat=repeat))
+        elapsed = best / number
+        print(f'{scenarios:>10}{1e3 * elapsed:>12.2f}{scenarios / elapsed:>18.0f}')
+
+
+if __name__ == '__main__':
+    main()
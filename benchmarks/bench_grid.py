@@ -0,0 +1,43 @@
+"""
+Grid evaluation against pointwise evaluation: the pdf on a grid refined four times and then extended, as in an
+adaptive plot or quadrature, evaluated from scratch with pdf and incrementally with pdf_grid.
+
+Usage: python benchmarks/bench_grid.py
+"""
+import timeit
+
+from twopiece.grid import grid_points
+from twopiece.scale import tpnorm, tpstudent
+from twopiece.double import dtpgennorm
+from twopiece.sinharcsinh import sinhasinh
+
+GRIDS = [(-10, 0.01 / 2 ** k, 2000 * 2 ** k) for k in range(5)] + [(-20, 0.01 / 16, 64000)]
+
+
+def main(repeat=5):
+    cases = [
+        tpnorm(loc=0.0, sigma1=1.0, sigma2=2.0),
+        tpstudent(loc=0.0, sigma1=1.0, sigma2=2.0, shape=4.0),
+        dtpgennorm(loc=0.0, sigma1=1.0, sigma2=2.0, shape1=1.5, shape2=3.0),
+        sinhasinh(loc=0.0, scale=2.0, delta=0.8, epsilon=0.4),
+    ]
+    print(f"{'distribution':<14}{'pdf (ms)':>10}{'pdf_grid (ms)':>15}{'repeated grid (us)':>20}")
+    for dist in cases:
+        def pointwise():
+            for grid in GRIDS:
+                dist.pdf(grid_points(*grid))
+
+        def incremental():
+            dist.__dict__.pop('_grid_cache', None)
+            for grid in GRIDS:
+                dist.pdf_grid(*grid)
+
+        t_pointwise = min(timeit.repeat(pointwise, number=1, repeat=repeat))
+        t_incremental = min(timeit.repeat(incremental, number=1, repeat=repeat))
+        t_repeated = min(timeit.repeat(lambda: dist.pdf_grid(*GRIDS[-1]), number=1000, repeat=repeat)) / 1000
+        print(f'{type(dist).__name__:<14}{1e3 * t_pointwise:>10.2f}{1e3 * t_incremental:>15.2f}'
+              f'{1e6 * t_repeated:>20.2f}')
+
+
+if __name__ == '__main__':
+    main()
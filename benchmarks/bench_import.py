@@ -0,0 +1,42 @@
+"""
+Import time of the numerical modules of the package, in a fresh interpreter per run, against the import time of
+the plotting modules that they no longer load. Exits with status 1 if importing the package loads matplotlib or
+seaborn, so it can be used as a check.
+
+Usage: python benchmarks/bench_import.py
+"""
+import subprocess
+import sys
+import time
+
+CORE = 'twopiece.scale, twopiece.double, twopiece.shape, twopiece.sinharcsinh'
+
+
+def import_time(modules, repeat=5):
+    # Best wall time of a fresh interpreter importing the modules, minus the bare interpreter start up
+    def run(code):
+        best = float('inf')
+        for _ in range(repeat):
+            start = time.perf_counter()
+            subprocess.run([sys.executable, '-c', code], check=True)
+            best = min(best, time.perf_counter() - start)
+        return best
+
+    return run(f'import {modules}') - run('pass')
+
+
+def main():
+    code = f'import sys, {CORE}; sys.exit(any(m in sys.modules for m in ("matplotlib", "seaborn")))'
+    loads_plotting = subprocess.run([sys.executable, '-c', code]).returncode != 0
+
+    print(f"{'modules':<40}{'import (ms)':>14}")
+    for label, modules in [('numpy, scipy.stats', 'numpy, scipy.stats'),
+                           ('twopiece core', CORE),
+                           ('matplotlib.pyplot, seaborn', 'matplotlib.pyplot, seaborn')]:
+        print(f'{label:<40}{1e3 * import_time(modules):>14.1f}')
+    print(f'twopiece core loads plotting modules: {loads_plotting}')
+    return 1 if loads_plotting else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,77 @@
+"""
+Peak memory and runtime of the generic two piece functions against the former boolean mask implementation.
+
+Usage: python benchmarks/bench_kernel.py [size]
+"""
+import sys
+import timeit
+import tracemalloc
+
+import numpy as np
+import scipy.stats
+
+from twopiece.scale import pdf_tp_generic, cdf_tp_generic
+from twopiece.double import pdf_tpd_generic
+
+
+def masked_pdf_tp(x, pdf, loc, sigma1, sigma2):
+    aux = 2 / (sigma1 + sigma2)
+    output = np.empty(x.size)
+    index = x < loc
+    output[index] = aux * pdf((x[index] - loc) / sigma1)
+    index = x >= loc
+    output[index] = aux * pdf((x[index] - loc) / sigma2)
+    return output
+
+
+def masked_cdf_tp(x, cdf, loc, sigma1, sigma2):
+    aux = 2 / (sigma1 + sigma2)
+    output = np.empty(x.size)
+    index = x < loc
+    output[index] = aux * sigma1 * cdf((x[index] - loc) / sigma1)
+    index = x >= loc
+    output[index] = 1 - aux * sigma2 * (1 - cdf((x[index] - loc) / sigma2))
+    return output
+
+
+def masked_pdf_tpd(x, pdf1, pdf2, loc, sigma1, sigma2, epsilon):
+    output = np.empty(x.size)
+    index = x < loc
+    output[index] = 2 * epsilon / sigma1 * pdf1((x[index] - loc) / sigma1)
+    index = x >= loc
+    output[index] = 2 * (1 - epsilon) / sigma2 * pdf2((x[index] - loc) / sigma2)
+    return output
+
+
+def peak_bytes(function):
+    tracemalloc.start()
+    function()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak
+
+
+def main(size=10 ** 6, repeat=3):
+    x = np.random.standard_normal(size)
+    out = np.empty(size)
+    norm, t3, t8 = scipy.stats.norm, scipy.stats.t(3), scipy.stats.t(8)
+    scale = (norm.pdf, 0.0, 1.0, 2.0)
+    double = (t3.pdf, t8.pdf, 0.0, 1.0, 2.0, 0.4)
+
+    cases = [
+        ('pdf_tp_generic', lambda: masked_pdf_tp(x, *scale), lambda: pdf_tp_generic(x, *scale, out=out)),
+        ('cdf_tp_generic', lambda: masked_cdf_tp(x, norm.cdf, 0.0, 1.0, 2.0),
+         lambda: cdf_tp_generic(x, norm.cdf, 0.0, 1.0, 2.0, out=out)),
+        ('pdf_tpd_generic', lambda: masked_pdf_tpd(x, *double), lambda: pdf_tpd_generic(x, *double, out=out)),
+    ]
+
+    print(f'size={size}')
+    for name, old, new in cases:
+        t_old = min(timeit.repeat(old, number=1, repeat=repeat))
+        t_new = min(timeit.repeat(new, number=1, repeat=repeat))
+        m_old, m_new = peak_bytes(old), peak_bytes(new)
+        print(f'{name}: masks {t_old:.4f}s {m_old / size:.1f} B/elem  kernel {t_new:.4f}s {m_new / size:.1f} B/elem')
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 10 ** 6)
@@ -0,0 +1,37 @@
+"""
+Summary statistics from the closed form moments against estimates from a large random sample.
+
+Usage: python benchmarks/bench_moments.py
+"""
+import time
+
+import numpy as np
+from scipy.stats import skew, kurtosis
+
+from twopiece.scale import tpnorm, tpstudent, tpsas
+from twopiece.double import dtpgennorm
+
+
+def main(n=10 ** 6):
+    cases = [
+        ('tpnorm', tpnorm(loc=0.0, sigma1=1.0, sigma2=2.0)),
+        ('tpstudent', tpstudent(loc=0.0, sigma1=1.0, sigma2=2.0, shape=7.0)),
+        ('tpsas', tpsas(loc=0.0, sigma1=1.0, sigma2=2.0, shape=0.8)),
+        ('dtpgennorm', dtpgennorm(loc=0.0, sigma1=1.0, sigma2=2.0, shape1=1.5, shape2=3.0)),
+    ]
+    print(f"{'distribution':<14}{'stats (ms)':>12}{'sampling (ms)':>15}{'max abs error of sampling':>28}")
+    for name, dist in cases:
+        start = time.perf_counter()
+        exact = np.array(dist.stats('mvsk'))
+        exact_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        x = dist.random_sample(n, random_state=2022)
+        estimate = np.array([x.mean(), x.var(), skew(x), kurtosis(x)])
+        sample_time = time.perf_counter() - start
+
+        print(f'{name:<14}{1e3 * exact_time:>12.3f}{1e3 * sample_time:>15.1f}{abs(estimate - exact).max():>28.4f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,42 @@
+"""
+Construction time and memory per object of the distribution classes through __init__ and from_params, and of
+the parameter containers.
+
+Usage: python benchmarks/bench_params.py
+"""
+import timeit
+import tracemalloc
+
+from twopiece.params import ScaleParams, DoubleParams
+from twopiece.scale import tpnorm
+from twopiece.double import dtpstudent
+
+
+def memory_per_object(construct, number=10000):
+    tracemalloc.start()
+    objects = [construct() for _ in range(number)]
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del objects
+    return size / number
+
+
+def main(number=20000):
+    scale = ScaleParams(0.0, 1.0, 2.0)
+    double = DoubleParams(0.0, 1.0, 2.0, 3.0, 8.0)
+    cases = [
+        ('tpnorm(sigma1, sigma2)', lambda: tpnorm(loc=0.0, sigma1=1.0, sigma2=2.0)),
+        ("tpnorm(sigma, gamma, kind='boe')", lambda: tpnorm(loc=0.0, sigma=1.0, gamma=0.5, kind='boe')),
+        ('tpnorm.from_params', lambda: tpnorm.from_params(scale)),
+        ('ScaleParams', lambda: ScaleParams(0.0, 1.0, 2.0)),
+        ('dtpstudent(...)', lambda: dtpstudent(loc=0.0, sigma1=1.0, sigma2=2.0, shape1=3.0, shape2=8.0)),
+        ('dtpstudent.from_params', lambda: dtpstudent.from_params(double)),
+        ('DoubleParams', lambda: DoubleParams(0.0, 1.0, 2.0, 3.0, 8.0)),
+    ]
+    for name, construct in cases:
+        t = min(timeit.repeat(construct, number=number, repeat=3)) / number
+        print(f'{name}: {t * 1e6:.2f}us  {memory_per_object(construct):.0f} bytes per object')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,42 @@
+"""
+Cost of the profiling instrumentation: runtime of construction and of scalar and array pdf calls with profiling
+disabled, enabled, and enabled with memory tracing, followed by an example report.
+
+Usage: python benchmarks/bench_profiling.py
+"""
+import timeit
+
+import numpy as np
+
+from twopiece.profiling import enable, disable, profile
+from twopiece.scale import tpnorm
+
+
+def main(size=10 ** 5, repeat=5):
+    dist = tpnorm(loc=0.0, sigma1=1.0, sigma2=2.0)
+    x = np.linspace(-4, 4, size)
+    cases = [
+        ('init', lambda: tpnorm(loc=0.0, sigma1=1.0, sigma2=2.0), 20000),
+        ('pdf, scalar', lambda: dist.pdf(0.3), 20000),
+        (f'pdf, {size} elements', lambda: dist.pdf(x), 50),
+    ]
+    print(f"{'call':<24}{'disabled (us)':>15}{'enabled (us)':>15}{'with memory (us)':>18}")
+    for name, func, number in cases:
+        timings = []
+        for setting in (None, False, True):
+            if setting is not None:
+                enable(memory=setting)
+            timings.append(min(timeit.repeat(func, number=number, repeat=repeat)) / number)
+            disable()
+        print(f'{name:<24}' + ''.join(f'{1e6 * t:>{w}.2f}' for t, w in zip(timings, (15, 15, 18))))
+
+    with profile(memory=True) as stats:
+        tpnorm(loc=0.0, sigma1=1.0, sigma2=2.0).pdf(x)
+    print(f"\n{'family.method':<28}{'calls':>7}{'elements':>10}{'time (ms)':>11}{'self (ms)':>11}{'peak (MiB)':>12}")
+    for key, record in stats.items():
+        print(f"{key:<28}{record['calls']:>7}{record['elements']:>10}{1e3 * record['time']:>11.3f}"
+              f"{1e3 * record['self_time']:>11.3f}{record['peak_memory'] / 2 ** 20:>12.2f}")
+
+
+if __name__ == '__main__':
+    main()
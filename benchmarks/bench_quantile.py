@@ -0,0 +1,52 @@
+"""
+Per-call cost of the quantile functions of the t and the generalised normal bases, closed form against frozen
+scipy.stats distributions, for scalars, arrays and arrays of shape parameters, and of the ppf of the two piece
+families built on them.
+
+Usage: python benchmarks/bench_quantile.py
+"""
+import timeit
+
+import numpy as np
+import scipy.stats
+
+from twopiece.closedform import frozen_closed_form
+from twopiece.double import dtpstudent, dtpgennorm
+from twopiece.shape import tpshastudent
+
+
+def _time(func, number, repeat=3):
+    return min(timeit.repeat(func, number=number, repeat=repeat)) / number
+
+
+def main(size=10 ** 5):
+    q = np.linspace(0.001, 0.999, size)
+    shapes = np.linspace(1.0, 10.0, size)
+    cases = [
+        ('scalar', 0.3, 3.0, 10000),
+        (f'{size} elements', q, 3.0, 5),
+        (f'{size} elements and shapes', q, shapes, 5),
+    ]
+    for f in (scipy.stats.t, scipy.stats.gennorm):
+        print(f'{f.name}.ppf')
+        for name, p, shape, number in cases:
+            slow, fast = f(shape), frozen_closed_form(f, shape)
+            t_slow = _time(lambda: slow.ppf(p), number)
+            t_fast = _time(lambda: fast.ppf(p), number)
+            print(f'  {name:<32}scipy {t_slow * 1e6:>10.1f}us  closed form {t_fast * 1e6:>10.1f}us  '
+                  f'x{t_slow / t_fast:.1f}')
+
+    families = [
+        dtpstudent(loc=0.0, sigma1=1.0, sigma2=2.0, shape1=3.0, shape2=6.0),
+        dtpgennorm(loc=0.0, sigma1=1.0, sigma2=2.0, shape1=1.5, shape2=3.0),
+        tpshastudent(loc=0.0, sigma=1.0, shape1=3.0, shape2=6.0),
+    ]
+    print('two piece ppf')
+    for dist in families:
+        t_scalar = _time(lambda: dist.ppf(0.3), 10000)
+        t_array = _time(lambda: dist.ppf(q), 5)
+        print(f'  {type(dist).__name__:<16}scalar {t_scalar * 1e6:>8.1f}us  {size} elements {t_array * 1e3:>8.2f}ms')
+
+
+if __name__ == '__main__':
+    main()
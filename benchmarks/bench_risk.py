@@ -0,0 +1,41 @@
+"""
+Expected shortfall in closed form against Monte Carlo estimates, for a single level and for a batch of levels and
+parameter sets.
+
+Usage: python benchmarks/bench_risk.py
+"""
+import timeit
+
+import numpy as np
+
+from twopiece.scale import tpnorm, tpstudent
+from twopiece.double import dtpstudent
+
+
+def monte_carlo_expected_shortfall(dist, alpha, n):
+    x = dist.random_sample(n, random_state=2022)
+    return -x[x <= np.quantile(x, alpha)].mean()
+
+
+def main(alpha=0.01, n=10 ** 6, repeat=5):
+    cases = [
+        ('tpnorm', tpnorm(loc=0.0, sigma1=1.0, sigma2=2.0)),
+        ('tpstudent', tpstudent(loc=0.0, sigma1=1.0, sigma2=2.0, shape=4.0)),
+        ('dtpstudent', dtpstudent(loc=0.0, sigma1=1.0, sigma2=2.0, shape1=3.0, shape2=6.0)),
+    ]
+    print(f"{'distribution':<14}{'exact (us)':>12}{'Monte Carlo (ms)':>18}{'abs error of Monte Carlo':>26}")
+    for name, dist in cases:
+        exact = dist.expected_shortfall(alpha)
+        exact_time = min(timeit.repeat(lambda: dist.expected_shortfall(alpha), number=200, repeat=repeat)) / 200
+        mc_time = min(timeit.repeat(lambda: monte_carlo_expected_shortfall(dist, alpha, n), number=1, repeat=3))
+        error = abs(monte_carlo_expected_shortfall(dist, alpha, n) - exact)
+        print(f'{name:<14}{1e6 * exact_time:>12.1f}{1e3 * mc_time:>18.1f}{error:>26.4f}')
+
+    levels = np.linspace(0.001, 0.05, 50)
+    batch = tpstudent(loc=0.0, sigma1=np.linspace(0.5, 2.0, 1000)[:, None], sigma2=1.0, shape=5.0)
+    elapsed = min(timeit.repeat(lambda: batch.expected_shortfall(levels), number=1, repeat=repeat))
+    print(f'tpstudent, 1000 parameter sets x 50 levels: {1e3 * elapsed:.1f} ms')
+
+
+if __name__ == '__main__':
+    main()
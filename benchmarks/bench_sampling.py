@@ -0,0 +1,52 @@
+"""
+Throughput of random_sample with the direct half generators against inverse transform sampling through the
+quantile function.
+
+Usage: python benchmarks/bench_sampling.py
+"""
+import timeit
+
+import numpy as np
+
+from twopiece.scale import tpnorm, tplaplace, tpstudent, tpgennorm, tpsas, random_tp_sample
+from twopiece.double import dtpstudent, dtpsas, random_tpd_sample
+from twopiece.sinharcsinh import sinhasinh
+
+
+def main(size=10 ** 6):
+    generator = np.random.default_rng(0)
+    cases = [
+        tpnorm(loc=0.0, sigma1=1.0, sigma2=2.0),
+        tplaplace(loc=0.0, sigma1=1.0, sigma2=2.0),
+        tpstudent(loc=0.0, sigma1=1.0, sigma2=2.0, shape=4.0),
+        tpgennorm(loc=0.0, sigma1=1.0, sigma2=2.0, shape=1.5),
+        tpsas(loc=0.0, sigma1=1.0, sigma2=2.0, shape=0.8),
+        dtpstudent(loc=0.0, sigma1=1.0, sigma2=2.0, shape1=3.0, shape2=9.0),
+        dtpsas(loc=0.0, sigma1=1.0, sigma2=2.0, shape1=0.8, shape2=1.3),
+    ]
+    for dist in cases:
+        if hasattr(dist, 'epsilon'):
+            def inverse():
+                return random_tpd_sample(size, dist.f1.ppf, dist.f2.ppf, dist.loc, dist.sigma1, dist.sigma2,
+                                         dist.epsilon, generator)
+        else:
+            ppf = dist.base.ppf if hasattr(dist, 'base') else dist.f.ppf
+
+            def inverse():
+                return random_tp_sample(size, ppf, dist.loc, dist.sigma1, dist.sigma2, generator)
+
+        t_direct = min(timeit.repeat(lambda: dist.random_sample(size, random_state=generator), number=1, repeat=3))
+        t_inverse = min(timeit.repeat(inverse, number=1, repeat=3))
+        print(f'{type(dist).__name__} n={size}: inverse transform {t_inverse * 1e3:.0f}ms  '
+              f'direct {t_direct * 1e3:.0f}ms  x{t_inverse / t_direct:.1f}')
+
+    dist = sinhasinh(loc=0.0, scale=2.0, delta=0.8, epsilon=0.4)
+    t_direct = min(timeit.repeat(lambda: dist.random_sample(size, random_state=generator), number=1, repeat=3))
+    t_inverse = min(timeit.repeat(lambda: dist.ppf(generator.random(size)), number=1, repeat=3))
+    t_normal = min(timeit.repeat(lambda: generator.standard_normal(size), number=1, repeat=3))
+    print(f'sinhasinh n={size}: inverse transform {t_inverse * 1e3:.0f}ms  direct {t_direct * 1e3:.0f}ms  '
+          f'x{t_inverse / t_direct:.1f}  (standard normal draws {t_normal * 1e3:.0f}ms)')
+
+
+if __name__ == '__main__':
+    main()
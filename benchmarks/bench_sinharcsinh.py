@@ -0,0 +1,34 @@
+"""
+Compares the vectorised SinhArcsinh methods against the former numpy.vectorize path.
+
+Usage: python benchmarks/bench_sinharcsinh.py [size]
+"""
+import sys
+import timeit
+
+import numpy as np
+
+from twopiece.sinharcsinh import sinhasinh, _pdf_instance, _cdf_instance, _qqf_instance
+
+
+def main(size=10 ** 5, repeat=3):
+    dist = sinhasinh(loc=0.0, scale=1.0, delta=1.5, epsilon=0.2)
+    x = np.linspace(-10, 10, size)
+    q = np.linspace(0.0001, 0.9999, size)
+    args = (dist.loc, dist.scale, dist.delta, dist.epsilon)
+
+    cases = [
+        ('pdf', lambda: np.vectorize(_pdf_instance)(x, dist.f.pdf, *args), lambda: dist.pdf(x)),
+        ('cdf', lambda: np.vectorize(_cdf_instance)(x, dist.f.cdf, *args), lambda: dist.cdf(x)),
+        ('ppf', lambda: np.vectorize(_qqf_instance)(q, dist.f.ppf, *args), lambda: dist.ppf(q)),
+    ]
+
+    print(f'size={size}')
+    for name, old, new in cases:
+        t_old = min(timeit.repeat(old, number=1, repeat=repeat))
+        t_new = min(timeit.repeat(new, number=1, repeat=repeat))
+        print(f'{name}: vectorize {t_old:.4f}s  array {t_new:.4f}s  speedup x{t_old / t_new:.1f}')
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 10 ** 5)
@@ -0,0 +1,161 @@
+"""
+Benchmark suite: runtime, throughput and peak memory of pdf, cdf, ppf and random_sample for every class of
+scale.py, double.py, shape.py and sinharcsinh.py, over input sizes from 1 to 10^7, and of their construction.
+
+Inputs are generated from fixed seeds. Each timing is the best of several runs, repeated until min_time seconds
+are spent (a single run for the largest sizes). Peak memory is the peak of the allocations traced by tracemalloc
+during a separate run. Results can be saved as a JSON baseline and compared against one, in which case any
+benchmark slower (or using more memory) than the baseline by more than the threshold is reported as a regression
+and the exit status is 1.
+
+Usage:
+    python benchmarks/bench_suite.py --save baseline.json
+    python benchmarks/bench_suite.py --compare baseline.json --threshold 0.25
+    python benchmarks/bench_suite.py --sizes 1 1000 --filter tpnorm sinhasinh --methods pdf ppf
+"""
+import argparse
+import json
+import platform
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timezone
+
+import numpy as np
+import scipy
+
+from twopiece.scale import tpnorm, tplaplace, tpcauchy, tplogistic, tpstudent, tpgennorm, tpsas
+from twopiece.double import dtpstudent, dtpgennorm, dtpsas
+from twopiece.shape import tpshastudent, tpshagennorm, tpshasas
+from twopiece.sinharcsinh import sinhasinh
+
+SIZES = (1, 10 ** 2, 10 ** 4, 10 ** 6, 10 ** 7)
+METHODS = ('init', 'pdf', 'cdf', 'ppf', 'random_sample')
+CONSTRUCTIONS = 1000
+
+CASES = {
+    'tpnorm': lambda: tpnorm(loc=0.5, sigma1=1.0, sigma2=2.0),
+    'tplaplace': lambda: tplaplace(loc=0.5, sigma1=1.0, sigma2=2.0),
+    'tpcauchy': lambda: tpcauchy(loc=0.5, sigma1=1.0, sigma2=2.0),
+    'tplogistic': lambda: tplogistic(loc=0.5, sigma1=1.0, sigma2=2.0),
+    'tpstudent': lambda: tpstudent(loc=0.5, sigma1=1.0, sigma2=2.0, shape=4.0),
+    'tpgennorm': lambda: tpgennorm(loc=0.5, sigma1=1.0, sigma2=2.0, shape=1.5),
+    'tpsas': lambda: tpsas(loc=0.5, sigma1=1.0, sigma2=2.0, shape=0.8),
+    'dtpstudent': lambda: dtpstudent(loc=0.5, sigma1=1.0, sigma2=2.0, shape1=3.0, shape2=6.0),
+    'dtpgennorm': lambda: dtpgennorm(loc=0.5, sigma1=1.0, sigma2=2.0, shape1=1.5, shape2=3.0),
+    'dtpsas': lambda: dtpsas(loc=0.5, sigma1=1.0, sigma2=2.0, shape1=0.8, shape2=1.3),
+    'tpshastudent': lambda: tpshastudent(loc=0.5, sigma=1.0, shape1=3.0, shape2=6.0),
+    'tpshagennorm': lambda: tpshagennorm(loc=0.5, sigma=1.0, shape1=1.5, shape2=3.0),
+    'tpshasas': lambda: tpshasas(loc=0.5, sigma=1.0, shape1=0.8, shape2=1.3),
+    'sinhasinh': lambda: sinhasinh(loc=0.5, scale=2.0, delta=1.5, epsilon=0.2),
+}
+
+
+def workload(name, method, size):
+    """
+    Function running one benchmark, and the number of elements it processes.
+    Construction does not depend on the input size and is timed for CONSTRUCTIONS instances.
+    """
+    if method == 'init':
+        construct = CASES[name]
+        return lambda: [construct() for _ in range(CONSTRUCTIONS)], CONSTRUCTIONS
+
+    dist = CASES[name]()
+    rng = np.random.default_rng(2022)
+    if method == 'random_sample':
+        return lambda: dist.random_sample(size, random_state=2022), size
+    values = rng.random(size) if method == 'ppf' else rng.uniform(-8, 8, size)
+    if size == 1:
+        values = float(values[0])
+    func = getattr(dist, method)
+    return lambda: func(values), size
+
+
+def measure(func, min_time=0.2, max_runs=100):
+    """
+    Best runtime of func over runs repeated until min_time is spent, and peak traced memory of a single run.
+    """
+    func()
+    best, spent, runs = float('inf'), 0.0, 0
+    while runs < max_runs and (runs == 0 or spent < min_time):
+        start = time.perf_counter()
+        func()
+        elapsed = time.perf_counter() - start
+        best, spent, runs = min(best, elapsed), spent + elapsed, runs + 1
+
+    tracemalloc.start()
+    func()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return best, peak
+
+
+def run(names, methods, sizes, min_time):
+    results = {}
+    for name in names:
+        for method in methods:
+            for size in sizes[:1] if method == 'init' else sizes:
+                func, elements = workload(name, method, size)
+                elapsed, peak = measure(func, min_time)
+                key = f'{name}.init' if method == 'init' else f'{name}.{method}.{size}'
+                results[key] = {'time': elapsed, 'throughput': elements / elapsed, 'peak_memory': peak}
+                print(f'{key:<36}{1e3 * elapsed:>12.3f} ms{elements / elapsed:>14.3e} /s{peak / 2 ** 20:>10.2f} MiB',
+                      flush=True)
+    return results
+
+
+def metadata():
+    return {'date': datetime.now(timezone.utc).isoformat(timespec='seconds'), 'python': platform.python_version(),
+            'numpy': np.__version__, 'scipy': scipy.__version__, 'platform': platform.platform(),
+            'processor': platform.processor() or platform.machine()}
+
+
+def compare(results, baseline, threshold):
+    """
+    Benchmarks slower, or with a larger peak memory, than the baseline by more than the threshold.
+    :return: list of (key, quantity, ratio)
+    """
+    regressions = []
+    for key, current in results.items():
+        reference = baseline.get(key)
+        if reference is None:
+            continue
+        for quantity in ('time', 'peak_memory'):
+            if reference[quantity] > 0:
+                ratio = current[quantity] / reference[quantity]
+                if ratio > 1 + threshold:
+                    regressions.append((key, quantity, ratio))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', type=int, nargs='+', default=SIZES)
+    parser.add_argument('--filter', nargs='+', default=list(CASES), choices=list(CASES), metavar='CLASS')
+    parser.add_argument('--methods', nargs='+', default=METHODS, choices=METHODS)
+    parser.add_argument('--min-time', type=float, default=0.2, help='seconds spent per timing')
+    parser.add_argument('--save', help='path of the JSON file the results are written to')
+    parser.add_argument('--compare', help='path of a JSON baseline')
+    parser.add_argument('--threshold', type=float, default=0.25, help='relative slowdown flagged as a regression')
+    args = parser.parse_args(argv)
+
+    results = run(args.filter, args.methods, args.sizes, args.min_time)
+
+    if args.save:
+        with open(args.save, 'w') as file:
+            json.dump({'metadata': metadata(), 'results': results}, file, indent=1, sort_keys=True)
+
+    if args.compare:
+        with open(args.compare) as file:
+            baseline = json.load(file)
+        regressions = compare(results, baseline['results'], args.threshold)
+        for key, quantity, ratio in regressions:
+            print(f'REGRESSION {key} {quantity}: {ratio:.2f}x the baseline')
+        print(f'{len(regressions)} regression(s) beyond {args.threshold:.0%} against {args.compare} '
+              f'({baseline["metadata"]["date"]})')
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
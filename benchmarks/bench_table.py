@@ -0,0 +1,38 @@
+"""
+Accuracy and throughput of ppf_approx (tabulated quantile function) against the exact ppf.
+
+Usage: python benchmarks/bench_table.py
+"""
+import time
+import timeit
+
+import numpy as np
+
+from twopiece.scale import tpstudent
+from twopiece.double import dtpgennorm
+from twopiece.shape import tpshastudent
+
+
+def main(size=10 ** 6, tolerances=(1e-6, 1e-8, 1e-10)):
+    q = np.random.default_rng(0).random(size)
+    cases = [
+        tpstudent(loc=0.5, sigma1=1.0, sigma2=2.0, shape=3.0),
+        dtpgennorm(loc=0.0, sigma1=1.0, sigma2=2.0, shape1=1.2, shape2=3.0),
+        tpshastudent(loc=0.0, sigma=1.0, shape1=1.5, shape2=10.0),
+    ]
+    for dist in cases:
+        exact = dist.ppf(q)
+        t_exact = min(timeit.repeat(lambda: dist.ppf(q), number=1, repeat=3))
+        print(f'{type(dist).__name__} n={size}: exact ppf {t_exact * 1e3:.0f}ms')
+        for tol in tolerances:
+            start = time.perf_counter()
+            dist.ppf_approx(0.5, tol=tol)
+            t_build = time.perf_counter() - start
+            t_approx = min(timeit.repeat(lambda: dist.ppf_approx(q, tol=tol), number=1, repeat=3))
+            error = (np.abs(dist.ppf_approx(q, tol=tol) - exact) / np.maximum(1, np.abs(exact))).max()
+            print(f'  tol={tol:.0e}: {dist._quantile_table.size} nodes, build {t_build * 1e3:.0f}ms, '
+                  f'approx {t_approx * 1e3:.0f}ms x{t_exact / t_approx:.1f}, max error {error:.1e}')
+
+
+if __name__ == '__main__':
+    main()
@@ -13,11 +13,13 @@ setuptools.setup(
     long_description_content_type="text/markdown",
     url="https://github.com/quantgirluk/twopiece",
     packages=setuptools.find_packages(),
+    package_data={'twopiece': ['data/*.csv']},
     classifiers=[
         "Programming Language :: Python :: 3",
         "License :: OSI Approved :: MIT License",
         "Operating System :: OS Independent",
     ],
-    python_requires='>=3.6',
-    install_requires=['numpy>=1.13.1', 'scipy>=0.19.1', 'matplotlib>=2.2.2', 'seaborn>=0.8'],
+    python_requires='>=3.9',
+    install_requires=['numpy>=1.25', 'scipy>=0.19.1', 'matplotlib>=2.2.2', 'seaborn>=0.8'],
+    extras_require={'numba': ['numba']},
 )
@@ -0,0 +1,68 @@
+# -*- coding: utf-8 -*-
+# name: twopiece.backend.py
+# --
+# coding: utf-8
+
+"""
+Selection of the evaluation backend.
+
+The numpy backend (the default) evaluates the two piece functions with NumPy and scipy. The numba backend runs
+compiled, fused kernels instead (see twopiece.jit) for the built-in bases with closed forms, and falls back to
+the numpy backend for anything it does not cover. numba is an optional dependency: it is only imported when the
+numba backend is selected.
+
+The backend is set globally with set_backend, or for a block of code with use_backend, which takes precedence
+and is local to the current thread (or asyncio task).
+"""
+
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+BACKENDS = ('numpy', 'numba')
+
+_default_backend = 'numpy'
+_backend = ContextVar('twopiece_backend', default=None)
+
+
+def _check_backend(name):
+    if name not in BACKENDS:
+        raise ValueError(f'Invalid backend {name}. Valid values are {", ".join(BACKENDS)}.')
+    if name == 'numba':
+        try:
+            import twopiece.jit  # noqa: F401
+        except ImportError as error:
+            raise ImportError('The numba backend requires numba, install it with pip install twopiece[numba] '
+                              'or pip install numba.') from error
+
+
+def get_backend():
+    """
+    Backend in use.
+    :return: string, numpy or numba
+    """
+    name = _backend.get()
+    return _default_backend if name is None else name
+
+
+def set_backend(name):
+    """
+    Sets the backend used by default.
+    :param name: string, numpy or numba
+    """
+    global _default_backend
+    _check_backend(name)
+    _default_backend = name
+
+
+@contextmanager
+def use_backend(name):
+    """
+    Context manager selecting the backend within a block, e.g. with use_backend('numba'): dist.pdf(x)
+    :param name: string, numpy or numba
+    """
+    _check_backend(name)
+    token = _backend.set(name)
+    try:
+        yield
+    finally:
+        _backend.reset(token)
@@ -0,0 +1,128 @@
+# -*- coding: utf-8 -*-
+# name: twopiece.batch.py
+# --
+# coding: utf-8
+
+"""
+Batch fitting of many independent series.
+
+The series are split into chunks of consecutive series, and every chunk is fitted sequentially by one task of a
+concurrent.futures pool, which keeps the scheduling and pickling overhead per series small. Results are stored
+by index, so their order is the order of the input whatever the order of completion. Iterators are consumed
+lazily, with at most two chunks per worker in flight.
+"""
+
+import os
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor, wait, FIRST_COMPLETED
+from itertools import islice
+
+from numpy import ndarray
+
+
+class BatchFitResult:
+
+    def __init__(self):
+        """
+        Fitted parameters and counters of a batch fit.
+
+        params: list with the dict of fitted parameters of every series, None where the fit failed
+        errors: dict mapping the index of every failed series to its error message
+        completed: number of series processed so far
+        elapsed: wall time of the batch in seconds
+        fit_time: total time spent in the fits in seconds, summed over the workers
+        """
+        self.params = []
+        self.errors = {}
+        self.completed = 0
+        self.elapsed = 0.0
+        self.fit_time = 0.0
+
+
+def _fit_chunk(dist, start, chunk):
+    params, errors = [], {}
+    begin = time.perf_counter()
+    for i, data in enumerate(chunk):
+        try:
+            params.append(dist.fit(data))
+        except (ValueError, ArithmeticError) as error:
+            params.append(None)
+            errors[start + i] = str(error)
+    return start, params, errors, time.perf_counter() - begin
+
+
+def _chunks(samples, chunksize):
+    if isinstance(samples, ndarray):
+        if samples.ndim != 2:
+            raise ValueError('Samples must be a 2-D array with one series per row, or an iterable of series.')
+        for start in range(0, samples.shape[0], chunksize):
+            yield start, samples[start:start + chunksize]
+        return
+    iterator = iter(samples)
+    start = 0
+    while True:
+        chunk = list(islice(iterator, chunksize))
+        if not chunk:
+            return
+        yield start, chunk
+        start += len(chunk)
+
+
+def _executor(executor, max_workers):
+    if isinstance(executor, Executor):
+        return executor, False
+    if executor == 'process':
+        return ProcessPoolExecutor(max_workers=max_workers), True
+    if executor == 'thread':
+        return ThreadPoolExecutor(max_workers=max_workers), True
+    raise ValueError('Invalid value of executor provided. Valid values are process, thread or an Executor.')
+
+
+def fit_batch(dist, samples, executor='process', max_workers=None, chunksize=16, progress=None):
+    """
+    Fits dist independently to every series of samples in parallel.
+
+    :param dist: two piece instance, whose family is fitted starting from its shape parameters
+    :param samples: 2-D array with one series per row, or an iterable of one dimensional series
+    :param executor: 'process', 'thread' or a concurrent.futures Executor, which is not shut down
+    :param max_workers: number of workers of the pool, defaults to the number of CPUs
+    :param chunksize: number of consecutive series fitted by each task
+    :param progress: optional function called with the BatchFitResult after every completed chunk
+    :return: BatchFitResult with the parameters in the order of samples
+    """
+    if chunksize < 1:
+        raise ValueError('chunksize must be a positive integer.')
+    max_workers = max_workers or os.cpu_count() or 1
+    pool, owned = _executor(executor, max_workers)
+
+    result = BatchFitResult()
+    begin = time.perf_counter()
+    params = {}
+
+    def collect(done):
+        for future in done:
+            start, chunk_params, errors, fit_time = future.result()
+            params[start] = chunk_params
+            result.errors.update(errors)
+            result.completed += len(chunk_params)
+            result.fit_time += fit_time
+            result.elapsed = time.perf_counter() - begin
+            if progress is not None:
+                progress(result)
+
+    try:
+        pending = set()
+        for start, chunk in _chunks(samples, chunksize):
+            if len(pending) >= 2 * max_workers:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                collect(done)
+            pending.add(pool.submit(_fit_chunk, dist, start, chunk))
+        collect(wait(pending)[0])
+    finally:
+        if owned:
+            pool.shutdown()
+
+    for start in sorted(params):
+        result.params.extend(params[start])
+    result.elapsed = time.perf_counter() - begin
+    return result
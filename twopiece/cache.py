@@ -0,0 +1,108 @@
+# -*- coding: utf-8 -*-
+# name: twopiece.cache.py
+# --
+# coding: utf-8
+
+"""
+Cache of frozen base distributions.
+
+Freezing a scipy.stats distribution (f(shape)) and evaluating its density at zero dominate the construction of
+the two piece classes with shape parameters. FrozenCache keeps the frozen distributions and their pdf(0) keyed
+on (family, shape), with least recently used eviction beyond maxsize entries, so that instances sharing a shape
+share the frozen distribution. Access is guarded by a lock, so the cache can be used from several threads. Array
+shapes are not cached. The t and the generalised normal are frozen as their closed form implementations (see
+twopiece.closedform.frozen_closed_form), which skip the per call overhead of scipy.stats.
+"""
+
+from collections import OrderedDict
+from threading import Lock
+
+from numpy import isscalar
+
+from twopiece.closedform import base_key, frozen_closed_form
+
+
+class FrozenCache:
+
+    def __init__(self, maxsize=1024):
+        """
+        :param maxsize: maximum number of frozen distributions kept
+        """
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = Lock()
+
+    def get(self, f, shape):
+        """
+        Frozen distribution f(shape) and its density at zero.
+        :param f: continuous symmetric distribution with support on R, with one shape parameter
+        :param shape: shape parameter
+        :return: tuple (frozen distribution, pdf at zero)
+        """
+        if not isscalar(shape):
+            frozen = frozen_closed_form(f, shape)
+            return frozen, frozen.pdf(0)
+
+        key = (base_key(f), shape)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry
+            self.misses += 1
+
+        frozen = frozen_closed_form(f, shape)
+        entry = (frozen, frozen.pdf(0))
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            self._evict()
+        return entry
+
+    def _evict(self):
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def resize(self, maxsize):
+        """
+        Changes the maximum number of entries, evicting the least recently used ones if needed.
+        :param maxsize: non negative integer
+        """
+        if maxsize < 0:
+            raise ValueError('maxsize must be non negative.')
+        with self._lock:
+            self.maxsize = maxsize
+            self._evict()
+
+    def clear(self):
+        """
+        Removes all the entries and resets the statistics.
+        """
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def info(self):
+        """
+        Statistics of the cache.
+        :return: dict with hits, misses, size and maxsize
+        """
+        with self._lock:
+            return {'hits': self.hits, 'misses': self.misses, 'size': len(self._entries), 'maxsize': self.maxsize}
+
+
+FROZEN_CACHE = FrozenCache()
+
+
+def frozen_base(f, shape):
+    """
+    Frozen distribution f(shape) and its density at zero, from the shared FROZEN_CACHE.
+    :param f: continuous symmetric distribution with support on R, with one shape parameter
+    :param shape: shape parameter
+    :return: tuple (frozen distribution, pdf at zero)
+    """
+    return FROZEN_CACHE.get(f, shape)
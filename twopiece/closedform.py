@@ -0,0 +1,314 @@
+# -*- coding: utf-8 -*-
+# name: twopiece.closedform.py
+# --
+# coding: utf-8
+
+"""
+Closed form standard base distributions.
+
+The methods of scipy.stats distributions go through argument checking, argsreduce and place on every call, which
+is a large fixed cost for small arrays. The classes below evaluate the standard (loc=0, scale=1) normal, Laplace,
+logistic and Cauchy distributions directly with scipy.special and NumPy ufuncs. They expose the subset of the
+scipy.stats interface used by the two piece families (pdf, logpdf, cdf, logcdf and ppf) and are selected
+automatically by closed_form.
+
+The t and the generalised normal distributions, frozen with their shape parameter (a scalar or an array, over
+which every method broadcasts), are implemented in the same way by StandardStudent and StandardGennorm, selected
+by frozen_closed_form. They use the formulas of scipy.stats, so that they agree with it to rounding, except for
+the quantile function of the t far in the lower tail: scipy.special.stdtrit loses all accuracy for quantiles
+beyond about -1e45 (heavy tails far below q = 1e-100), where it returns wrong finite values or even +inf. student_ppf
+recomputes the quantiles below -STUDENT_LARGE by Newton iterations on log cdf in the variable log|x|, started from
+the tail asymptote cdf(x) ~ K |x|^(-nu), with log cdf evaluated from the series of the incomplete beta function,
+which does not underflow. The same series gives the lower tail of logcdf of the t, and the asymptotic expansion of
+the upper incomplete gamma function the one of the generalised normal, where scipy.stats underflows to -inf.
+"""
+
+import scipy.stats
+from numpy import exp, abs, log, log1p, logaddexp, tan, arctan2, pi, sqrt, where, errstate, sign, asarray, \
+    broadcast_arrays, isinf, inf, finfo
+from scipy.special import ndtr, ndtri, log_ndtr, expit, logit, stdtr, stdtrit, gammaln, gammaincc, gammainccinv, \
+    poch, betaln
+
+
+class StandardNormal:
+
+    def pdf(self, z):
+        return exp(-0.5 * z * z) / _SQRT_2PI
+
+    def logpdf(self, z):
+        return -0.5 * z * z - _LOG_SQRT_2PI
+
+    def cdf(self, z):
+        return ndtr(z)
+
+    def logcdf(self, z):
+        return log_ndtr(z)
+
+    def ppf(self, q):
+        return ndtri(q)
+
+
+class StandardLaplace:
+
+    def pdf(self, z):
+        return 0.5 * exp(-abs(z))
+
+    def logpdf(self, z):
+        return _LOG_HALF - abs(z)
+
+    def cdf(self, z):
+        half_tail = 0.5 * exp(-abs(z))
+        return where(z > 0, 1.0 - half_tail, half_tail)[()]
+
+    def logcdf(self, z):
+        half_tail = 0.5 * exp(-abs(z))
+        return where(z > 0, log1p(-half_tail), _LOG_HALF - abs(z))[()]
+
+    def ppf(self, q):
+        with errstate(divide='ignore'):
+            return where(q > 0.5, -log(2 * (1 - q)), log(2 * q))[()]
+
+
+class StandardLogistic:
+
+    def pdf(self, z):
+        e = exp(-abs(z))
+        return e / (1 + e) ** 2
+
+    def logpdf(self, z):
+        return -abs(z) - 2 * log1p(exp(-abs(z)))
+
+    def cdf(self, z):
+        return expit(z)
+
+    def logcdf(self, z):
+        return -logaddexp(0, -z)
+
+    def ppf(self, q):
+        return logit(q)
+
+
+class StandardCauchy:
+
+    def pdf(self, z):
+        return 1.0 / pi / (1.0 + z * z)
+
+    def logpdf(self, z):
+        # log(1 + z^2) = 2 log|z| + log1p(1 / z^2) avoids the overflow of z * z for large |z|
+        absz = abs(z)
+        large = where(absz < 1, 1.0, absz)
+        with errstate(over='ignore'):
+            log1pz2 = where(absz < 1, log1p(z * z), 2 * log(large) + log1p((1 / large) ** 2))
+        return (-_LOG_PI - log1pz2)[()]
+
+    def cdf(self, z):
+        return arctan2(1, -z) / pi
+
+    def logcdf(self, z):
+        return log(arctan2(1, -z) / pi)
+
+    def ppf(self, q):
+        with errstate(divide='ignore'):
+            return where(q < 0.5, -1 / tan(pi * q), 1 / tan(pi * (1 - q)))[()]
+
+
+STUDENT_LARGE = 1e30
+_NEWTON_STEPS = 4
+_LOG_MAX = log(finfo(float).max)
+_LOG_2 = log(2)
+_STUDENT_SERIES = 1e-2
+_STUDENT_SERIES_TERMS = 8
+_GENNORM_SERIES_TERMS = 8
+_TINY = finfo(float).tiny
+
+
+def _student_logpdf(z, nu):
+    with errstate(divide='ignore', invalid='ignore'):
+        t = log(poch(0.5 * nu, 0.5)) - 0.5 * (log(nu) + _LOG_PI) - (nu + 1) / 2 * log1p(z * z / nu)
+    if isinf(nu).any():
+        t = where(isinf(nu), -0.5 * z * z - _LOG_SQRT_2PI, t)
+    return t
+
+
+def _student_log_lower_tail(u, nu):
+    # log cdf(-e^u): far in the tail, where stdtr underflows, from cdf(z) = I_x(nu / 2, 1 / 2) / 2 with
+    # x = nu / (nu + z^2) and I_x(a, b) = x^a (1 - x)^b / (a B(a, b)) sum_n (a + b)_n / (a + 1)_n x^n, whose terms
+    # decrease at least by a factor x
+    a = nu / 2
+    log_x = -logaddexp(0, 2 * u - log(nu))
+    x = exp(log_x)
+    term = series = 1.0
+    for n in range(1, _STUDENT_SERIES_TERMS):
+        term = term * (a + n - 0.5) / (a + n) * x
+        series = series + term
+    log_cdf = a * log_x + 0.5 * log1p(-x) - log(a) - betaln(a, 0.5) + log(series) - _LOG_2
+    return where(x < _STUDENT_SERIES, log_cdf, log(stdtr(nu, -exp(u))))
+
+
+def _student_lower_tail(s, nu):
+    # Quantiles z < 0 of the probabilities s, by Newton on g(u) = log cdf(-e^u) - log s, with
+    # g'(u) = z pdf(z) / cdf(z), from the asymptote cdf(z) ~ K |z|^(-nu), K = Gamma((nu + 1) / 2) nu^(nu / 2 - 1)
+    # / (Gamma(nu / 2) sqrt(pi))
+    log_k = gammaln((nu + 1) / 2) + (nu / 2 - 1) * log(nu) - gammaln(nu / 2) - 0.5 * _LOG_PI
+    with errstate(over='ignore', under='ignore', divide='ignore', invalid='ignore'):
+        log_s = log(s)
+        u = (log_k - log_s) / nu
+        for _ in range(_NEWTON_STEPS):
+            log_cdf = _student_log_lower_tail(u, nu)
+            # log pdf(z) with log1p(z^2 / nu) = 2 u - log(nu) + log1p(nu e^(-2 u)), free of the overflow of z^2
+            log_pdf = log(poch(0.5 * nu, 0.5)) - 0.5 * (log(nu) + _LOG_PI) \
+                - (nu + 1) / 2 * (2 * u - log(nu) + log1p(nu * exp(-2 * u)))
+            u = u + (log_cdf - log_s) / exp(log_pdf + u - log_cdf)
+        return where(u > _LOG_MAX, -inf, -exp(u))
+
+
+def student_ppf(q, nu):
+    """
+    Quantile function of the standard t distribution.
+    :param q: array like of probabilities
+    :param nu: degrees of freedom, scalar or array like
+    :return: array
+    """
+    x = stdtrit(nu, q)
+    # stdtrit(nu, 0) is +inf
+    tail = (asarray(q) < 0.5) & ~(abs(x) < STUDENT_LARGE)
+    if not tail.any():
+        return x
+    x, q, nu, tail = broadcast_arrays(x, q, nu, tail)
+    x = x.copy()
+    x[tail & (q == 0)] = -inf
+    tail &= (q > 0) & ~isinf(nu)
+    x[tail] = _student_lower_tail(q[tail], nu[tail])
+    return x[()]
+
+
+def _gennorm_log_lower_tail(y, beta):
+    # log cdf(-y) = log(Q(a, y^beta) / 2) with a = 1 / beta. Where Q underflows, from the asymptotic expansion
+    # Gamma(a, t) ~ t^(a - 1) e^(-t) sum_n (a - 1)(a - 2)...(a - n) / t^n, whose terms decrease fast for t > 700
+    a = 1 / beta
+    t = y ** beta
+    tail = gammaincc(a, t)
+    term = series = 1.0
+    for n in range(1, _GENNORM_SERIES_TERMS):
+        term = term * (a - n) / t
+        series = series + term
+    log_tail = (a - 1) * log(t) - t - gammaln(a) + log(series)
+    return where(tail > _TINY, log(tail), where(isinf(t), -inf, log_tail)) - _LOG_2
+
+
+def gennorm_ppf(q, beta):
+    """
+    Quantile function of the standard generalised normal distribution.
+    :param q: array like of probabilities
+    :param beta: shape parameter, scalar or array like
+    :return: array
+    """
+    c = sign(q - 0.5)
+    # evaluating (1 + c) first prevents numerical cancellation
+    return c * gammainccinv(1 / beta, (1 + c) - 2 * c * q) ** (1 / beta)
+
+
+class StandardStudent:
+
+    dist = scipy.stats.t
+    kwds = {}
+
+    def __init__(self, shape):
+        self.shape = asarray(shape, dtype=float)[()]
+        self.args = (shape,)
+
+    def pdf(self, z):
+        return exp(_student_logpdf(z, self.shape))
+
+    def logpdf(self, z):
+        return _student_logpdf(z, self.shape)
+
+    def cdf(self, z):
+        return stdtr(self.shape, z)
+
+    def logcdf(self, z):
+        with errstate(over='ignore', under='ignore', divide='ignore', invalid='ignore'):
+            t = where(z < 0, _student_log_lower_tail(log(abs(z)), self.shape), log1p(-self.cdf(-z)))
+        if isinf(self.shape).any():
+            t = where(isinf(self.shape), log_ndtr(z), t)
+        return t[()]
+
+    def ppf(self, q):
+        return student_ppf(q, self.shape)
+
+
+class StandardGennorm:
+
+    dist = scipy.stats.gennorm
+    kwds = {}
+
+    def __init__(self, shape):
+        self.shape = asarray(shape, dtype=float)[()]
+        self.args = (shape,)
+
+    def pdf(self, z):
+        return exp(self.logpdf(z))
+
+    def logpdf(self, z):
+        beta = self.shape
+        return log(0.5 * beta) - gammaln(1 / beta) - abs(z) ** beta
+
+    def cdf(self, z):
+        c = 0.5 * sign(z)
+        # evaluating (0.5 + c) first prevents numerical cancellation
+        return (0.5 + c) - c * gammaincc(1 / self.shape, abs(z) ** self.shape)
+
+    def logcdf(self, z):
+        with errstate(over='ignore', under='ignore', divide='ignore', invalid='ignore'):
+            return where(z < 0, _gennorm_log_lower_tail(abs(z), self.shape), log1p(-self.cdf(-z)))[()]
+
+    def ppf(self, q):
+        return gennorm_ppf(q, self.shape)
+
+
+_SQRT_2PI = sqrt(2 * pi)
+_LOG_SQRT_2PI = log(_SQRT_2PI)
+_LOG_HALF = log(0.5)
+_LOG_PI = log(pi)
+
+CLOSED_FORMS = {
+    'norm': StandardNormal(),
+    'laplace': StandardLaplace(),
+    'logistic': StandardLogistic(),
+    'cauchy': StandardCauchy(),
+}
+
+SHAPED_CLOSED_FORMS = {
+    't': StandardStudent,
+    'gennorm': StandardGennorm,
+}
+
+
+def base_key(f):
+    """
+    Registry key of a base distribution: the name of a scipy.stats distribution, the object itself otherwise.
+    Unlike the scipy.stats object, its name is preserved when a distribution is pickled, e.g. by a process pool.
+    :param f: continuous symmetric distribution with support on R
+    :return: key
+    """
+    return f.name if isinstance(f, scipy.stats.rv_continuous) else f
+
+
+def closed_form(f):
+    """
+    Closed form implementation of a standard base distribution.
+    :param f: continuous symmetric distribution with support on R
+    :return: the closed form implementation of f if there is one, f otherwise
+    """
+    return CLOSED_FORMS.get(base_key(f), f)
+
+
+def frozen_closed_form(f, shape):
+    """
+    Closed form implementation of a standard base distribution with a shape parameter.
+    :param f: continuous symmetric distribution with support on R, with one shape parameter
+    :param shape: shape parameter, scalar or array like
+    :return: the closed form implementation of f frozen with shape if there is one, f(shape) otherwise
+    """
+    closed = SHAPED_CLOSED_FORMS.get(base_key(f))
+    return f(shape) if closed is None else closed(shape)
@@ -8,13 +8,25 @@
 
 
 import scipy.stats
-from numpy import isscalar, asarray, random, sum, empty
-
+from numpy import asarray, log, log1p
+
+from twopiece.cache import frozen_base
+from twopiece.fit import fit_tpd, fit_result
+from twopiece.grid import GridEvaluation
+from twopiece.kernel import two_piece, log_complement
+from twopiece.moments import Moments
+from twopiece.params import DoubleParams
+from twopiece.profiling import instrumented, instrumented_methods
+from twopiece.risk import RiskMeasures
+from twopiece.rng import check_random_state, half_sampler, sample_two_piece, chunked_sample, CHUNK_SIZE
 from twopiece.sinharcsinh import ssas
-from twopiece.utils import get_sigma1_sigma2, display_dist
+from twopiece.stream import Streaming
+from twopiece.table import TabulatedPpf
+from twopiece.utils import get_sigma1_sigma2, display_dist, all_scalar
 
 
-def pdf_tpd_generic(x, pdf1, pdf2, loc, sigma1, sigma2, epsilon):
+@instrumented('double')
+def pdf_tpd_generic(x, pdf1, pdf2, loc, sigma1, sigma2, epsilon, out=None):
     """
     Probability density function at x of the defined two piece distribution.
     :param x: array like
@@ -24,32 +36,31 @@ def pdf_tpd_generic(x, pdf1, pdf2, loc, sigma1, sigma2, epsilon):
     :param sigma1: scale parameter
     :param sigma2: scale parameter
     :param epsilon: shape parameter
+    :param out: optional output array for array inputs
     :return: pdf of the defined two piece in x
     """
 
-    if sigma1 * sigma2 <= 0:
+    if (asarray(sigma1) * asarray(sigma2) <= 0).any():
         raise ValueError('Scale parameters must be positive.')
 
     aux1 = 2 * epsilon / sigma1
     aux2 = 2 * (1 - epsilon) / sigma2
 
-    if isscalar(x):
+    if all_scalar(x, loc, sigma1, sigma2, epsilon):
         if x < loc:
             output = aux1 * pdf1((x - loc) / sigma1)
         else:
             output = aux2 * pdf2((x - loc) / sigma2)
     else:
         x = asarray(x)
-        output = empty(x.size)
-        index = x < loc
-        output[index] = aux1 * pdf1((x[index] - loc) / sigma1)
-        index = x >= loc
-        output[index] = aux2 * pdf2((x[index] - loc) / sigma2)
+        output = two_piece(x, x < loc, pdf1, (loc, sigma1, 0, aux1), pdf2, (loc, sigma2, 0, aux2), out=out)
+        output = output[()] if out is None else output
 
     return output
 
 
-def cdf_tpd_generic(x, cdf1, cdf2, loc, sigma1, sigma2, epsilon):
+@instrumented('double')
+def cdf_tpd_generic(x, cdf1, cdf2, loc, sigma1, sigma2, epsilon, out=None):
     """
     Cumulative Density Function at x of the defined two piece distribution.
 
@@ -60,29 +71,29 @@ def cdf_tpd_generic(x, cdf1, cdf2, loc, sigma1, sigma2, epsilon):
     :param sigma1: scale parameter
     :param sigma2: scale parameter
     :param epsilon: shape parameter
+    :param out: optional output array for array inputs
     :return:
 
     """
 
-    if sigma1 * sigma2 <= 0:
+    if (asarray(sigma1) * asarray(sigma2) <= 0).any():
         raise ValueError('Scale parameters must be positive.')
-    if isscalar(x):
+    if all_scalar(x, loc, sigma1, sigma2, epsilon):
         if x < loc:
             output = 2 * epsilon * cdf1((x - loc) / sigma1)
         else:
             output = epsilon + (1 - epsilon) * (2 * cdf2((x - loc) / sigma2) - 1)
     else:
         x = asarray(x)
-        output = empty(x.size)
-        index = x < loc
-        output[index] = 2 * epsilon * cdf1((x[index] - loc) / sigma1)
-        index = x >= loc
-        output[index] = epsilon + (1 - epsilon) * (2 * cdf2((x[index] - loc) / sigma2) - 1)
+        output = two_piece(x, x < loc, cdf1, (loc, sigma1, 0, 2 * epsilon),
+                           cdf2, (loc, sigma2, 2 * epsilon - 1, 2 * (1 - epsilon)), out=out)
+        output = output[()] if out is None else output
 
     return output
 
 
-def qqf_tpd_generic(q, qqf1, qqf2, loc, sigma1, sigma2, epsilon):
+@instrumented('double')
+def qqf_tpd_generic(q, qqf1, qqf2, loc, sigma1, sigma2, epsilon, out=None):
     """
     Quantile Function at q of the defined two piece distribution.
 
@@ -93,13 +104,14 @@ def qqf_tpd_generic(q, qqf1, qqf2, loc, sigma1, sigma2, epsilon):
     :param sigma1: scale parameter
     :param sigma2: scale parameter
     :param epsilon: shape parameter
+    :param out: optional output array for array inputs
     :return:
     """
 
-    if sigma1 * sigma2 <= 0:
+    if (asarray(sigma1) * asarray(sigma2) <= 0).any():
         raise ValueError('Scale parameters must be positive.')
 
-    if isscalar(q):
+    if all_scalar(q, loc, sigma1, sigma2, epsilon):
         if q > 1 or q < 0:
             raise ValueError('Quantile Function is defined on (0,1).')
         if q <= epsilon:
@@ -109,57 +121,232 @@ def qqf_tpd_generic(q, qqf1, qqf2, loc, sigma1, sigma2, epsilon):
             output = loc + sigma2 * qqf2(aux)
     else:
         q = asarray(q)
-        if sum((q > 1) | (q < 0)) > 0:
+        if ((q > 1) | (q < 0)).any():
             raise ValueError('Quantile Function is defined on (0,1).')
-        output = empty(q.size)
-        index = q <= epsilon
-        output[index] = loc + sigma1 * qqf1((0.5 / epsilon) * q[index])
-        index = q > epsilon
-        aux = 0.5 * ((q[index] - epsilon) / (1 - epsilon) + 1)
-        output[index] = loc + sigma2 * qqf2(aux)
+        output = _qqf_tpd_array(q, qqf1, qqf2, loc, sigma1, sigma2, epsilon, out)
+        output = output[()] if out is None else output
+
+    return output
+
+
+def _qqf_tpd_array(q, qqf1, qqf2, loc, sigma1, sigma2, epsilon, out=None):
+    output = two_piece(q, q <= epsilon, qqf1, (0, 2 * epsilon, loc, sigma1),
+                       qqf2, (2 * epsilon - 1, 2 * (1 - epsilon), loc, sigma2), out=out)
+    return output
+
+
+@instrumented('double')
+def logpdf_tpd_generic(x, logpdf1, logpdf2, loc, sigma1, sigma2, epsilon, out=None):
+    """
+    Log of the probability density function at x of the defined two piece distribution.
+    :param x: array like
+    :param logpdf1: the log of a probability density function from a symmetric distribution defined on R.
+    :param logpdf2: the log of a probability density function from a symmetric distribution defined on R.
+    :param loc: location parameter
+    :param sigma1: scale parameter
+    :param sigma2: scale parameter
+    :param epsilon: shape parameter
+    :param out: optional output array for array inputs
+    :return:
+    """
+
+    if (asarray(sigma1) * asarray(sigma2) <= 0).any():
+        raise ValueError('Scale parameters must be positive.')
+
+    aux1 = log(2 * epsilon / sigma1)
+    aux2 = log(2 * (1 - epsilon) / sigma2)
+
+    if all_scalar(x, loc, sigma1, sigma2, epsilon):
+        if x < loc:
+            output = aux1 + logpdf1((x - loc) / sigma1)
+        else:
+            output = aux2 + logpdf2((x - loc) / sigma2)
+    else:
+        x = asarray(x)
+        output = two_piece(x, x < loc, logpdf1, (loc, sigma1, aux1, 1), logpdf2, (loc, sigma2, aux2, 1), out=out)
+        output = output[()] if out is None else output
+
+    return output
+
+
+@instrumented('double')
+def logcdf_tpd_generic(x, cdf2, logcdf1, loc, sigma1, sigma2, epsilon, out=None):
+    """
+    Log of the Cumulative Density Function at x of the defined two piece distribution. The left tail uses
+    logcdf1 directly, so it does not underflow.
+
+    :param x: array like
+    :param cdf2: a cumulative density function from a symmetric distribution defined on R.
+    :param logcdf1: the log of a cumulative density function from a symmetric distribution defined on R.
+    :param loc: location parameter
+    :param sigma1: scale parameter
+    :param sigma2: scale parameter
+    :param epsilon: shape parameter
+    :param out: optional output array for array inputs
+    :return:
+    """
+
+    if (asarray(sigma1) * asarray(sigma2) <= 0).any():
+        raise ValueError('Scale parameters must be positive.')
+    if all_scalar(x, loc, sigma1, sigma2, epsilon):
+        if x < loc:
+            output = log(2 * epsilon) + logcdf1((x - loc) / sigma1)
+        else:
+            output = log1p(-2 * (1 - epsilon) * cdf2((loc - x) / sigma2))
+    else:
+        x = asarray(x)
+        output = two_piece(x, x < loc, logcdf1, (loc, sigma1, log(2 * epsilon), 1),
+                           log_complement(cdf2, 2 * (1 - epsilon)), (loc, -sigma2, 0, 1), out=out)
+        output = output[()] if out is None else output
+
+    return output
+
+
+@instrumented('double')
+def sf_tpd_generic(x, cdf1, cdf2, loc, sigma1, sigma2, epsilon, out=None):
+    """
+    Survival Function (1 - cdf) at x of the defined two piece distribution, accurate in the right tail.
+
+    :param x: array like
+    :param cdf1: a cumulative density function from a symmetric distribution defined on R.
+    :param cdf2: a cumulative density function from a symmetric distribution defined on R.
+    :param loc: location parameter
+    :param sigma1: scale parameter
+    :param sigma2: scale parameter
+    :param epsilon: shape parameter
+    :param out: optional output array for array inputs
+    :return:
+    """
+
+    if (asarray(sigma1) * asarray(sigma2) <= 0).any():
+        raise ValueError('Scale parameters must be positive.')
+    if all_scalar(x, loc, sigma1, sigma2, epsilon):
+        if x < loc:
+            output = 1 - 2 * epsilon * cdf1((x - loc) / sigma1)
+        else:
+            output = 2 * (1 - epsilon) * cdf2((loc - x) / sigma2)
+    else:
+        x = asarray(x)
+        output = two_piece(x, x < loc, cdf1, (loc, sigma1, 1, -2 * epsilon),
+                           cdf2, (loc, -sigma2, 0, 2 * (1 - epsilon)), out=out)
+        output = output[()] if out is None else output
 
     return output
 
 
-def random_tpd_sample(size, qqf1, qqf2, loc, sigma1, sigma2, epsilon):
+@instrumented('double')
+def logsf_tpd_generic(x, cdf1, logcdf2, loc, sigma1, sigma2, epsilon, out=None):
+    """
+    Log of the Survival Function at x of the defined two piece distribution. The right tail uses logcdf2
+    directly, so it does not underflow.
+
+    :param x: array like
+    :param cdf1: a cumulative density function from a symmetric distribution defined on R.
+    :param logcdf2: the log of a cumulative density function from a symmetric distribution defined on R.
+    :param loc: location parameter
+    :param sigma1: scale parameter
+    :param sigma2: scale parameter
+    :param epsilon: shape parameter
+    :param out: optional output array for array inputs
+    :return:
+    """
+
+    if (asarray(sigma1) * asarray(sigma2) <= 0).any():
+        raise ValueError('Scale parameters must be positive.')
+    if all_scalar(x, loc, sigma1, sigma2, epsilon):
+        if x < loc:
+            output = log1p(-2 * epsilon * cdf1((x - loc) / sigma1))
+        else:
+            output = log(2 * (1 - epsilon)) + logcdf2((loc - x) / sigma2)
+    else:
+        x = asarray(x)
+        output = two_piece(x, x < loc, log_complement(cdf1, 2 * epsilon), (loc, sigma1, 0, 1),
+                           logcdf2, (loc, -sigma2, log(2 * (1 - epsilon)), 1), out=out)
+        output = output[()] if out is None else output
+
+    return output
+
+
+@instrumented('double')
+def isf_tpd_generic(q, qqf1, qqf2, loc, sigma1, sigma2, epsilon, out=None):
+    """
+    Inverse Survival Function at q of the defined two piece distribution, accurate for small q.
+
+    :param q: array like
+    :param qqf1: a quantile function (ppf) from a symmetric distribution defined on R.
+    :param qqf2: a quantile function (ppf) from a symmetric distribution defined on R.
+    :param loc: location parameter
+    :param sigma1: scale parameter
+    :param sigma2: scale parameter
+    :param epsilon: shape parameter
+    :param out: optional output array for array inputs
+    :return:
+    """
+
+    if (asarray(sigma1) * asarray(sigma2) <= 0).any():
+        raise ValueError('Scale parameters must be positive.')
+
+    if all_scalar(q, loc, sigma1, sigma2, epsilon):
+        if q > 1 or q < 0:
+            raise ValueError('Inverse Survival Function is defined on (0,1).')
+        if q >= 1 - epsilon:
+            output = loc + sigma1 * qqf1((1 - q) / (2 * epsilon))
+        else:
+            output = loc - sigma2 * qqf2(q / (2 * (1 - epsilon)))
+    else:
+        q = asarray(q)
+        if ((q > 1) | (q < 0)).any():
+            raise ValueError('Inverse Survival Function is defined on (0,1).')
+        output = two_piece(q, q >= 1 - epsilon, qqf1, (1, -2 * epsilon, loc, sigma1),
+                           qqf2, (0, 2 * (1 - epsilon), loc, -sigma2), out=out)
+        output = output[()] if out is None else output
+
+    return output
+
+
+@instrumented('double')
+def random_tpd_sample(size, qqf1, qqf2, loc, sigma1, sigma2, epsilon, random_state=None, half=None, shape1=None,
+                      shape2=None):
     """
     Random Sample Generation
 
-    :param size: integer, sample size
+    :param size: integer or tuple of integers, sample size. It must broadcast against the parameters.
     :param qqf1: a quantile function (qqf) from a symmetric distribution defined on R.
     :param qqf2: a quantile function (qqf) from a symmetric distribution defined on R.
     :param loc: location parameter
     :param sigma1: scale parameter
     :param sigma2: scale parameter
     :param epsilon: shape parameter
+    :param random_state: None, integer, SeedSequence, numpy.random.Generator or numpy.random.RandomState
+    :param half: optional direct generator of the absolute value of the base (see twopiece.rng.HALF_SAMPLERS),
+    used instead of qqf1 and qqf2 when the parameters are scalar
+    :param shape1: shape parameter of the left base passed to half
+    :param shape2: shape parameter of the right base passed to half
     :return:
     """
-    if not isinstance(size, int):
+    if not isinstance(size, (int, tuple)):
         raise TypeError('Sample size must be of type integer.')
 
-    if sigma1 * sigma2 <= 0:
+    if (asarray(sigma1) * asarray(sigma2) <= 0).any():
         raise ValueError('Scale parameters must be positive.')
 
-    alpha = random.rand(size)
+    generator = check_random_state(random_state)
 
-    if isscalar(alpha):
-        if alpha <= epsilon:
-            qq = loc + sigma1 * qqf1(0.5 * alpha / epsilon)
-        else:
-            qq = loc + sigma2 * qqf2(0.5 * ((alpha - epsilon) / (1 - epsilon) + 1))
-    else:
-        alpha = asarray(alpha)
-        qq = empty(alpha.size)
-        index = alpha <= epsilon
-        qq[index] = loc + sigma1 * qqf1(0.5 * alpha[index] * (1 / epsilon))
-        index = alpha > epsilon
-        qq[index] = loc + sigma2 * qqf2(0.5 * ((alpha[index] - epsilon) / (1 - epsilon) + 1))
+    if half is not None and all_scalar(loc, sigma1, sigma2, epsilon) and \
+            (shape1 is None or all_scalar(shape1, shape2)):
+        return sample_two_piece(size, half, half, loc, sigma1, sigma2, epsilon, generator, shape1, shape2)
+
+    alpha = generator.random(size)
+    qq = _qqf_tpd_array(alpha, qqf1, qqf2, loc, sigma1, sigma2, epsilon,
+                        alpha if all_scalar(loc, sigma1, sigma2, epsilon) else None)
 
     return qq
 
 
 class TwoPieceDouble:
 
+    family = None
+
     def __init__(self, f, loc, sigma1, sigma2, sigma, gamma, shape1, shape2, kind):
 
         """
@@ -175,7 +362,7 @@ class TwoPieceDouble:
         :param kind: Parametrisation
         """
 
-        if all(v is None for v in {sigma1, sigma2, sigma, gamma, kind}):
+        if all(v is None for v in (sigma1, sigma2, sigma, gamma, kind)):
             raise AssertionError('Expected either (sigma1, sigma2) or (sigma, gamma, kind).')
 
         if kind:
@@ -191,7 +378,7 @@ class TwoPieceDouble:
         self.shape2 = shape2
         self.kind = kind
 
-        if sigma1 and sigma2:
+        if sigma1 is not None and sigma2 is not None:
             self.sigma1 = sigma1
             self.sigma2 = sigma2
         else:
@@ -200,46 +387,132 @@ class TwoPieceDouble:
             self.sigma2 = sigma2
 
 
-class tpd_continuous(TwoPieceDouble):
+@instrumented_methods
+class tpd_continuous(TwoPieceDouble, Streaming, TabulatedPpf, GridEvaluation, Moments, RiskMeasures):
 
     def __init__(self, f, loc, sigma1, sigma2, sigma, gamma, shape1, shape2, kind):
         super().__init__(f, loc, sigma1, sigma2, sigma, gamma, shape1, shape2, kind)
+        self._freeze_bases()
 
-        self.f1 = self.f(self.shape1)
-        self.f2 = self.f(self.shape2)
-        self.epsilon = self.sigma1 * self.f2.pdf(0) / (self.sigma1 * self.f2.pdf(0) + self.sigma2 * self.f1.pdf(0))
+    def _freeze_bases(self):
+        self.f1, pdf1_at_zero = frozen_base(self.f, self.shape1)
+        self.f2, pdf2_at_zero = frozen_base(self.f, self.shape2)
+        self.epsilon = self.sigma1 * pdf2_at_zero / (self.sigma1 * pdf2_at_zero + self.sigma2 * pdf1_at_zero)
 
-    def pdf(self, x):
-        s = pdf_tpd_generic(x, self.f1.pdf, self.f2.pdf, self.loc, self.sigma1, self.sigma2, self.epsilon)
+    @classmethod
+    def from_params(cls, params):
+        """
+        Fast constructor from validated parameters, skipping the checks and conversions of __init__.
+        :param params: DoubleParams
+        :return: instance of cls
+        """
+        if cls.family is None:
+            raise TypeError(f'{cls.__name__} has no base distribution, use one of its subclasses.')
+        dist = cls.__new__(cls)
+        dist.f = cls.family
+        dist.loc, dist.sigma1, dist.sigma2, dist.shape1, dist.shape2 = params
+        dist.sigma = dist.gamma = dist.kind = None
+        dist._freeze_bases()
+        return dist
+
+    @property
+    def params(self):
+        return DoubleParams._make((self.loc, self.sigma1, self.sigma2, self.shape1, self.shape2))
+
+    def pdf(self, x, out=None):
+        s = pdf_tpd_generic(x, self.f1.pdf, self.f2.pdf, self.loc, self.sigma1, self.sigma2, self.epsilon, out)
         return s
 
-    def cdf(self, x):
-        s = cdf_tpd_generic(x, self.f1.cdf, self.f2.cdf, self.loc, self.sigma1, self.sigma2, self.epsilon)
+    def cdf(self, x, out=None):
+        s = cdf_tpd_generic(x, self.f1.cdf, self.f2.cdf, self.loc, self.sigma1, self.sigma2, self.epsilon, out)
         return s
 
-    def ppf(self, x):
-        qq = qqf_tpd_generic(x, self.f1.ppf, self.f2.ppf, self.loc, self.sigma1, self.sigma2, self.epsilon)
+    def ppf(self, x, out=None):
+        qq = qqf_tpd_generic(x, self.f1.ppf, self.f2.ppf, self.loc, self.sigma1, self.sigma2, self.epsilon, out)
         return qq
 
-    def random_sample(self, size):
-        sample = random_tpd_sample(size, self.f1.ppf, self.f2.ppf, self.loc, self.sigma1, self.sigma2, self.epsilon)
+    def logpdf(self, x, out=None):
+        s = logpdf_tpd_generic(x, self.f1.logpdf, self.f2.logpdf, self.loc, self.sigma1, self.sigma2, self.epsilon,
+                               out)
+        return s
+
+    def logcdf(self, x, out=None):
+        s = logcdf_tpd_generic(x, self.f2.cdf, self.f1.logcdf, self.loc, self.sigma1, self.sigma2, self.epsilon,
+                               out)
+        return s
+
+    def sf(self, x, out=None):
+        s = sf_tpd_generic(x, self.f1.cdf, self.f2.cdf, self.loc, self.sigma1, self.sigma2, self.epsilon, out)
+        return s
+
+    def logsf(self, x, out=None):
+        s = logsf_tpd_generic(x, self.f1.cdf, self.f2.logcdf, self.loc, self.sigma1, self.sigma2, self.epsilon,
+                              out)
+        return s
+
+    def isf(self, q, out=None):
+        x = isf_tpd_generic(q, self.f1.ppf, self.f2.ppf, self.loc, self.sigma1, self.sigma2, self.epsilon, out)
+        return x
+
+    def random_sample(self, size, random_state=None):
+        sample = random_tpd_sample(size, self.f1.ppf, self.f2.ppf, self.loc, self.sigma1, self.sigma2, self.epsilon,
+                                   random_state, half_sampler(self.f), self.shape1, self.shape2)
+        return sample
+
+    def random_sample_chunked(self, size, out=None, random_state=None, chunk_size=CHUNK_SIZE, max_workers=None):
+        """
+        Random sample generated in chunks on a thread pool, see twopiece.rng.chunked_sample. The parameters of
+        the distribution must be scalar.
+        :param size: integer or tuple of integers, sample size
+        :param out: optional C contiguous output array of the given size, e.g. a numpy.memmap
+        :param random_state: None, integer, SeedSequence or numpy.random.Generator
+        :param chunk_size: number of draws per chunk
+        :param max_workers: number of threads
+        :return: out
+        """
+        def sampler(n, generator):
+            return random_tpd_sample(n, self.f1.ppf, self.f2.ppf, self.loc, self.sigma1, self.sigma2, self.epsilon,
+                                     generator, half_sampler(self.f), self.shape1, self.shape2)
+
+        sample = chunked_sample(sampler, size, out, random_state, chunk_size, max_workers)
         return sample
 
+    def _pieces(self):
+        return self.f, self.shape1, self.shape2, self.epsilon
+
+    def _bases(self):
+        return self.f1, self.f2
+
+    def fit(self, data):
+        """
+        Maximum likelihood estimates of the parameters, starting from the data and the shapes of this instance.
+        :param data: array like of observations
+        :return: dict with the estimated loc, sigma1, sigma2, shape1 and shape2
+        """
+        params = fit_tpd(data, self.f, self.f, shape1=self.shape1, shape2=self.shape2)
+        return fit_result(('loc', 'sigma1', 'sigma2', 'shape1', 'shape2'), params)
+
 
 class dtpstudent(tpd_continuous):
 
+    family = scipy.stats.t
+
     def __init__(self, loc=0.0, sigma1=None, sigma2=None, sigma=None, gamma=None, shape1=None, shape2=None, kind=None):
         tpd_continuous.__init__(self, scipy.stats.t, loc, sigma1, sigma2, sigma, gamma, shape1, shape2, kind)
 
 
 class dtpgennorm(tpd_continuous):
 
+    family = scipy.stats.gennorm
+
     def __init__(self, loc=0.0, sigma1=None, sigma2=None, sigma=None, gamma=None, shape1=None, shape2=None, kind=None):
         tpd_continuous.__init__(self, scipy.stats.gennorm, loc, sigma1, sigma2, sigma, gamma, shape1, shape2, kind)
 
 
 class dtpsas(tpd_continuous):
 
+    family = ssas
+
     def __init__(self, loc=0.0, sigma1=None, sigma2=None, sigma=None, gamma=None, shape1=None, shape2=None, kind=None):
         tpd_continuous.__init__(self, ssas, loc, sigma1, sigma2, sigma, gamma, shape1, shape2, kind)
 
@@ -0,0 +1,113 @@
+# -*- coding: utf-8 -*-
+# name: twopiece.fan.py
+# --
+# coding: utf-8
+
+"""
+Fan charts.
+
+A fan chart shows, for every forecast horizon, the quantiles of a two piece normal distribution with the Bank of
+England parametrisation: mode, uncertainty (sigma) and skewness (gamma, the mean minus the mode). The quantiles
+of all the horizons, and of all the scenarios when the parameters are given as 2d tables, are computed in a
+single vectorised call of tpnorm.ppf, so fans are recomputed without Python loops.
+
+The package ships the projections of CPI inflation of the Bank of England November 2019 Monetary Policy Report,
+data/fan_parameters.csv (one row of parameters per quarter), and the inflation outturns that precede them,
+data/fan_history.csv (Date, Inflation), which a chart draws as the line leading into the fan. They are the
+defaults of read_fan_parameters, fan_chart_from_table and read_fan_history.
+"""
+
+import csv
+import os
+
+from numpy import asarray, array
+
+from twopiece.scale import tpnorm
+
+PERCENTILES = (5, 10, 15, 20, 25, 30, 35, 40, 45, 50, 55, 60, 65, 70, 75, 80, 85, 90, 95)
+
+COLUMNS = {'date': 'Date', 'mode': 'Mode', 'uncertainty': 'Uncertainty', 'skewness': 'Skewness'}
+
+HISTORY_COLUMNS = {'date': 'Date', 'value': 'Inflation'}
+
+FAN_PARAMETERS = os.path.join(os.path.dirname(__file__), 'data', 'fan_parameters.csv')
+
+FAN_HISTORY = os.path.join(os.path.dirname(__file__), 'data', 'fan_history.csv')
+
+
+def fan_chart(mode, uncertainty, skewness, percentiles=PERCENTILES, kind='boe'):
+    """
+    Quantiles of the fan chart.
+    :param mode: mode of every horizon, array like
+    :param uncertainty: uncertainty (sigma) of every horizon, array like
+    :param skewness: skewness (gamma) of every horizon, array like
+    :param percentiles: percentiles of the bands, in (0, 100)
+    :param kind: parametrisation of uncertainty and skewness, boe by default
+    :return: array of shape broadcast(mode, uncertainty, skewness).shape + (len(percentiles),)
+    """
+    q = asarray(percentiles, dtype=float) / 100
+    if not ((q > 0) & (q < 1)).all():
+        raise ValueError('Percentiles must be in (0, 100).')
+    mode, uncertainty, skewness = (asarray(p, dtype=float)[..., None] for p in (mode, uncertainty, skewness))
+    return tpnorm(loc=mode, sigma=uncertainty, gamma=skewness, kind=kind).ppf(q)
+
+
+def _read_table(source, description):
+    # Columns of a CSV file as lists of strings, or the table itself when it is not a path
+    if not (isinstance(source, str) or hasattr(source, '__fspath__')):
+        return source
+    with open(source, newline='') as file:
+        rows = list(csv.DictReader(file))
+    if not rows:
+        raise ValueError(f'The table of {description} is empty.')
+    return {name: [row[name] for row in rows] for name in rows[0]}
+
+
+def _columns(table, columns, keys, description):
+    for key in keys:
+        if columns[key] not in table:
+            raise ValueError(f'Column {columns[key]} not found in the table of {description}.')
+    values = {key: asarray(table[columns[key]], dtype=float) for key in keys}
+    values['date'] = array(table[columns['date']], dtype=str) if columns['date'] in table else None
+    return values
+
+
+def read_fan_parameters(source=FAN_PARAMETERS, columns=None):
+    """
+    Reads a table of fan chart parameters.
+    :param source: path of a CSV file with a header row, or a table indexable by column name (e.g. a DataFrame),
+    the parameters shipped in data/fan_parameters.csv by default
+    :param columns: optional dict mapping date, mode, uncertainty and skewness to the column names, which
+    default to Date, Mode, Uncertainty, Skewness
+    :return: dict with the date column as an array of strings (None if absent) and mode, uncertainty and
+    skewness as float arrays
+    """
+    columns = {**COLUMNS, **(columns or {})}
+    table = _read_table(source, 'fan chart parameters')
+    return _columns(table, columns, ('mode', 'uncertainty', 'skewness'), 'fan chart parameters')
+
+
+def read_fan_history(source=FAN_HISTORY, columns=None):
+    """
+    Reads the history of the forecast variable, drawn before the fan.
+    :param source: path of a CSV file with a header row, or a table indexable by column name (e.g. a DataFrame),
+    the inflation outturns shipped in data/fan_history.csv by default
+    :param columns: optional dict mapping date and value to the column names, which default to Date, Inflation
+    :return: dict with the date column as an array of strings (None if absent) and value as a float array
+    """
+    columns = {**HISTORY_COLUMNS, **(columns or {})}
+    table = _read_table(source, 'fan chart history')
+    return _columns(table, columns, ('value',), 'fan chart history')
+
+
+def fan_chart_from_table(source=FAN_PARAMETERS, percentiles=PERCENTILES, columns=None):
+    """
+    Quantiles of the fan chart of a table of parameters.
+    :param source: path of a CSV file or table, see read_fan_parameters
+    :param percentiles: percentiles of the bands, in (0, 100)
+    :param columns: optional dict of column names, see read_fan_parameters
+    :return: tuple (dates, array of shape (number of rows, len(percentiles)))
+    """
+    parameters = read_fan_parameters(source, columns)
+    quantiles = fan_chart(parameters['mode'], parameters['uncertainty'], parameters['skewness'], percentiles)
+    return parameters['date'], quantiles
@@ -0,0 +1,330 @@
+# -*- coding: utf-8 -*-
+# name: twopiece.fit.py
+# --
+# coding: utf-8
+
+"""
+Maximum likelihood estimation for the two piece families.
+
+All the families share the log-likelihood of the double two piece form
+
+    l = n log 2 + n1 log c2 + n2 log c1 - n log(sigma1 c2 + sigma2 c1) + sum_left g1(z) + sum_right g2(z)
+
+where z = (x - loc) / sigma_k, g_k is the log density of the k-th standard base, c_k = exp(g_k(0)) and n1, n2
+are the number of observations on each side of loc. The scale families are the special case f1 = f2 (with a
+common shape), and the shape family the case sigma1 = sigma2. The gradient with respect to every parameter only
+needs the derivative of g_k with respect to z and to its shape, which are implemented in closed form for every
+base of the package below, so the likelihood and its gradient are computed together in a single pass over the
+data. The two piece normal is fitted through its profile likelihood, which reduces the problem to a one
+dimensional search over loc.
+"""
+
+import warnings
+
+from numpy import asarray, sort, cumsum, concatenate, arange, argmin, sqrt, log, log1p, exp, abs, sign, tanh, \
+    sinh, cosh, arcsinh, pi, isfinite, hypot, count_nonzero, float64, array, logaddexp, median
+from scipy.optimize import minimize, minimize_scalar
+from scipy.special import gammaln, digamma
+
+from twopiece.closedform import base_key
+from twopiece.sinharcsinh import ssas
+
+
+class NormalScore:
+    """Log density of the standard normal and its derivative."""
+
+    def logpdf(self, z, shape=None):
+        return -0.5 * z * z - 0.5 * log(2 * pi)
+
+    def dlogpdf(self, z, shape=None):
+        return -z
+
+
+class LaplaceScore:
+    """Log density of the standard Laplace and its derivative."""
+
+    def logpdf(self, z, shape=None):
+        return log(0.5) - abs(z)
+
+    def dlogpdf(self, z, shape=None):
+        return -sign(z)
+
+
+class LogisticScore:
+    """Log density of the standard logistic and its derivative."""
+
+    def logpdf(self, z, shape=None):
+        return -abs(z) - 2 * log1p(exp(-abs(z)))
+
+    def dlogpdf(self, z, shape=None):
+        return -tanh(0.5 * z)
+
+
+class CauchyScore:
+    """Log density of the standard Cauchy and its derivative."""
+
+    def logpdf(self, z, shape=None):
+        return -log(pi) - 2 * log(hypot(1, z))
+
+    def dlogpdf(self, z, shape=None):
+        return -2 * z / (1 + z * z)
+
+
+class StudentScore:
+    """Log density of the Student t with shape degrees of freedom, its derivative and its shape derivative."""
+
+    def logpdf(self, z, shape):
+        return (gammaln(0.5 * (shape + 1)) - gammaln(0.5 * shape) - 0.5 * log(shape * pi)
+                - 0.5 * (shape + 1) * log1p(z * z / shape))
+
+    def dlogpdf(self, z, shape):
+        return -(shape + 1) * z / (shape + z * z)
+
+    def dshape(self, z, shape):
+        z2 = z * z
+        return 0.5 * (digamma(0.5 * (shape + 1)) - digamma(0.5 * shape) - 1 / shape - log1p(z2 / shape)
+                      + (shape + 1) * z2 / (shape * (shape + z2)))
+
+
+class GennormScore:
+    """Log density of the generalised normal with shape beta, its derivative and its shape derivative."""
+
+    def logpdf(self, z, shape):
+        return log(0.5 * shape) - gammaln(1 / shape) - abs(z) ** shape
+
+    def dlogpdf(self, z, shape):
+        return -shape * sign(z) * abs(z) ** (shape - 1)
+
+    def dshape(self, z, shape):
+        absz = abs(z)
+        # |z|^beta log|z| tends to 0 at z = 0
+        power_log = absz ** shape * log(absz + (absz == 0))
+        return 1 / shape + digamma(1 / shape) / shape ** 2 - power_log
+
+
+class SinhArcsinhScore:
+    """Log density of the symmetric sinh-arcsinh with shape delta, its derivative and its shape derivative."""
+
+    def logpdf(self, z, shape):
+        w = shape * arcsinh(z)
+        s = sinh(w)
+        return log(shape) - 0.5 * s * s - 0.5 * log(2 * pi) + logaddexp(w, -w) - log(2) - log(hypot(1, z))
+
+    def dlogpdf(self, z, shape):
+        w = shape * arcsinh(z)
+        return shape * (tanh(w) - sinh(w) * cosh(w)) / hypot(1, z) - z / (1 + z * z)
+
+    def dshape(self, z, shape):
+        a = arcsinh(z)
+        w = shape * a
+        return 1 / shape + a * (tanh(w) - sinh(w) * cosh(w))
+
+
+SCORES = {
+    'norm': NormalScore(),
+    'laplace': LaplaceScore(),
+    'logistic': LogisticScore(),
+    'cauchy': CauchyScore(),
+    't': StudentScore(),
+    'gennorm': GennormScore(),
+    ssas: SinhArcsinhScore(),
+}
+
+
+def score_for(f):
+    """
+    Analytic log density and derivatives of a base distribution.
+    :param f: continuous symmetric distribution with support on R, as passed to the two piece classes
+    :return: score object with logpdf, dlogpdf and, for families with a shape, dshape
+    """
+    key = base_key(f)
+    if key not in SCORES:
+        raise ValueError(f'Fitting is not supported for the base distribution {f}.')
+    return SCORES[key]
+
+
+def _check_data(data):
+    x = asarray(data, dtype=float64).reshape(-1)
+    if x.size < 3:
+        raise ValueError('At least three observations are needed to fit a two piece distribution.')
+    if not isfinite(x).all():
+        raise ValueError('Data must be finite.')
+    return x
+
+
+def loglikelihood_tpd(x, score1, score2, loc, sigma1, sigma2, shape1=None, shape2=None):
+    """
+    Log-likelihood of the double two piece distribution and its gradient.
+
+    :param x: one dimensional array of observations
+    :param score1: score object of the left base (see SCORES)
+    :param score2: score object of the right base (see SCORES)
+    :param loc: location parameter
+    :param sigma1: scale parameter
+    :param sigma2: scale parameter
+    :param shape1: shape parameter of the left base, None if it has no shape
+    :param shape2: shape parameter of the right base, None if it has no shape
+    :return: log-likelihood and gradient array with respect to (loc, sigma1, sigma2[, shape1, shape2])
+    """
+    left = x < loc
+    n = x.size
+    n1 = count_nonzero(left)
+    n2 = n - n1
+    z1 = (x[left] - loc) / sigma1
+    z2 = (x[~left] - loc) / sigma2
+
+    g1, g2 = score1.logpdf(0.0, shape1), score2.logpdf(0.0, shape2)
+    c1, c2 = exp(g1), exp(g2)
+    d = sigma1 * c2 + sigma2 * c1
+
+    value = n * log(2) + n1 * g2 + n2 * g1 - n * log(d) + score1.logpdf(z1, shape1).sum() \
+        + score2.logpdf(z2, shape2).sum()
+
+    dg1, dg2 = score1.dlogpdf(z1, shape1), score2.dlogpdf(z2, shape2)
+    gradient = [-dg1.sum() / sigma1 - dg2.sum() / sigma2,
+                -n * c2 / d - (dg1 * z1).sum() / sigma1,
+                -n * c1 / d - (dg2 * z2).sum() / sigma2]
+
+    if shape1 is not None:
+        h1, h2 = score1.dshape(0.0, shape1), score2.dshape(0.0, shape2)
+        gradient.append(n2 * h1 - n * sigma2 * c1 * h1 / d + score1.dshape(z1, shape1).sum())
+        gradient.append(n1 * h2 - n * sigma1 * c2 * h2 / d + score2.dshape(z2, shape2).sum())
+
+    return value, array(gradient)
+
+
+def _initial_scales(x, loc):
+    # Median distance to loc on each side, which exists even for the heaviest tails. A side without spread falls
+    # back on the other one, or on the median absolute deviation.
+    scales = []
+    for deviations in (loc - x[x < loc], x[x > loc] - loc):
+        scales.append(median(deviations) if deviations.size else 0.0)
+    fallback = max(scales) or median(abs(x - loc)) or 1.0
+    return scales[0] or fallback, scales[1] or fallback
+
+
+def fit_tpd(data, f1, f2, loc=None, sigma1=None, sigma2=None, shape1=None, shape2=None, tie_sigmas=False,
+            tie_shapes=False):
+    """
+    Maximum likelihood estimates of the double two piece distribution.
+
+    By default the search starts from the sample median for loc and from the median distance to it on each side for
+    sigma1 and sigma2. A RuntimeWarning is issued if the optimiser does not report convergence.
+
+    :param data: array like of observations
+    :param f1: continuous symmetric distribution with support on R for the left piece
+    :param f2: continuous symmetric distribution with support on R for the right piece
+    :param loc: initial location parameter, estimated from the data if None
+    :param sigma1: initial scale parameter, estimated from the data if None
+    :param sigma2: initial scale parameter, estimated from the data if None
+    :param shape1: initial shape parameter of f1, None if f1 has no shape
+    :param shape2: initial shape parameter of f2, None if f2 has no shape
+    :param tie_sigmas: if True sigma1 and sigma2 are constrained to be equal (two piece shape family)
+    :param tie_shapes: if True shape1 and shape2 are constrained to be equal (two piece scale family)
+    :return: tuple (loc, sigma1, sigma2, shape1, shape2)
+    """
+    x = _check_data(data)
+    score1, score2 = score_for(f1), score_for(f2)
+    has_shape = shape1 is not None
+
+    loc = median(x) if loc is None else loc
+    scales = _initial_scales(x, loc)
+    sigma1 = scales[0] if sigma1 is None else sigma1
+    sigma2 = scales[1] if sigma2 is None else sigma2
+    if tie_sigmas:
+        sigma1 = sigma2 = sqrt(sigma1 * sigma2)
+
+    # Positive parameters are optimised on the log scale, and the likelihood is scaled by 1 / n so that the
+    # tolerances of the optimiser do not depend on the sample size.
+    spread = x.std() or 1.0
+    start = [loc / spread, log(sigma1 / spread)] + ([] if tie_sigmas else [log(sigma2 / spread)])
+    if has_shape:
+        start += [log(shape1)] + ([] if tie_shapes else [log(shape2)])
+    x = x / spread
+
+    def unpack(theta):
+        loc_, log_sigma1 = theta[0], theta[1]
+        log_sigma2 = theta[1] if tie_sigmas else theta[2]
+        shapes = theta[2 if tie_sigmas else 3:]
+        shape1_ = exp(shapes[0]) if has_shape else None
+        shape2_ = exp(shapes[0] if tie_shapes else shapes[1]) if has_shape else None
+        return loc_, exp(log_sigma1), exp(log_sigma2), shape1_, shape2_
+
+    def objective(theta):
+        loc_, sigma1_, sigma2_, shape1_, shape2_ = unpack(theta)
+        value, gradient = loglikelihood_tpd(x, score1, score2, loc_, sigma1_, sigma2_, shape1_, shape2_)
+        gradient[1] *= sigma1_
+        gradient[2] *= sigma2_
+        if tie_sigmas:
+            gradient[1] += gradient[2]
+        if has_shape:
+            gradient[3] *= shape1_
+            gradient[4] *= shape2_
+            if tie_shapes:
+                gradient[3] += gradient[4]
+        keep = [0, 1] + ([] if tie_sigmas else [2]) + ([3] if has_shape else []) + \
+            ([4] if has_shape and not tie_shapes else [])
+        return -value / x.size, -gradient[keep] / x.size
+
+    result = minimize(objective, array(start, dtype=float64), jac=True, method='L-BFGS-B')
+    if not result.success:
+        warnings.warn(f'The maximum likelihood fit did not converge: {result.message}', RuntimeWarning, stacklevel=3)
+    loc_, sigma1_, sigma2_, shape1_, shape2_ = unpack(result.x)
+    return loc_ * spread, sigma1_ * spread, sigma2_ * spread, shape1_, shape2_
+
+
+def _profile_tpnorm(x, counts, first, second, loc, k):
+    # Sums of squared deviations from loc on each side when x[:k] < loc <= x[k:]
+    s1 = second[k] - 2 * loc * first[k] + counts[k] * loc * loc
+    s2 = (second[-1] - second[k]) - 2 * loc * (first[-1] - first[k]) + (counts[-1] - counts[k]) * loc * loc
+    return abs(s1) ** (1 / 3) + abs(s2) ** (1 / 3), s1, s2
+
+
+def fit_tpnorm(data):
+    """
+    Maximum likelihood estimates of the two piece normal distribution through its profile likelihood.
+
+    For a fixed loc the estimates of the scales are available in closed form, sigma1 = a sqrt((a + b) / n) and
+    sigma2 = b sqrt((a + b) / n) with a and b the cubic roots of the sums of squared deviations from loc on each
+    side, and maximising the likelihood reduces to minimising a + b over loc. The sums are computed from prefix
+    sums of the sorted data, so every candidate costs O(1).
+
+    :param data: array like of observations
+    :return: tuple (loc, sigma1, sigma2)
+    """
+    x = sort(_check_data(data))
+    n = x.size
+    first = concatenate([[0.0], cumsum(x)])
+    second = concatenate([[0.0], cumsum(x * x)])
+    counts = arange(n + 1)
+
+    # Evaluate the profile at every observation, then refine between the neighbours of the best one.
+    k = arange(n)
+    values = _profile_tpnorm(x, counts, first, second, x, k)[0]
+    best = argmin(values)
+    lower, upper = x[max(best - 1, 0)], x[min(best + 1, n - 1)]
+
+    def profile(loc):
+        return _profile_tpnorm(x, counts, first, second, loc, x.searchsorted(loc))[0]
+
+    loc = x[best]
+    if upper > lower:
+        result = minimize_scalar(profile, bounds=(lower, upper), method='bounded')
+        if result.fun < values[best]:
+            loc = result.x
+
+    total, s1, s2 = _profile_tpnorm(x, counts, first, second, loc, x.searchsorted(loc))
+    a, b = abs(s1) ** (1 / 3), abs(s2) ** (1 / 3)
+    factor = sqrt(total / n)
+    return loc, a * factor, b * factor
+
+
+def fit_result(names, values):
+    """
+    Dictionary of fitted parameters, keyed by the constructor arguments of the fitted class.
+    :param names: parameter names
+    :param values: parameter values
+    :return: dict
+    """
+    return {name: float(value) for name, value in zip(names, values)}
+
@@ -0,0 +1,143 @@
+# -*- coding: utf-8 -*-
+# name: twopiece.grid.py
+# --
+# coding: utf-8
+
+"""
+Evaluation on regular grids.
+
+Plots and numerical integrals evaluate the pdf and the cdf on regular grids x = start + step * arange(num), often
+repeatedly on the same grid or on a refined or extended version of it. On such a grid the points below loc are a
+prefix, so a two piece distribution is evaluated by splitting the grid once at loc and applying the left and
+the right base to each contiguous half, without masks:
+
+    pdf(x) = 2 p / sigma1 f1((x - loc) / sigma1) for x < loc,  2 (1 - p) / sigma2 f2((x - loc) / sigma2) otherwise,
+    cdf(x) = 2 p F1((x - loc) / sigma1) for x < loc,  2 p - 1 + 2 (1 - p) F2((x - loc) / sigma2) otherwise,
+
+where p is the probability of the left piece. The last grid evaluated by each method is kept on the instance.
+A grid whose step divides the cached step, and whose points include the cached points (a refinement, an
+extension, or both), only evaluates its new points, which form strided slices of the grid; the cached values
+are reused for the others.
+"""
+
+from numpy import arange, empty, searchsorted, isscalar, integer
+
+RELATIVE_TOLERANCE = 1e-9
+
+
+def grid_points(start, step, num):
+    """
+    Points of a regular grid.
+    :param start: first point
+    :param step: positive spacing
+    :param num: number of points
+    :return: array start + step * arange(num)
+    """
+    return start + step * arange(num)
+
+
+def _reused(cached, start, step, num):
+    # Indices (first, last + 1, stride) of the new grid at which the cached points lie, and the matching slice of
+    # the cached values, None if the cached grid is not contained in the new one
+    old_start, old_step, old_values = cached
+    ratio = old_step / step
+    stride = round(ratio)
+    offset = (old_start - start) / step
+    first = round(offset)
+    if stride < 1 or abs(ratio - stride) > RELATIVE_TOLERANCE * stride or \
+            abs(offset - first) > RELATIVE_TOLERANCE * max(1.0, abs(offset)):
+        return None
+    skip = max(0, -first + stride - 1) // stride
+    stop = min(old_values.size, (num - 1 - first) // stride + 1)
+    if stop <= skip:
+        return None
+    return first + skip * stride, first + (stop - 1) * stride + 1, stride, old_values[skip:stop]
+
+
+class GridEvaluation:
+    """
+    Mixin adding pdf_grid and cdf_grid to a class with scalar parameters and a params property. Two piece
+    classes provide _pieces and _bases, returning the left and right bases with pdf and cdf methods; other
+    classes are evaluated with their own pdf and cdf.
+    """
+
+    def _grid_values(self, name, x, out):
+        if not hasattr(self, '_bases'):
+            getattr(self, name)(x, out=out)
+            return out
+        base1, base2 = self._bases()
+        _, _, _, p = self._pieces()
+        k = searchsorted(x, self.loc)
+        left, right = out[:k], out[k:]
+        left[...] = x[:k]
+        right[...] = x[k:]
+        left -= self.loc
+        left /= self.sigma1
+        right -= self.loc
+        right /= self.sigma2
+        if name == 'pdf':
+            left[...] = base1.pdf(left)
+            left *= 2 * p / self.sigma1
+            right[...] = base2.pdf(right)
+            right *= 2 * (1 - p) / self.sigma2
+        else:
+            left[...] = base1.cdf(left)
+            left *= 2 * p
+            right[...] = base2.cdf(right)
+            right *= 2 * (1 - p)
+            right += 2 * p - 1
+        return out
+
+    def _grid(self, name, start, step, num):
+        if not step > 0:
+            raise ValueError('step must be positive.')
+        if not isinstance(num, (int, integer)) or num < 1:
+            raise ValueError('num must be a positive integer.')
+        params = self.params
+        if not all(p is None or isscalar(p) for p in params):
+            raise ValueError('Grid evaluation requires scalar parameters.')
+
+        caches = self.__dict__.setdefault('_grid_cache', {})
+        cached = caches.get(name)
+        if cached is not None and cached[0] != params:
+            cached = None
+        if cached is not None and cached[1:3] == (start, step) and cached[3].size == num:
+            return cached[3]
+        reused = None if cached is None else _reused(cached[1:], start, step, num)
+
+        values = empty(num)
+        if reused is None:
+            sections = [(0, num, 1)]
+        else:
+            first, stop, stride, old_values = reused
+            values[first:stop:stride] = old_values
+            sections = [(0, first, 1), (stop, num, 1)] + [(first + c, stop, stride) for c in range(1, stride)]
+        for begin, end, stride in sections:
+            if begin < end:
+                self._grid_values(name, start + step * arange(begin, end, stride), values[begin:end:stride])
+
+        values.flags.writeable = False
+        caches[name] = (params, start, step, values)
+        return values
+
+    def pdf_grid(self, start, step, num):
+        """
+        Probability density function on the regular grid start + step * arange(num), reusing the values of the
+        previous grid when this one refines or extends it.
+        :param start: first point
+        :param step: positive spacing
+        :param num: number of points
+        :return: read only array of size num
+        """
+        return self._grid('pdf', start, step, num)
+
+    def cdf_grid(self, start, step, num):
+        """
+        Cumulative distribution function on the regular grid start + step * arange(num), reusing the values of
+        the previous grid when this one refines or extends it.
+        :param start: first point
+        :param step: positive spacing
+        :param num: number of points
+        :return: read only array of size num
+        """
+        return self._grid('cdf', start, step, num)
@@ -0,0 +1,330 @@
+# -*- coding: utf-8 -*-
+# name: twopiece.jit.py
+# --
+# coding: utf-8
+
+"""
+Compiled kernels of the numba backend (see twopiece.backend).
+
+The standard functions of the bases with closed forms (normal, Laplace, logistic, Cauchy, the density of the
+generalised normal and the sinh-arcsinh with a normal base) are compiled as scalar functions f(z, shape).
+resolve maps the callables passed to the generic functions (methods of the closed form bases, of frozen
+scipy.stats distributions and of ssas) to them. A two piece expression a + b * f((x - m) / s) is then evaluated
+by a kernel compiled once per pair of functions, in a single fused loop, which runs on several threads for
+arrays of PARALLEL_SIZE elements or more. The kernels are compiled on first use.
+"""
+
+import math
+
+from numba import njit, prange
+from numpy import asarray, empty, float64, float32, ascontiguousarray, ndim
+
+from twopiece.closedform import CLOSED_FORMS
+from twopiece.kernel import result_dtype
+
+PARALLEL_SIZE = 1 << 15
+
+_SQRT_2 = math.sqrt(2.0)
+_SQRT_2PI = math.sqrt(2 * math.pi)
+_LOG_SQRT_2PI = math.log(_SQRT_2PI)
+_LOG_2 = math.log(2.0)
+
+
+@njit(cache=True)
+def _norm_pdf(z, shape):
+    return math.exp(-0.5 * z * z) / _SQRT_2PI
+
+
+@njit(cache=True)
+def _norm_logpdf(z, shape):
+    return -0.5 * z * z - _LOG_SQRT_2PI
+
+
+@njit(cache=True)
+def _norm_cdf(z, shape):
+    return 0.5 * math.erfc(-z / _SQRT_2)
+
+
+@njit(cache=True)
+def _norm_ppf(q, shape):
+    # Rational approximation of Acklam (relative error below 1.2e-9), refined by one step of Halley's method
+    if not 0.0 < q < 1.0:
+        if q == 0.0:
+            return -math.inf
+        if q == 1.0:
+            return math.inf
+        return math.nan
+    if q < 0.02425:
+        r = math.sqrt(-2.0 * math.log(q))
+        x = ((((((-7.784894002430293e-03 * r - 3.223964580411365e-01) * r - 2.400758277161838e+00) * r
+                - 2.549732539343734e+00) * r + 4.374664141464968e+00) * r + 2.938163982698783e+00)
+             / ((((7.784695709041462e-03 * r + 3.224671290700398e-01) * r + 2.445134137142996e+00) * r
+                 + 3.754408661907416e+00) * r + 1.0))
+    elif q > 0.97575:
+        r = math.sqrt(-2.0 * math.log1p(-q))
+        x = -((((((-7.784894002430293e-03 * r - 3.223964580411365e-01) * r - 2.400758277161838e+00) * r
+                 - 2.549732539343734e+00) * r + 4.374664141464968e+00) * r + 2.938163982698783e+00)
+              / ((((7.784695709041462e-03 * r + 3.224671290700398e-01) * r + 2.445134137142996e+00) * r
+                  + 3.754408661907416e+00) * r + 1.0))
+    else:
+        s = q - 0.5
+        r = s * s
+        x = (((((-3.969683028665376e+01 * r + 2.209460984245205e+02) * r - 2.759285104469687e+02) * r
+               + 1.383577518672690e+02) * r - 3.066479806614716e+01) * r + 2.506628277459239e+00) * s \
+            / (((((-5.447609879822406e+01 * r + 1.615858368580409e+02) * r - 1.556989798598866e+02) * r
+                 + 6.680131188771972e+01) * r - 1.328068155288572e+01) * r + 1.0)
+    # The residual is computed on the side of the smaller tail probability to keep its relative accuracy
+    if x <= 0:
+        e = 0.5 * math.erfc(-x / _SQRT_2) - q
+    else:
+        e = (1.0 - q) - 0.5 * math.erfc(x / _SQRT_2)
+    u = e * _SQRT_2PI * math.exp(0.5 * x * x)
+    return x - u / (1.0 + 0.5 * x * u)
+
+
+@njit(cache=True)
+def _laplace_pdf(z, shape):
+    return 0.5 * math.exp(-abs(z))
+
+
+@njit(cache=True)
+def _laplace_logpdf(z, shape):
+    return -_LOG_2 - abs(z)
+
+
+@njit(cache=True)
+def _laplace_cdf(z, shape):
+    half_tail = 0.5 * math.exp(-abs(z))
+    return 1.0 - half_tail if z > 0 else half_tail
+
+
+@njit(cache=True)
+def _laplace_ppf(q, shape):
+    if q != q:
+        return math.nan
+    if q > 0.5:
+        return -math.log(2.0 * (1.0 - q)) if q < 1.0 else math.inf
+    return math.log(2.0 * q) if q > 0.0 else -math.inf
+
+
+@njit(cache=True)
+def _logistic_pdf(z, shape):
+    e = math.exp(-abs(z))
+    return e / (1.0 + e) ** 2
+
+
+@njit(cache=True)
+def _logistic_logpdf(z, shape):
+    return -abs(z) - 2.0 * math.log1p(math.exp(-abs(z)))
+
+
+@njit(cache=True)
+def _logistic_cdf(z, shape):
+    if z >= 0:
+        return 1.0 / (1.0 + math.exp(-z))
+    e = math.exp(z)
+    return e / (1.0 + e)
+
+
+@njit(cache=True)
+def _logistic_ppf(q, shape):
+    if q != q:
+        return math.nan
+    if q == 0.0:
+        return -math.inf
+    if q == 1.0:
+        return math.inf
+    return math.log(q / (1.0 - q))
+
+
+@njit(cache=True)
+def _cauchy_pdf(z, shape):
+    return 1.0 / math.pi / (1.0 + z * z)
+
+
+@njit(cache=True)
+def _cauchy_logpdf(z, shape):
+    absz = abs(z)
+    if absz < 1:
+        return -math.log(math.pi) - math.log1p(z * z)
+    return -math.log(math.pi) - 2.0 * math.log(absz) - math.log1p(1.0 / (absz * absz))
+
+
+@njit(cache=True)
+def _cauchy_cdf(z, shape):
+    return math.atan2(1.0, -z) / math.pi
+
+
+@njit(cache=True)
+def _cauchy_ppf(q, shape):
+    if q != q:
+        return math.nan
+    if q < 0.5:
+        return -1.0 / math.tan(math.pi * q) if q > 0.0 else -math.inf
+    return 1.0 / math.tan(math.pi * (1.0 - q)) if q < 1.0 else math.inf
+
+
+@njit(cache=True)
+def _gennorm_logpdf(z, shape):
+    return math.log(shape) - _LOG_2 - math.lgamma(1.0 / shape) - abs(z) ** shape
+
+
+@njit(cache=True)
+def _gennorm_pdf(z, shape):
+    return math.exp(_gennorm_logpdf(z, shape))
+
+
+@njit(cache=True)
+def _ssas_pdf(z, shape):
+    w = shape * math.asinh(z)
+    return shape * _norm_pdf(math.sinh(w), 0.0) * math.cosh(w) / math.sqrt(1.0 + z * z)
+
+
+@njit(cache=True)
+def _ssas_logpdf(z, shape):
+    w = shape * math.asinh(z)
+    log_cosh = abs(w) + math.log1p(math.exp(-2.0 * abs(w))) - _LOG_2
+    return math.log(shape) + _norm_logpdf(math.sinh(w), 0.0) + log_cosh - math.log(math.hypot(1.0, z))
+
+
+@njit(cache=True)
+def _ssas_cdf(z, shape):
+    return _norm_cdf(math.sinh(shape * math.asinh(z)), 0.0)
+
+
+@njit(cache=True)
+def _ssas_ppf(q, shape):
+    return math.sinh(math.asinh(_norm_ppf(q, 0.0)) / shape)
+
+
+COMPILED = {
+    'norm': {'pdf': _norm_pdf, 'logpdf': _norm_logpdf, 'cdf': _norm_cdf, 'ppf': _norm_ppf},
+    'laplace': {'pdf': _laplace_pdf, 'logpdf': _laplace_logpdf, 'cdf': _laplace_cdf, 'ppf': _laplace_ppf},
+    'logistic': {'pdf': _logistic_pdf, 'logpdf': _logistic_logpdf, 'cdf': _logistic_cdf, 'ppf': _logistic_ppf},
+    'cauchy': {'pdf': _cauchy_pdf, 'logpdf': _cauchy_logpdf, 'cdf': _cauchy_cdf, 'ppf': _cauchy_ppf},
+    'gennorm': {'pdf': _gennorm_pdf, 'logpdf': _gennorm_logpdf},
+    'ssas': {'pdf': _ssas_pdf, 'logpdf': _ssas_logpdf, 'cdf': _ssas_cdf, 'ppf': _ssas_ppf},
+}
+
+_CLOSED_FORM_NAMES = {type(base): name for name, base in CLOSED_FORMS.items()}
+
+
+def resolve(func):
+    """
+    Compiled counterpart of a standard function.
+    :param func: method pdf, logpdf, cdf or ppf of a closed form base, of a frozen scipy.stats distribution or of
+    an ssas instance
+    :return: tuple (compiled function of (z, shape), shape), None if there is none
+    """
+    from twopiece.sinharcsinh import ssas
+
+    owner = getattr(func, '__self__', None)
+    name = getattr(func, '__name__', None)
+    if owner is None:
+        return None
+    if type(owner) in _CLOSED_FORM_NAMES:
+        key, shape = _CLOSED_FORM_NAMES[type(owner)], 0.0
+    elif isinstance(owner, ssas):
+        key, shape = 'ssas', owner.delta
+    elif hasattr(owner, 'dist') and len(owner.args) == 1 and not owner.kwds:
+        key, shape = owner.dist.name, owner.args[0]
+    else:
+        return None
+    compiled = COMPILED.get(key, {}).get(name)
+    if compiled is None or ndim(shape) != 0:
+        return None
+    return compiled, float(shape)
+
+
+_KERNELS = {}
+
+
+def _two_piece_kernel(func1, func2, parallel):
+    key = (func1, func2, parallel)
+    kernel = _KERNELS.get(key)
+    if kernel is None:
+        @njit(parallel=parallel)
+        def kernel(x, left, m1, s1, a1, b1, shape1, m2, s2, a2, b2, shape2, out):
+            for i in prange(x.size):
+                if left[i]:
+                    out[i] = a1 + b1 * func1((x[i] - m1) / s1, shape1)
+                else:
+                    out[i] = a2 + b2 * func2((x[i] - m2) / s2, shape2)
+
+        _KERNELS[key] = kernel
+    return kernel
+
+
+def two_piece_compiled(x, left, func1, coef1, func2, coef2, out):
+    """
+    Compiled evaluation of two_piece (see twopiece.kernel) for scalar coefficients and an input, mask and output
+    of the same shape.
+    :return: out, or None if the functions have no compiled counterpart
+    """
+    resolved1 = resolve(func1)
+    resolved2 = resolved1 if func2 is func1 else resolve(func2)
+    if resolved1 is None or resolved2 is None or x.shape != left.shape:
+        return None
+    if x.dtype not in (float64, float32):
+        x = x.astype(float64)
+    if out is None:
+        out = empty(x.shape, dtype=result_dtype(x))
+    elif out.shape != x.shape or out.dtype != x.dtype or not out.flags.c_contiguous:
+        return None
+
+    (f1, shape1), (f2, shape2) = resolved1, resolved2
+    kernel = _two_piece_kernel(f1, f2, x.size >= PARALLEL_SIZE)
+    kernel(ascontiguousarray(x).reshape(-1), ascontiguousarray(left).reshape(-1),
+           *map(float, coef1), shape1, *map(float, coef2), shape2, out.reshape(-1))
+    return out
+
+
+def _sinharcsinh_kernel(name, base, parallel):
+    key = (name, base, parallel)
+    kernel = _KERNELS.get(key)
+    if kernel is not None:
+        return kernel
+
+    if name == 'pdf':
+        @njit(parallel=parallel)
+        def kernel(x, loc, scale, delta, epsilon, out):
+            for i in prange(x.size):
+                z = (x[i] - loc) / scale
+                w = delta * math.asinh(z) - epsilon
+                out[i] = (delta / scale) * base(math.sinh(w), 0.0) * math.cosh(w) / math.sqrt(1.0 + z * z)
+    elif name == 'cdf':
+        @njit(parallel=parallel)
+        def kernel(x, loc, scale, delta, epsilon, out):
+            for i in prange(x.size):
+                out[i] = base(math.sinh(delta * math.asinh((x[i] - loc) / scale) - epsilon), 0.0)
+    else:
+        @njit(parallel=parallel)
+        def kernel(q, loc, scale, delta, epsilon, out):
+            for i in prange(q.size):
+                out[i] = loc + scale * math.sinh((math.asinh(base(q[i], 0.0)) + epsilon) / delta)
+
+    _KERNELS[key] = kernel
+    return kernel
+
+
+def sinharcsinh_compiled(name, func, x, loc, scale, delta, epsilon, out):
+    """
+    Compiled pdf, cdf or ppf of the sinh-arcsinh distribution with scalar parameters.
+    :param name: pdf, cdf or ppf
+    :param func: the corresponding function of the base
+    :return: out, or None if the base has no compiled counterpart
+    """
+    resolved = resolve(func)
+    if resolved is None:
+        return None
+    x = asarray(x)
+    if x.dtype not in (float64, float32):
+        x = x.astype(float64)
+    if out is None:
+        out = empty(x.shape, dtype=result_dtype(x))
+    elif out.shape != x.shape or out.dtype != x.dtype or not out.flags.c_contiguous:
+        return None
+
+    kernel = _sinharcsinh_kernel(name, resolved[0], x.size >= PARALLEL_SIZE)
+    kernel(ascontiguousarray(x).reshape(-1), float(loc), float(scale), float(delta), float(epsilon), out.reshape(-1))
+    return out
@@ -0,0 +1,184 @@
+# -*- coding: utf-8 -*-
+# name: twopiece.kernel.py
+# --
+# coding: utf-8
+
+"""
+Single pass evaluation kernel shared by the generic two piece functions.
+
+Every generic function (pdf, cdf, ppf and random sampling) of the two piece families can be written as
+
+    a + b * func((x - m) / s)
+
+where the coefficients (m, s, a, b), and possibly func, differ between the left and the right piece. The kernel
+standardises the input once, in place, inside the output buffer, selecting the coefficients of each element
+arithmetically instead of gathering and scattering each piece with fancy indexing. Function values, which may be
+infinite, are never selected arithmetically. Large inputs are processed in blocks of BLOCK_SIZE elements, so the
+temporaries, including those created inside scipy.stats, are bounded by the block size.
+
+Peak memory for n elements, on top of the input, the output buffer and the boolean mask of the left piece, is
+therefore O(BLOCK_SIZE). The former implementation allocated two masks, two gathered copies of x, two
+standardised copies and two function outputs of total size n each, plus the scipy.stats temporaries (about
+30-60 bytes per element, see benchmarks/bench_kernel.py).
+
+With the numba backend (see twopiece.backend), expressions with scalar coefficients and compiled functions are
+evaluated by a fused kernel from twopiece.jit instead.
+"""
+
+from numpy import asarray, empty, broadcast_shapes, shape, isscalar, subtract, true_divide, multiply, add, \
+    logical_not, issubdtype, floating, float64, log1p, copyto
+
+from twopiece.backend import get_backend
+from twopiece.profiling import traced_base
+from twopiece.utils import all_scalar
+
+BLOCK_SIZE = 1 << 16
+
+
+def result_dtype(x):
+    """
+    Floating point type of the output for input x: the type of x if it is floating point, float64 otherwise.
+    :param x: array
+    :return: numpy dtype
+    """
+    return x.dtype if issubdtype(x.dtype, floating) else float64
+
+
+def log_complement(func, c):
+    """
+    Function z -> log(1 - c * func(z)), used for the log of the piece complementary to a tail.
+    :param func: a function of z, usually a cdf
+    :param c: scalar or array like coefficient
+    :return: function
+    """
+    def log_complement_func(z):
+        return log1p(-c * func(z))
+
+    return log_complement_func
+
+
+def _select(c1, c2, left, right, dtype):
+    # Arithmetic selection is exact (c * 1 + 0) and, unlike numpy.where or masked ufuncs, free of
+    # data-dependent branches, which are slow on unsorted inputs.
+    selected = multiply(left, c1, dtype=dtype)
+    selected += multiply(right, c2, dtype=dtype)
+    return selected
+
+
+def _apply(ufunc, operand, c1, c2, left, right, out, identity):
+    if isscalar(c1) and isscalar(c2) and c1 == c2:
+        if c1 != identity:
+            ufunc(operand, c1, out=out)
+        elif operand is not out:
+            out[...] = operand
+    else:
+        ufunc(operand, _select(c1, c2, left, right, out.dtype), out=out)
+    return out
+
+
+def _output_for(out, replaceable, *values):
+    # func may carry array parameters of its own (e.g. a frozen distribution with an array of shapes),
+    # in which case its values have a larger broadcast shape than the standardised input.
+    if all(shape(v) == out.shape for v in values):
+        return out
+    expected = broadcast_shapes(out.shape, *(shape(v) for v in values))
+    if expected == out.shape:
+        return out
+    if not replaceable:
+        raise ValueError(f'Output array has shape {out.shape}, expected {expected}.')
+    return empty(expected, dtype=out.dtype)
+
+
+def _evaluate(x, left, func1, coef1, func2, coef2, out, replaceable, scalar_coefs):
+    m1, s1, a1, b1 = coef1
+    m2, s2, a2, b2 = coef2
+    right = logical_not(left)
+
+    _apply(subtract, x, m1, m2, left, right, out, 0)
+    _apply(true_divide, out, s1, s2, left, right, out, 1)
+
+    if func1 is func2:
+        values = func1(out)
+        out = _output_for(out, replaceable, values)
+        _apply(multiply, values, b1, b2, left, right, out, 1)
+    elif scalar_coefs:
+        values = func1(out[left])
+        values *= b1
+        out[left] = values
+        values = func2(out[right])
+        values *= b2
+        out[right] = values
+    else:
+        # Both functions are evaluated everywhere, and each piece is copied where it applies: multiplying the
+        # other piece by 0 would turn its infinite values into nan
+        values = func1(out)
+        values2 = func2(out)
+        out = _output_for(out, replaceable, values, values2)
+        multiply(values, b1, out=out)
+        copyto(out, multiply(values2, b2), where=right)
+    _apply(add, out, a1, a2, left, right, out, 0)
+
+    return out
+
+
+def _blockwise(x, left, func1, func2, out, scalar_coefs):
+    # Large inputs with scalar coefficients are processed in contiguous blocks so that the temporaries
+    # (including those allocated inside func) stay bounded by the block size and remain in cache. A single
+    # element probe rules out functions carrying array parameters of their own.
+    if out.size <= BLOCK_SIZE or not scalar_coefs:
+        return False
+    if x.shape != out.shape or left.shape != out.shape or not out.flags.c_contiguous:
+        return False
+    return func1 is not func2 or shape(func1(x.reshape(-1)[:1])) == (1,)
+
+
+def two_piece(x, left, func1, coef1, func2=None, coef2=None, out=None):
+    """
+    Evaluates a two piece expression of the form a + b * func((x - m) / s) in a single pass.
+
+    :param x: array like
+    :param left: boolean array like, True where the left piece applies
+    :param func1: function of the standardised values on the left piece
+    :param coef1: tuple (m, s, a, b) of the left piece
+    :param func2: function of the standardised values on the right piece, defaults to func1
+    :param coef2: tuple (m, s, a, b) of the right piece, defaults to coef1
+    :param out: optional output array with the broadcast shape of x, left and the coefficients. It may be x
+    itself, in which case x is overwritten. By default a new array of type result_dtype(x) is returned.
+    :return: out
+    """
+    x = asarray(x)
+    left = asarray(left)
+    func2 = func1 if func2 is None else func2
+    coef2 = coef1 if coef2 is None else coef2
+
+    scalar_coefs = all_scalar(*coef1, *coef2)
+
+    if scalar_coefs and get_backend() == 'numba':
+        from twopiece.jit import two_piece_compiled
+        output = two_piece_compiled(x, left, func1, coef1, func2, coef2, out)
+        if output is not None:
+            return output
+
+    replaceable = out is None or out is x
+    if out is None:
+        if scalar_coefs and x.shape == left.shape:
+            out_shape = x.shape
+        else:
+            out_shape = broadcast_shapes(x.shape, left.shape, *(shape(c) for c in coef1 + coef2))
+        out = empty(out_shape, dtype=result_dtype(x))
+
+    # The probe of _blockwise calls the bases before they are traced, so that it is not profiled
+    blockwise = _blockwise(x, left, func1, func2, out, scalar_coefs)
+    if func1 is func2:
+        func1 = func2 = traced_base(func1)
+    else:
+        func1, func2 = traced_base(func1), traced_base(func2)
+
+    if blockwise:
+        flat_x, flat_left, flat_out = x.reshape(-1), left.reshape(-1), out.reshape(-1)
+        for start in range(0, out.size, BLOCK_SIZE):
+            block = slice(start, start + BLOCK_SIZE)
+            _evaluate(flat_x[block], flat_left[block], func1, coef1, func2, coef2, flat_out[block], False, True)
+        return out
+
+    return _evaluate(x, left, func1, coef1, func2, coef2, out, replaceable, scalar_coefs)
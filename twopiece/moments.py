@@ -0,0 +1,169 @@
+# -*- coding: utf-8 -*-
+# name: twopiece.moments.py
+# --
+# coding: utf-8
+
+"""
+Moments of the two piece families.
+
+A two piece variable equals loc - sigma1 |Z1| with probability p and loc + sigma2 |Z2| otherwise (see
+twopiece.rng), so its raw moments about loc are
+
+    E[(X - loc)^k] = p (-sigma1)^k E|Z1|^k + (1 - p) sigma2^k E|Z2|^k,
+
+and every summary statistic follows from the absolute moments E|Z|^k of the standard bases. HALF_MOMENTS maps
+the bases to their absolute moments in closed form. The other bases (e.g. the sinh-arcsinh) are integrated
+numerically, once per base, order and shape parameter. Absolute moments that do not exist are infinite, and the
+statistics that depend on them are nan (or inf for the variance and the kurtosis, following scipy.stats).
+"""
+
+from functools import lru_cache
+from math import inf
+
+from numpy import asarray, exp, sqrt, pi, log, where, errstate, vectorize, isfinite, nan
+from scipy.integrate import quad
+from scipy.special import gammaln, zeta
+
+from twopiece.cache import frozen_base
+from twopiece.closedform import base_key
+
+
+def _half_normal(k, shape):
+    return exp(k / 2 * log(2) + gammaln((k + 1) / 2)) / sqrt(pi)
+
+
+def _half_laplace(k, shape):
+    return exp(gammaln(k + 1))
+
+
+def _half_logistic(k, shape):
+    # 2 k! eta(k), with the Dirichlet eta function eta(k) = (1 - 2^(1 - k)) zeta(k) and eta(1) = log(2)
+    eta = log(2) if k == 1 else (1 - 2.0 ** (1 - k)) * zeta(k)
+    return 2 * exp(gammaln(k + 1)) * eta
+
+
+def _half_cauchy(k, shape):
+    return inf
+
+
+def _half_student(k, shape):
+    shape = asarray(shape, dtype=float)
+    finite = shape > k
+    nu = where(finite, shape, k + 1)
+    moment = exp(k / 2 * log(nu) + gammaln((k + 1) / 2) + gammaln((nu - k) / 2) - gammaln(nu / 2)) / sqrt(pi)
+    return where(finite, moment, inf)[()]
+
+
+def _half_gennorm(k, shape):
+    shape = asarray(shape, dtype=float)
+    return exp(gammaln((k + 1) / shape) - gammaln(1 / shape))[()]
+
+
+HALF_MOMENTS = {
+    'norm': _half_normal,
+    'laplace': _half_laplace,
+    'logistic': _half_logistic,
+    'cauchy': _half_cauchy,
+    't': _half_student,
+    'gennorm': _half_gennorm,
+}
+
+
+@lru_cache(maxsize=4096)
+def _integrated_half_moment(f, k, shape):
+    pdf = f.pdf if shape is None else frozen_base(f, shape)[0].pdf
+    return 2 * quad(lambda z: z ** k * pdf(z), 0, inf, limit=200)[0]
+
+
+_integrated_half_moments = vectorize(_integrated_half_moment, otypes=[float], excluded={0, 1})
+
+
+def half_moment(f, k, shape=None):
+    """
+    Absolute moment E|Z|^k of a standard base distribution, vectorised over the shape parameter.
+    :param f: continuous symmetric distribution with support on R
+    :param k: order, positive integer
+    :param shape: shape parameter, scalar or array like, None if the base has no shape
+    :return: absolute moment, inf if it does not exist
+    """
+    moment = HALF_MOMENTS.get(base_key(f))
+    if moment is not None:
+        return moment(k, shape)
+    if shape is None:
+        return _integrated_half_moment(f, k, None)
+    return _integrated_half_moments(f, k, asarray(shape, dtype=float))[()]
+
+
+def raw_moments_generic(f, shape1, shape2, sigma1, sigma2, p):
+    """
+    First four raw moments about loc of a two piece distribution.
+    :param f: continuous symmetric distribution with support on R
+    :param shape1: shape parameter of the left base, None if it has no shape
+    :param shape2: shape parameter of the right base, None if it has no shape
+    :param sigma1: scale parameter
+    :param sigma2: scale parameter
+    :param p: probability of the left piece
+    :return: tuple of E[(X - loc)^k] for k = 1, ..., 4
+    """
+    with errstate(invalid='ignore'):
+        return tuple(p * (-sigma1) ** k * half_moment(f, k, shape1)
+                     + (1 - p) * sigma2 ** k * half_moment(f, k, shape2) for k in (1, 2, 3, 4))
+
+
+def summary_stats(loc, m1, m2, m3, m4):
+    """
+    Mean, variance, skewness and excess kurtosis from the raw moments about loc.
+    :param loc: location parameter
+    :param m1: E[X - loc]
+    :param m2: E[(X - loc)^2]
+    :param m3: E[(X - loc)^3]
+    :param m4: E[(X - loc)^4]
+    :return: tuple (mean, variance, skewness, excess kurtosis)
+    """
+    m1, m2, m3, m4 = (asarray(m, dtype=float) for m in (m1, m2, m3, m4))
+    with errstate(invalid='ignore', over='ignore', divide='ignore'):
+        mean = where(isfinite(m1), loc + m1, nan)
+        var = where(isfinite(m1), m2 - m1 ** 2, nan)
+        skew = where(isfinite(m3), (m3 - 3 * m1 * m2 + 2 * m1 ** 3) / var ** 1.5, nan)
+        kurtosis = (m4 - 4 * m1 * m3 + 6 * m1 ** 2 * m2 - 3 * m1 ** 4) / var ** 2 - 3
+        kurtosis = where(isfinite(m4), kurtosis, where(isfinite(m2), inf, nan))
+    return mean[()], var[()], skew[()], kurtosis[()]
+
+
+class Moments:
+    """
+    Mixin adding mean, var, std, skew, kurtosis and stats to a two piece class with a _pieces method returning
+    its base, the shape parameters of the left and right bases and the probability of the left piece.
+    """
+
+    def _summary(self):
+        f, shape1, shape2, p = self._pieces()
+        return summary_stats(self.loc, *raw_moments_generic(f, shape1, shape2, self.sigma1, self.sigma2, p))
+
+    def mean(self):
+        return self._summary()[0]
+
+    def var(self):
+        return self._summary()[1]
+
+    def std(self):
+        return sqrt(self._summary()[1])[()]
+
+    def skew(self):
+        return self._summary()[2]
+
+    def kurtosis(self):
+        """
+        Excess kurtosis, zero for the normal distribution.
+        """
+        return self._summary()[3]
+
+    def stats(self, moments='mv'):
+        """
+        Summary statistics, as in scipy.stats.
+        :param moments: string with some of m (mean), v (variance), s (skewness) and k (excess kurtosis)
+        :return: tuple of the requested statistics, in the order m, v, s, k
+        """
+        summary = self._summary()
+        output = tuple(value for letter, value in zip('mvsk', summary) if letter in moments)
+        return output[0] if len(output) == 1 else output
@@ -0,0 +1,74 @@
+# -*- coding: utf-8 -*-
+# name: twopiece.params.py
+# --
+# coding: utf-8
+
+"""
+Immutable parameter containers.
+
+The containers are named tuples with empty __slots__, so they take the memory of a tuple (no per instance
+__dict__) and cannot be modified. Their constructors validate the parameters once; the from_params constructors
+of the distribution classes then trust them and skip the parametrisation checks and conversions of __init__.
+The params property of a distribution returns its container.
+"""
+
+from collections import namedtuple
+
+from numpy import asarray
+
+
+def _check_positive(message, *values):
+    for value in values:
+        if isinstance(value, (float, int)):
+            if not value > 0:
+                raise ValueError(message)
+        elif not (asarray(value) > 0).all():
+            raise ValueError(message)
+
+
+class ScaleParams(namedtuple('ScaleParams', ['loc', 'sigma1', 'sigma2'])):
+    """Parameters of the two piece scale families (tpnorm, tplaplace, tpcauchy, tplogistic)."""
+    __slots__ = ()
+
+    def __new__(cls, loc, sigma1, sigma2):
+        _check_positive('Scale parameters must be positive.', sigma1, sigma2)
+        return super().__new__(cls, loc, sigma1, sigma2)
+
+
+class ScaleShapeParams(namedtuple('ScaleShapeParams', ['loc', 'sigma1', 'sigma2', 'shape'])):
+    """Parameters of the two piece scale families with a shape parameter (tpstudent, tpgennorm, tpsas)."""
+    __slots__ = ()
+
+    def __new__(cls, loc, sigma1, sigma2, shape):
+        _check_positive('Scale parameters must be positive.', sigma1, sigma2)
+        _check_positive('Shape parameter must be positive.', shape)
+        return super().__new__(cls, loc, sigma1, sigma2, shape)
+
+
+class DoubleParams(namedtuple('DoubleParams', ['loc', 'sigma1', 'sigma2', 'shape1', 'shape2'])):
+    """Parameters of the double two piece families (dtpstudent, dtpgennorm, dtpsas)."""
+    __slots__ = ()
+
+    def __new__(cls, loc, sigma1, sigma2, shape1, shape2):
+        _check_positive('Scale parameters must be positive.', sigma1, sigma2)
+        _check_positive('Shape parameters must be positive.', shape1, shape2)
+        return super().__new__(cls, loc, sigma1, sigma2, shape1, shape2)
+
+
+class ShapeParams(namedtuple('ShapeParams', ['loc', 'sigma', 'shape1', 'shape2'])):
+    """Parameters of the two piece shape families (tpshastudent, tpshagennorm, tpshasas)."""
+    __slots__ = ()
+
+    def __new__(cls, loc, sigma, shape1, shape2):
+        _check_positive('Scale parameter must be positive.', sigma)
+        _check_positive('Shape parameters must be positive.', shape1, shape2)
+        return super().__new__(cls, loc, sigma, shape1, shape2)
+
+
+class SinhArcsinhParams(namedtuple('SinhArcsinhParams', ['loc', 'scale', 'delta', 'epsilon'])):
+    """Parameters of the sinh-arcsinh family (sinhasinh)."""
+    __slots__ = ()
+
+    def __new__(cls, loc, scale, delta, epsilon):
+        _check_positive('Scale and delta parameters must be positive.', scale, delta)
+        return super().__new__(cls, loc, scale, delta, epsilon)
@@ -0,0 +1,249 @@
+# -*- coding: utf-8 -*-
+# name: twopiece.profiling.py
+# --
+# coding: utf-8
+
+"""
+Opt-in instrumentation of the two piece classes and generic functions.
+
+When profiling is enabled, every call to an instrumented function records, under a key family.method, the number
+of calls, the number of elements returned, the cumulative wall time, the time spent in the function itself
+(excluding the instrumented functions it calls) and, optionally, the peak memory allocated during a call as
+traced by tracemalloc. The instrumented functions are
+
+    - the constructors and the pdf, cdf, ppf, logpdf, logcdf, sf, logsf, isf and random_sample methods of the
+      distribution classes, e.g. tpnorm.pdf or tpshasas.init,
+    - the generic functions of twopiece.scale and twopiece.double, e.g. scale.pdf_tp_generic,
+    - the calls to the base distributions made by the two piece kernel, e.g. base.norm.pdf,
+
+so that the time spent in the base distributions, in the generic functions (masks, standardisation and output
+handling) and in object construction can be told apart.
+
+The recording wrappers are installed, in the classes and modules, when profiling is enabled and removed when it
+is disabled, which is the default, so that the disabled instrumentation costs nothing. As a consequence calls
+through references taken beforehand, e.g. from twopiece.scale import pdf_tp_generic, are not recorded (the
+methods of the classes always are). Installing and removing the wrappers changes the classes and modules for the
+whole process, so profiling is not thread safe: it must not be enabled or disabled while other threads use the
+library, and profile blocks cannot be nested. Recording itself is thread safe.
+
+Usage:
+
+    with profile() as stats:
+        tpnorm(sigma1=1.0, sigma2=2.0).pdf(x)
+    stats['tpnorm.pdf']['time']
+"""
+
+import sys
+import tracemalloc
+from contextlib import contextmanager
+from functools import wraps
+from threading import Lock, local
+from time import perf_counter
+
+from numpy import size
+
+METHODS = ('__init__', 'pdf', 'cdf', 'ppf', 'logpdf', 'logcdf', 'sf', 'logsf', 'isf', 'random_sample')
+
+_enabled = False
+_memory = False
+_started_tracing = False
+_records = {}
+_targets = []
+_lock = Lock()
+_frames = local()
+
+
+def _stack():
+    stack = getattr(_frames, 'stack', None)
+    if stack is None:
+        stack = _frames.stack = []
+    return stack
+
+
+def _call(key, func, args, kwargs, elements=None):
+    stack = _stack()
+    if _memory and stack:
+        # tracemalloc keeps a single peak: fold the peak reached so far into the enclosing call before resetting it
+        stack[-1][1] = max(stack[-1][1], tracemalloc.get_traced_memory()[1])
+    if _memory:
+        current = tracemalloc.get_traced_memory()[0]
+        tracemalloc.reset_peak()
+    else:
+        current = 0
+    frame = [0.0, current]  # time spent in instrumented callees, peak traced memory
+    stack.append(frame)
+    start = perf_counter()
+    try:
+        result = func(*args, **kwargs)
+    finally:
+        elapsed = perf_counter() - start
+        stack.pop()
+        if _memory:
+            peak = max(frame[1], tracemalloc.get_traced_memory()[1])
+            if stack:
+                stack[-1][1] = max(stack[-1][1], peak)
+        else:
+            peak = current
+        if stack:
+            stack[-1][0] += elapsed
+    count = (1 if result is None else size(result)) if elements is None else elements
+    with _lock:
+        record = _records.get(key)
+        if record is None:
+            record = _records[key] = {'calls': 0, 'elements': 0, 'time': 0.0, 'self_time': 0.0, 'peak_memory': 0}
+        record['calls'] += 1
+        record['elements'] += count
+        record['time'] += elapsed
+        record['self_time'] += elapsed - frame[0]
+        record['peak_memory'] = max(record['peak_memory'], peak - current)
+    return result
+
+
+def _install(owner, name, original, wrapper):
+    _targets.append((owner, name, original, wrapper))
+    if _enabled:
+        setattr(owner, name, wrapper)
+
+
+def instrumented(family):
+    """
+    Decorator registering a module level function, recorded under family.name when profiling is enabled. The
+    function itself is returned: the recording wrapper only replaces it in its module while profiling is enabled.
+    :param family: string
+    :return: decorator
+    """
+    def decorator(func):
+        key = f'{family}.{func.__name__}'
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            return _call(key, func, args, kwargs)
+
+        _install(sys.modules[func.__module__], func.__name__, func, wrapper)
+        return func
+
+    return decorator
+
+
+def _instrumented_method(func):
+    name = 'init' if func.__name__ == '__init__' else func.__name__
+    elements = 1 if name == 'init' else None
+
+    @wraps(func)
+    def wrapper(self, *args, **kwargs):
+        return _call(f'{type(self).__name__}.{name}', func, (self,) + args, kwargs, elements)
+
+    return wrapper
+
+
+def instrumented_methods(cls):
+    """
+    Class decorator registering the methods of METHODS defined by the class itself, recorded under the name of
+    the class of the instance, e.g. tpnorm.pdf, when profiling is enabled.
+    :param cls: class
+    :return: cls
+    """
+    for name in METHODS:
+        if name in vars(cls):
+            method = vars(cls)[name]
+            _install(cls, name, method, _instrumented_method(method))
+    return cls
+
+
+def _base_name(func):
+    owner = getattr(func, '__self__', None)
+    if owner is None:
+        return getattr(func, '__qualname__', type(func).__name__)
+    dist = getattr(owner, 'dist', owner)
+    name = getattr(dist, 'name', type(dist).__name__)
+    return f'{name}.{func.__name__}'
+
+
+def traced_base(func):
+    """
+    Function of the standardised values, e.g. the pdf of a base distribution, recorded under base.name.method
+    when profiling is enabled.
+    :param func: function
+    :return: func itself when profiling is disabled, a recording wrapper otherwise
+    """
+    if not _enabled:
+        return func
+    key = f'base.{_base_name(func)}'
+
+    def traced(*args, **kwargs):
+        return _call(key, func, args, kwargs)
+
+    return traced
+
+
+def enable(memory=False):
+    """
+    Enables profiling.
+    :param memory: whether to trace the peak memory of each call with tracemalloc, which slows down the calls
+    """
+    global _enabled, _memory, _started_tracing
+    if memory and not tracemalloc.is_tracing():
+        tracemalloc.start()
+        _started_tracing = True
+    _memory = memory
+    if not _enabled:
+        for owner, name, _, wrapper in _targets:
+            setattr(owner, name, wrapper)
+    _enabled = True
+
+
+def disable():
+    """
+    Disables profiling, and the memory tracing started by enable.
+    """
+    global _enabled, _memory, _started_tracing
+    if _started_tracing:
+        tracemalloc.stop()
+    if _enabled:
+        for owner, name, original, _ in _targets:
+            setattr(owner, name, original)
+    _enabled = _memory = _started_tracing = False
+
+
+def is_enabled():
+    return _enabled
+
+
+def reset():
+    """
+    Discards the records.
+    """
+    with _lock:
+        _records.clear()
+
+
+def snapshot():
+    """
+    Records of the calls so far.
+    :return: dict mapping family.method to a dict with the number of calls, the number of elements returned, the
+    cumulative time and the time spent in the function itself (in seconds) and the peak memory of a call (in
+    bytes, 0 unless memory is traced)
+    """
+    with _lock:
+        return {key: dict(record) for key, record in sorted(_records.items())}
+
+
+@contextmanager
+def profile(memory=False):
+    """
+    Context manager profiling a block of code, e.g. with profile() as stats: dist.pdf(x). The records are
+    reset on entry, and the yielded dict is filled with the snapshot on exit.
+    :param memory: whether to trace the peak memory of each call with tracemalloc
+    :return: dict
+    :raises RuntimeError: if profiling is already enabled, by enable or by an enclosing profile block
+    """
+    if _enabled:
+        raise RuntimeError('Profiling is already enabled, profile blocks cannot be nested.')
+    stats = {}
+    reset()
+    enable(memory)
+    try:
+        yield stats
+    finally:
+        disable()
+        stats.update(snapshot())
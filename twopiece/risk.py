@@ -0,0 +1,177 @@
+# -*- coding: utf-8 -*-
+# name: twopiece.risk.py
+# --
+# coding: utf-8
+
+"""
+Value at risk and expected shortfall.
+
+With x = ppf(alpha), the partial expectation E[X 1{X <= x}] of a two piece variable only involves the lower
+partial first moments G(z) = int_{-inf}^z u f(u) du, z <= 0, of its standard bases: the probability of the
+pieces below x is known to be alpha, so that
+
+    E[X 1{X <= x}] = alpha loc + 2 p sigma1 G1((x - loc) / sigma1)                                if x <= loc,
+    E[X 1{X <= x}] = alpha loc - p sigma1 E|Z1| + 2 (1 - p) sigma2 (G2((loc - x) / sigma2) - G2(0))  otherwise,
+
+where p is the probability of the left piece. LOWER_PARTIAL_MOMENTS maps the bases to G in closed form, or to an
+antiderivative of u f(u) when the base has no mean, so that the difference above stays finite; the other bases
+(e.g. the sinh-arcsinh) are integrated numerically. The upper tail is handled by reflection: -X is the two
+piece variable with location -loc, the scales, shapes and pieces swapped.
+
+The risk measures refer to losses. For the lower tail (the default, X is a profit and loss) the value at risk at
+level alpha is -ppf(alpha) and the expected shortfall is -E[X | X <= ppf(alpha)]. For the upper tail (X is a
+loss) they are isf(alpha) and E[X | X >= isf(alpha)].
+"""
+
+from math import inf
+
+from numpy import asarray, exp, sqrt, pi, abs, log, log1p, where, errstate, vectorize, isinf, minimum
+from scipy.integrate import quad
+from scipy.special import expit, gammaln, gammaincc
+
+from twopiece.cache import frozen_base
+from twopiece.closedform import base_key
+from twopiece.moments import half_moment
+from twopiece.utils import all_scalar
+
+
+def _lower_normal(z, shape):
+    return -exp(-0.5 * z * z) / sqrt(2 * pi)
+
+
+def _lower_laplace(z, shape):
+    return 0.5 * exp(z) * (z - 1)
+
+
+def _lower_logistic(z, shape):
+    return z * expit(z) - log1p(exp(z))
+
+
+def _lower_cauchy(z, shape):
+    return log1p(z * z) / (2 * pi)
+
+
+def _lower_student(z, shape):
+    # (nu + z^2) f(z) / (1 - nu) is an antiderivative of z f(z) for every nu != 1, vanishing at -inf for nu > 1
+    nu = asarray(shape, dtype=float)
+    cauchy = nu == 1
+    nu = where(cauchy, 2.0, nu)
+    log_pdf = gammaln((nu + 1) / 2) - gammaln(nu / 2) - 0.5 * log(nu * pi) - (nu + 1) / 2 * log1p(z * z / nu)
+    return where(cauchy, _lower_cauchy(z, None), (nu + z * z) / (1 - nu) * exp(log_pdf))
+
+
+def _lower_gennorm(z, shape):
+    beta = asarray(shape, dtype=float)
+    return -0.5 * exp(gammaln(2 / beta) - gammaln(1 / beta)) * gammaincc(2 / beta, abs(z) ** beta)
+
+
+LOWER_PARTIAL_MOMENTS = {
+    'norm': _lower_normal,
+    'laplace': _lower_laplace,
+    'logistic': _lower_logistic,
+    'cauchy': _lower_cauchy,
+    't': _lower_student,
+    'gennorm': _lower_gennorm,
+}
+
+
+def _integrated_lower_partial_moment(z, f, shape):
+    pdf = f.pdf if shape is None else frozen_base(f, shape)[0].pdf
+    return quad(lambda u: u * pdf(u), -inf, z, limit=200)[0]
+
+
+_integrated_lower_partial_moments = vectorize(_integrated_lower_partial_moment, otypes=[float], excluded={1})
+
+
+def lower_partial_moment(f, z, shape=None):
+    """
+    Lower partial first moment int_{-inf}^z u f(u) du of a standard base distribution, for z <= 0. When the base
+    has no mean, an antiderivative of u f(u) instead.
+    :param f: continuous symmetric distribution with support on R
+    :param z: array like of non positive values
+    :param shape: shape parameter, scalar or array like, None if the base has no shape
+    :return: array
+    """
+    moment = LOWER_PARTIAL_MOMENTS.get(base_key(f))
+    if moment is not None:
+        return moment(z, shape)
+    return _integrated_lower_partial_moments(z, f, shape)
+
+
+def tail_expectation_generic(alpha, x, f, shape1, shape2, loc, sigma1, sigma2, p):
+    """
+    Conditional expectation E[X | X <= x] of a two piece distribution, with x its quantile of level alpha.
+    :param alpha: array like of probabilities
+    :param x: quantiles ppf(alpha)
+    :param f: continuous symmetric distribution with support on R
+    :param shape1: shape parameter of the left base, None if it has no shape
+    :param shape2: shape parameter of the right base, None if it has no shape
+    :param loc: location parameter
+    :param sigma1: scale parameter
+    :param sigma2: scale parameter
+    :param p: probability of the left piece
+    :return: array, -inf if the distribution has no mean
+    """
+    if all_scalar(x, loc, sigma1, sigma2, p) and (shape1 is None or all_scalar(shape1, shape2)):
+        m1 = half_moment(f, 1, shape1)
+        if isinf(m1):
+            return -inf
+        if x <= loc:
+            partial = alpha * loc + 2 * p * sigma1 * lower_partial_moment(f, (x - loc) / sigma1, shape1)
+        else:
+            middle = lower_partial_moment(f, (loc - x) / sigma2, shape2) - lower_partial_moment(f, 0.0, shape2)
+            partial = alpha * loc - p * sigma1 * m1 + 2 * (1 - p) * sigma2 * middle
+        return partial / alpha
+
+    with errstate(invalid='ignore'):
+        lower = x <= loc
+        left = lower_partial_moment(f, minimum((x - loc) / sigma1, 0), shape1)
+        right = lower_partial_moment(f, minimum((loc - x) / sigma2, 0), shape2)
+        middle = right - lower_partial_moment(f, 0.0, shape2)
+        m1 = half_moment(f, 1, shape1)
+        partial = where(lower, alpha * loc + 2 * p * sigma1 * left,
+                        alpha * loc - p * sigma1 * m1 + 2 * (1 - p) * sigma2 * middle)
+        return where(isinf(m1), -inf, partial / alpha)[()]
+
+
+def _check_tail(alpha, tail):
+    if tail not in {'lower', 'upper'}:
+        raise ValueError('Invalid value of tail provided. Valid values are lower, upper.')
+    alpha = asarray(alpha, dtype=float)
+    if not ((alpha > 0) & (alpha < 1)).all():
+        raise ValueError('alpha must be in (0, 1).')
+    return alpha[()]
+
+
+class RiskMeasures:
+    """
+    Mixin adding value_at_risk and expected_shortfall to a two piece class with ppf, isf and a _pieces method
+    (see twopiece.moments.Moments).
+    """
+
+    def value_at_risk(self, alpha, tail='lower'):
+        """
+        Value at risk.
+        :param alpha: array like of tail probabilities in (0, 1), e.g. 0.01
+        :param tail: lower (losses are -X, the default) or upper (losses are X)
+        :return: -ppf(alpha) for the lower tail, isf(alpha) for the upper tail
+        """
+        alpha = _check_tail(alpha, tail)
+        if tail == 'lower':
+            return -self.ppf(alpha)
+        return self.isf(alpha)
+
+    def expected_shortfall(self, alpha, tail='lower'):
+        """
+        Expected shortfall, or conditional value at risk: the expected loss beyond the value at risk.
+        :param alpha: array like of tail probabilities in (0, 1), e.g. 0.01
+        :param tail: lower (losses are -X, the default) or upper (losses are X)
+        :return: -E[X | X <= ppf(alpha)] for the lower tail, E[X | X >= isf(alpha)] for the upper tail
+        """
+        alpha = _check_tail(alpha, tail)
+        f, shape1, shape2, p = self._pieces()
+        if tail == 'lower':
+            return -tail_expectation_generic(alpha, self.ppf(alpha), f, shape1, shape2, self.loc, self.sigma1,
+                                             self.sigma2, p)
+        return -tail_expectation_generic(alpha, -self.isf(alpha), f, shape2, shape1, -asarray(self.loc),
+                                         self.sigma2, self.sigma1, 1 - p)
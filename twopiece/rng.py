@@ -0,0 +1,188 @@
+# -*- coding: utf-8 -*-
+# name: twopiece.rng.py
+# --
+# coding: utf-8
+
+"""
+Random number generation for the two piece families.
+
+A two piece variable equals loc - sigma1 |Z1| with probability p and loc + sigma2 |Z2| otherwise, where Z1, Z2
+follow the standard bases and p is the probability of the left piece (sigma1 / (sigma1 + sigma2) for the scale
+families, epsilon for the double families). Whenever the absolute value of a base can be generated directly by
+NumPy (half-normal, half-Laplace, ...) this avoids evaluating a quantile function on every uniform, which is slow
+for the t and the generalised normal. HALF_SAMPLERS maps the bases to their direct generators (the sinh-arcsinh
+base is registered by twopiece.sinharcsinh).
+
+The random_state arguments follow the NumPy conventions: None uses the global numpy.random state (so that
+numpy.random.seed keeps working), a Generator or RandomState is used as is, and anything else (an integer, a
+SeedSequence, ...) seeds a new Generator. check_random_state returns its own outputs unchanged, so that they can
+be passed on as random_state.
+
+Very large samples are generated by chunked_sample in chunks of CHUNK_SIZE draws on a thread pool, each chunk
+with its own stream spawned from random_state, directly into a preallocated (possibly memory mapped) output.
+Peak memory on top of the output is then a few chunks per thread, and the result for a given seed does not
+depend on the number of threads (only on the chunk size).
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+
+from numpy import random, abs, empty, count_nonzero, multiply, float64
+from numpy.random import Generator, RandomState, SeedSequence, default_rng
+
+from twopiece.closedform import base_key
+
+CHUNK_SIZE = 1 << 20
+
+
+def check_random_state(random_state=None):
+    """
+    Source of random numbers for random_state.
+    :param random_state: None, integer, SeedSequence, numpy.random.Generator, numpy.random.RandomState or the
+    numpy.random module
+    :return: the numpy.random module for None, a Generator or a RandomState otherwise
+    """
+    if random_state is None or random_state is random:
+        return random
+    if isinstance(random_state, (Generator, RandomState)):
+        return random_state
+    return default_rng(random_state)
+
+
+def spawn_generators(random_state, n):
+    """
+    Independent random number generators, e.g. one per process or thread of a parallel Monte Carlo simulation.
+    The streams are derived with SeedSequence.spawn, so they are reproducible for a given seed and statistically
+    independent of each other.
+
+    :param random_state: None, integer, SeedSequence or numpy.random.Generator
+    :param n: number of generators
+    :return: list of numpy.random.Generator
+    """
+    if isinstance(random_state, Generator):
+        return random_state.spawn(n)
+    if isinstance(random_state, RandomState):
+        raise ValueError('Independent streams cannot be spawned from a RandomState, use a Generator or a seed.')
+    seed_sequence = random_state if isinstance(random_state, SeedSequence) else SeedSequence(random_state)
+    return [default_rng(child) for child in seed_sequence.spawn(n)]
+
+
+def _half_normal(generator, size, shape=None):
+    z = generator.standard_normal(size)
+    return abs(z, out=z)
+
+
+def _half_laplace(generator, size, shape=None):
+    return generator.standard_exponential(size)
+
+
+def _half_logistic(generator, size, shape=None):
+    z = generator.logistic(size=size)
+    return abs(z, out=z)
+
+
+def _half_cauchy(generator, size, shape=None):
+    z = generator.standard_cauchy(size)
+    return abs(z, out=z)
+
+
+def _half_student(generator, size, shape):
+    z = generator.standard_t(shape, size)
+    return abs(z, out=z)
+
+
+def _half_gennorm(generator, size, shape):
+    # |Z| = G^(1 / beta) with G ~ Gamma(1 / beta)
+    g = generator.standard_gamma(1 / shape, size)
+    return g ** (1 / shape)
+
+
+HALF_SAMPLERS = {
+    'norm': _half_normal,
+    'laplace': _half_laplace,
+    'logistic': _half_logistic,
+    'cauchy': _half_cauchy,
+    't': _half_student,
+    'gennorm': _half_gennorm,
+}
+
+
+def half_sampler(f):
+    """
+    Direct generator of the absolute value of a standard base distribution.
+    :param f: continuous symmetric distribution with support on R
+    :return: function (generator, size, shape) returning an array of the given size, None if there is none
+    """
+    return HALF_SAMPLERS.get(base_key(f))
+
+
+def sample_two_piece(size, half1, half2, loc, sigma1, sigma2, p, generator, shape1=None, shape2=None):
+    """
+    Random sample of a two piece distribution with scalar parameters from direct generators of its halves.
+
+    :param size: integer or tuple of integers, sample size
+    :param half1: generator of the absolute value of the left base (see HALF_SAMPLERS)
+    :param half2: generator of the absolute value of the right base (see HALF_SAMPLERS)
+    :param loc: location parameter
+    :param sigma1: scale parameter
+    :param sigma2: scale parameter
+    :param p: probability of the left piece
+    :param generator: source of random numbers, see check_random_state
+    :param shape1: shape parameter of the left base, None if it has no shape
+    :param shape2: shape parameter of the right base, None if it has no shape
+    :return: array of the given size
+    """
+    left = generator.random(size) < p
+
+    if half1 is half2 and shape1 == shape2:
+        sample = half1(generator, size, shape1)
+        scale = multiply(left, -(sigma1 + sigma2))
+        scale += sigma2
+        sample *= scale
+    else:
+        n1 = count_nonzero(left)
+        sample = empty(left.shape)
+        sample[left] = -sigma1 * half1(generator, n1, shape1)
+        sample[~left] = sigma2 * half2(generator, left.size - n1, shape2)
+    sample += loc
+
+    return sample
+
+
+def chunked_sample(sampler, size, out=None, random_state=None, chunk_size=CHUNK_SIZE, max_workers=None):
+    """
+    Random sample generated in chunks on a thread pool.
+
+    :param sampler: function (n, generator) returning a one dimensional array with n draws
+    :param size: integer or tuple of integers, sample size
+    :param out: optional C contiguous output array of the given size, e.g. a numpy.memmap
+    :param random_state: None, integer, SeedSequence or numpy.random.Generator, from which one independent
+    stream per chunk is spawned
+    :param chunk_size: number of draws per chunk
+    :param max_workers: number of threads, defaults to the ThreadPoolExecutor default
+    :return: out
+    """
+    if not isinstance(size, (int, tuple)):
+        raise TypeError('Sample size must be of type integer.')
+    if chunk_size < 1:
+        raise ValueError('chunk_size must be a positive integer.')
+    shape = (size,) if isinstance(size, int) else size
+    if out is None:
+        out = empty(shape, dtype=float64)
+    elif out.shape != shape:
+        raise ValueError(f'Output array has shape {out.shape}, expected {shape}.')
+    elif not out.flags.c_contiguous:
+        raise ValueError('Output array must be C contiguous.')
+
+    flat = out.reshape(-1)
+    starts = range(0, flat.size, chunk_size)
+    generators = spawn_generators(random_state, len(starts))
+
+    def fill(start, generator):
+        stop = min(start + chunk_size, flat.size)
+        flat[start:stop] = sampler(stop - start, generator)
+
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        for _ in pool.map(fill, starts, generators):
+            pass
+
+    return out
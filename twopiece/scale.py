@@ -7,13 +7,26 @@
 # coding: utf-8
 
 import scipy.stats
-from numpy import isscalar, asarray, random, sum, empty
-
+from numpy import asarray, log, log1p
+
+from twopiece.cache import frozen_base
+from twopiece.closedform import closed_form, base_key
+from twopiece.fit import fit_tpd, fit_tpnorm, fit_result
+from twopiece.grid import GridEvaluation
+from twopiece.kernel import two_piece, log_complement
+from twopiece.moments import Moments
+from twopiece.params import ScaleParams, ScaleShapeParams
+from twopiece.profiling import instrumented, instrumented_methods
+from twopiece.risk import RiskMeasures
+from twopiece.rng import check_random_state, half_sampler, sample_two_piece, chunked_sample, CHUNK_SIZE
 from twopiece.sinharcsinh import ssas
-from twopiece.utils import display_dist, get_sigma1_sigma2
+from twopiece.stream import Streaming
+from twopiece.table import TabulatedPpf
+from twopiece.utils import display_dist, get_sigma1_sigma2, all_scalar
 
 
-def pdf_tp_generic(x, pdf, loc, sigma1, sigma2):
+@instrumented('scale')
+def pdf_tp_generic(x, pdf, loc, sigma1, sigma2, out=None):
     """
     Probability density function at x of the defined two piece distribution.
 
@@ -22,28 +35,27 @@ def pdf_tp_generic(x, pdf, loc, sigma1, sigma2):
     :param loc: location parameter
     :param sigma1: shape parameter
     :param sigma2: shape parameter
+    :param out: optional output array for array inputs
     :return: pdf of the defined two piece in x
 
     """
-    if sigma1 * sigma2 <= 0:
+    if (asarray(sigma1) * asarray(sigma2) <= 0).any():
         raise AssertionError('Scale parameters must be positive.')
     aux = 2 / (sigma1 + sigma2)
-    if isscalar(x):
+    if all_scalar(x, loc, sigma1, sigma2):
         if x < loc:
             output = aux * pdf((x - loc) / sigma1)
         else:
             output = aux * pdf((x - loc) / sigma2)
     else:
         x = asarray(x)
-        output = empty(x.size)
-        index = x < loc
-        output[index] = aux * pdf((x[index] - loc) / sigma1)
-        index = x >= loc
-        output[index] = aux * pdf((x[index] - loc) / sigma2)
+        output = two_piece(x, x < loc, pdf, (loc, sigma1, 0, aux), coef2=(loc, sigma2, 0, aux), out=out)
+        output = output[()] if out is None else output
     return output
 
 
-def cdf_tp_generic(x, cdf, loc, sigma1, sigma2):
+@instrumented('scale')
+def cdf_tp_generic(x, cdf, loc, sigma1, sigma2, out=None):
     """
     Cumulative Density Function at x of the defined two piece distribution.
     :param x: array like
@@ -51,29 +63,29 @@ def cdf_tp_generic(x, cdf, loc, sigma1, sigma2):
     :param loc: location parameter
     :param sigma1: scale parameter
     :param sigma2: scale parameter
+    :param out: optional output array for array inputs
     :return:
     """
 
-    if sigma1 * sigma2 <= 0:
+    if (asarray(sigma1) * asarray(sigma2) <= 0).any():
         raise AssertionError('Scale parameters must be positive.')
     aux = 2 / (sigma1 + sigma2)
-    if isscalar(x):
+    if all_scalar(x, loc, sigma1, sigma2):
         if x < loc:
             output = aux * sigma1 * cdf((x - loc) / sigma1)
         else:
             output = 1 - aux * sigma2 * (1 - cdf((x - loc) / sigma2))
     else:
         x = asarray(x)
-        output = empty(x.size)
-        index = x < loc
-        output[index] = aux * sigma1 * cdf((x[index] - loc) / sigma1)
-        index = x >= loc
-        output[index] = 1 - aux * sigma2 * (1 - cdf((x[index] - loc) / sigma2))
+        output = two_piece(x, x < loc, cdf, (loc, sigma1, 0, aux * sigma1),
+                           coef2=(loc, sigma2, 1 - aux * sigma2, aux * sigma2), out=out)
+        output = output[()] if out is None else output
 
     return output
 
 
-def qqf_tp_generic(q, qqf, loc, sigma1, sigma2):
+@instrumented('scale')
+def qqf_tp_generic(q, qqf, loc, sigma1, sigma2, out=None):
     """
     Quantile Function at q of the defined two piece distribution.
     :param q: array like
@@ -81,15 +93,16 @@ def qqf_tp_generic(q, qqf, loc, sigma1, sigma2):
     :param loc: location parameter
     :param sigma1: scale parameter
     :param sigma2: scale parameter
+    :param out: optional output array for array inputs
     :return:
     """
 
-    if sigma1 * sigma2 <= 0:
+    if (asarray(sigma1) * asarray(sigma2) <= 0).any():
         raise AssertionError('Scale parameters must be positive.')
 
     p = sigma1 / (sigma1 + sigma2)
 
-    if isscalar(q):
+    if all_scalar(q, loc, sigma1, sigma2):
         if q > 1 or q < 0:
             raise AssertionError('Quantile Function is defined on (0,1).')
         if q <= p:
@@ -98,54 +111,207 @@ def qqf_tp_generic(q, qqf, loc, sigma1, sigma2):
             output = loc + sigma2 * qqf(0.5 * ((sigma1 + sigma2) * (1 + q) - 2 * sigma1) / sigma2)
     else:
         q = asarray(q)
-        if sum((q > 1) | (q < 0)) > 0:
+        if ((q > 1) | (q < 0)).any():
             raise AssertionError('Quantile Function is defined on (0,1).')
-        output = empty(q.size)
-        index = q <= p
-        output[index] = loc + sigma1 * qqf(0.5 * (sigma1 + sigma2) * q[index] / sigma1)
-        index = q > p
-        output[index] = loc + sigma2 * qqf(0.5 * ((sigma1 + sigma2) * (1 + q[index]) - 2 * sigma1) / sigma2)
+        output = _qqf_tp_array(q, qqf, loc, sigma1, sigma2, p, out)
+        output = output[()] if out is None else output
+
+    return output
+
+
+def _qqf_tp_array(q, qqf, loc, sigma1, sigma2, p, out=None):
+    output = two_piece(q, q <= p, qqf, (0, 2 * p, loc, sigma1), coef2=(2 * p - 1, 2 * (1 - p), loc, sigma2), out=out)
+    return output
+
+
+@instrumented('scale')
+def logpdf_tp_generic(x, logpdf, loc, sigma1, sigma2, out=None):
+    """
+    Log of the probability density function at x of the defined two piece distribution.
+    :param x: array like
+    :param logpdf: the log of a probability density function from a symmetric distribution defined on R.
+    :param loc: location parameter
+    :param sigma1: scale parameter
+    :param sigma2: scale parameter
+    :param out: optional output array for array inputs
+    :return:
+    """
+    if (asarray(sigma1) * asarray(sigma2) <= 0).any():
+        raise AssertionError('Scale parameters must be positive.')
+    aux = log(2 / (sigma1 + sigma2))
+    if all_scalar(x, loc, sigma1, sigma2):
+        if x < loc:
+            output = aux + logpdf((x - loc) / sigma1)
+        else:
+            output = aux + logpdf((x - loc) / sigma2)
+    else:
+        x = asarray(x)
+        output = two_piece(x, x < loc, logpdf, (loc, sigma1, aux, 1), coef2=(loc, sigma2, aux, 1), out=out)
+        output = output[()] if out is None else output
+    return output
+
 
+@instrumented('scale')
+def logcdf_tp_generic(x, cdf, logcdf, loc, sigma1, sigma2, out=None):
+    """
+    Log of the Cumulative Density Function at x of the defined two piece distribution. The left tail uses logcdf
+    directly, so it does not underflow.
+    :param x: array like
+    :param cdf: a cumulative density function from a symmetric distribution defined on R.
+    :param logcdf: the log of cdf
+    :param loc: location parameter
+    :param sigma1: scale parameter
+    :param sigma2: scale parameter
+    :param out: optional output array for array inputs
+    :return:
+    """
+    if (asarray(sigma1) * asarray(sigma2) <= 0).any():
+        raise AssertionError('Scale parameters must be positive.')
+    p = sigma1 / (sigma1 + sigma2)
+    if all_scalar(x, loc, sigma1, sigma2):
+        if x < loc:
+            output = log(2 * p) + logcdf((x - loc) / sigma1)
+        else:
+            output = log1p(-2 * (1 - p) * cdf((loc - x) / sigma2))
+    else:
+        x = asarray(x)
+        output = two_piece(x, x < loc, logcdf, (loc, sigma1, log(2 * p), 1),
+                           log_complement(cdf, 2 * (1 - p)), (loc, -sigma2, 0, 1), out=out)
+        output = output[()] if out is None else output
     return output
 
 
-def random_tp_sample(size, qqf, loc, sigma1, sigma2):
+@instrumented('scale')
+def sf_tp_generic(x, cdf, loc, sigma1, sigma2, out=None):
+    """
+    Survival Function (1 - cdf) at x of the defined two piece distribution, accurate in the right tail.
+    :param x: array like
+    :param cdf: a cumulative density function from a symmetric distribution defined on R.
+    :param loc: location parameter
+    :param sigma1: scale parameter
+    :param sigma2: scale parameter
+    :param out: optional output array for array inputs
+    :return:
+    """
+    if (asarray(sigma1) * asarray(sigma2) <= 0).any():
+        raise AssertionError('Scale parameters must be positive.')
+    p = sigma1 / (sigma1 + sigma2)
+    if all_scalar(x, loc, sigma1, sigma2):
+        if x < loc:
+            output = 1 - 2 * p * cdf((x - loc) / sigma1)
+        else:
+            output = 2 * (1 - p) * cdf((loc - x) / sigma2)
+    else:
+        x = asarray(x)
+        # By symmetry sf(z) = cdf(-z), so both pieces share a single evaluation of cdf.
+        output = two_piece(x, x < loc, cdf, (loc, sigma1, 1, -2 * p), coef2=(loc, -sigma2, 0, 2 * (1 - p)), out=out)
+        output = output[()] if out is None else output
+    return output
+
+
+@instrumented('scale')
+def logsf_tp_generic(x, cdf, logcdf, loc, sigma1, sigma2, out=None):
+    """
+    Log of the Survival Function at x of the defined two piece distribution. The right tail uses logcdf
+    directly, so it does not underflow.
+    :param x: array like
+    :param cdf: a cumulative density function from a symmetric distribution defined on R.
+    :param logcdf: the log of cdf
+    :param loc: location parameter
+    :param sigma1: scale parameter
+    :param sigma2: scale parameter
+    :param out: optional output array for array inputs
+    :return:
+    """
+    if (asarray(sigma1) * asarray(sigma2) <= 0).any():
+        raise AssertionError('Scale parameters must be positive.')
+    p = sigma1 / (sigma1 + sigma2)
+    if all_scalar(x, loc, sigma1, sigma2):
+        if x < loc:
+            output = log1p(-2 * p * cdf((x - loc) / sigma1))
+        else:
+            output = log(2 * (1 - p)) + logcdf((loc - x) / sigma2)
+    else:
+        x = asarray(x)
+        output = two_piece(x, x < loc, log_complement(cdf, 2 * p), (loc, sigma1, 0, 1),
+                           logcdf, (loc, -sigma2, log(2 * (1 - p)), 1), out=out)
+        output = output[()] if out is None else output
+    return output
+
+
+@instrumented('scale')
+def isf_tp_generic(q, qqf, loc, sigma1, sigma2, out=None):
+    """
+    Inverse Survival Function at q of the defined two piece distribution, accurate for small q.
+    :param q: array like
+    :param qqf: a quantile function (ppf) from a symmetric distribution defined on R.
+    :param loc: location parameter
+    :param sigma1: scale parameter
+    :param sigma2: scale parameter
+    :param out: optional output array for array inputs
+    :return:
+    """
+    if (asarray(sigma1) * asarray(sigma2) <= 0).any():
+        raise AssertionError('Scale parameters must be positive.')
+
+    p = sigma1 / (sigma1 + sigma2)
+
+    if all_scalar(q, loc, sigma1, sigma2):
+        if q > 1 or q < 0:
+            raise AssertionError('Inverse Survival Function is defined on (0,1).')
+        if q >= 1 - p:
+            output = loc + sigma1 * qqf((1 - q) / (2 * p))
+        else:
+            output = loc - sigma2 * qqf(q / (2 * (1 - p)))
+    else:
+        q = asarray(q)
+        if ((q > 1) | (q < 0)).any():
+            raise AssertionError('Inverse Survival Function is defined on (0,1).')
+        output = two_piece(q, q >= 1 - p, qqf, (1, -2 * p, loc, sigma1), coef2=(0, 2 * (1 - p), loc, -sigma2),
+                           out=out)
+        output = output[()] if out is None else output
+
+    return output
+
+
+@instrumented('scale')
+def random_tp_sample(size, qqf, loc, sigma1, sigma2, random_state=None, half=None, shape=None):
     """
     Random Sample Generation
-    :param size: integer, sample size
+    :param size: integer or tuple of integers, sample size. It must broadcast against the parameters.
     :param qqf: a quantile function (ppf) from a symmetric distribution defined on R
     :param loc: location parameter
     :param sigma1: scale parameter
     :param sigma2: scale parameter
+    :param random_state: None, integer, SeedSequence, numpy.random.Generator or numpy.random.RandomState
+    :param half: optional direct generator of the absolute value of the base (see twopiece.rng.HALF_SAMPLERS),
+    used instead of qqf when the parameters are scalar
+    :param shape: shape parameter of the base passed to half, None if it has no shape
     :return:
     """
-    if not isinstance(size, int):
+    if not isinstance(size, (int, tuple)):
         raise TypeError('Sample size must be of type integer.')
 
-    if sigma1 * sigma2 <= 0:
+    if (asarray(sigma1) * asarray(sigma2) <= 0).any():
         raise AssertionError('Scale parameters must be positive.')
 
-    alpha = random.rand(size)
+    generator = check_random_state(random_state)
     p = sigma1 / (sigma1 + sigma2)
 
-    if isscalar(alpha):
-        if alpha <= p:
-            qq = loc + sigma1 * qqf(0.5 * (sigma1 + sigma2) * alpha / sigma1)
-        else:
-            qq = loc + sigma2 * qqf(0.5 * ((sigma1 + sigma2) * (1 + alpha) - 2 * sigma1) / sigma2)
-    else:
-        alpha = asarray(alpha)
-        qq = empty(alpha.size)
-        index = alpha <= p
-        qq[index] = loc + sigma1 * qqf(0.5 * (sigma1 + sigma2) * alpha[index] / sigma1)
-        index = alpha > p
-        qq[index] = loc + sigma2 * qqf(0.5 * ((sigma1 + sigma2) * (1 + alpha[index]) - 2 * sigma1) / sigma2)
+    if half is not None and all_scalar(loc, sigma1, sigma2) and (shape is None or all_scalar(shape)):
+        return sample_two_piece(size, half, half, loc, sigma1, sigma2, p, generator, shape, shape)
+
+    alpha = generator.random(size)
+    qq = _qqf_tp_array(alpha, qqf, loc, sigma1, sigma2, p, alpha if all_scalar(loc, sigma1, sigma2) else None)
 
     return qq
 
 
+@instrumented_methods
 class TwoPiece:
 
+    family = None
+
     def __init__(self, f, loc, sigma1, sigma2, sigma, gamma, kind):
 
         """
@@ -166,12 +332,13 @@ class TwoPiece:
             raise ValueError('Invalid value of kind provided. Valid values '
                              'are boe, inverse_scale, epsilon_skew, percentile.  ')
         self.f = f
+        self.base = closed_form(f)
         self.loc = loc
         self.sigma = sigma
         self.gamma = gamma
         self.kind = kind
 
-        if sigma1 and sigma2:
+        if sigma1 is not None and sigma2 is not None:
             self.sigma1 = sigma1
             self.sigma2 = sigma2
         else:
@@ -179,52 +346,141 @@ class TwoPiece:
             self.sigma1 = sigma1
             self.sigma2 = sigma2
 
+    @classmethod
+    def from_params(cls, params):
+        """
+        Fast constructor from validated parameters, skipping the checks and conversions of __init__.
+        :param params: ScaleParams
+        :return: instance of cls
+        """
+        if cls.family is None:
+            raise TypeError(f'{cls.__name__} has no base distribution, use one of its subclasses.')
+        dist = cls.__new__(cls)
+        dist.f = cls.family
+        dist.base = closed_form(cls.family)
+        dist.loc, dist.sigma1, dist.sigma2 = params
+        dist.sigma = dist.gamma = dist.kind = None
+        return dist
+
+    @property
+    def params(self):
+        return ScaleParams._make((self.loc, self.sigma1, self.sigma2))
 
-class TwoPieceScale(TwoPiece):
 
-    def pdf(self, x):
-        s = pdf_tp_generic(x, self.f.pdf, self.loc, self.sigma1, self.sigma2)
+@instrumented_methods
+class TwoPieceScale(TwoPiece, Streaming, TabulatedPpf, GridEvaluation, Moments, RiskMeasures):
+
+    def pdf(self, x, out=None):
+        s = pdf_tp_generic(x, self.base.pdf, self.loc, self.sigma1, self.sigma2, out)
         return s
 
-    def cdf(self, x):
-        s = cdf_tp_generic(x, self.f.cdf, self.loc, self.sigma1, self.sigma2)
+    def cdf(self, x, out=None):
+        s = cdf_tp_generic(x, self.base.cdf, self.loc, self.sigma1, self.sigma2, out)
         return s
 
-    def ppf(self, x):
-        qq = qqf_tp_generic(x, self.f.ppf, self.loc, self.sigma1, self.sigma2)
+    def ppf(self, x, out=None):
+        qq = qqf_tp_generic(x, self.base.ppf, self.loc, self.sigma1, self.sigma2, out)
         return qq
 
-    def random_sample(self, size):
-        sample = random_tp_sample(size, self.f.ppf, self.loc, self.sigma1, self.sigma2)
+    def logpdf(self, x, out=None):
+        s = logpdf_tp_generic(x, self.base.logpdf, self.loc, self.sigma1, self.sigma2, out)
+        return s
+
+    def logcdf(self, x, out=None):
+        s = logcdf_tp_generic(x, self.base.cdf, self.base.logcdf, self.loc, self.sigma1, self.sigma2, out)
+        return s
+
+    def sf(self, x, out=None):
+        s = sf_tp_generic(x, self.base.cdf, self.loc, self.sigma1, self.sigma2, out)
+        return s
+
+    def logsf(self, x, out=None):
+        s = logsf_tp_generic(x, self.base.cdf, self.base.logcdf, self.loc, self.sigma1, self.sigma2, out)
+        return s
+
+    def isf(self, q, out=None):
+        x = isf_tp_generic(q, self.base.ppf, self.loc, self.sigma1, self.sigma2, out)
+        return x
+
+    def random_sample(self, size, random_state=None):
+        sample = random_tp_sample(size, self.base.ppf, self.loc, self.sigma1, self.sigma2, random_state,
+                                  half_sampler(self.f))
+        return sample
+
+    def random_sample_chunked(self, size, out=None, random_state=None, chunk_size=CHUNK_SIZE, max_workers=None):
+        """
+        Random sample generated in chunks on a thread pool, see twopiece.rng.chunked_sample. The parameters of
+        the distribution must be scalar.
+        :param size: integer or tuple of integers, sample size
+        :param out: optional C contiguous output array of the given size, e.g. a numpy.memmap
+        :param random_state: None, integer, SeedSequence or numpy.random.Generator
+        :param chunk_size: number of draws per chunk
+        :param max_workers: number of threads
+        :return: out
+        """
+        def sampler(n, generator):
+            return random_tp_sample(n, self.base.ppf, self.loc, self.sigma1, self.sigma2, generator,
+                                    half_sampler(self.f))
+
+        sample = chunked_sample(sampler, size, out, random_state, chunk_size, max_workers)
         return sample
 
+    def _pieces(self):
+        return self.f, None, None, self.sigma1 / (self.sigma1 + self.sigma2)
+
+    def _bases(self):
+        return self.base, self.base
+
+    def fit(self, data):
+        """
+        Maximum likelihood estimates of the parameters, starting from the median and the spread of the data.
+        :param data: array like of observations
+        :return: dict with the estimated loc, sigma1 and sigma2
+        """
+        if base_key(self.f) == 'norm':
+            params = fit_tpnorm(data)
+        else:
+            params = fit_tpd(data, self.f, self.f)[:3]
+        return fit_result(('loc', 'sigma1', 'sigma2'), params)
+
 
 class tpnorm(TwoPieceScale):
 
+    family = scipy.stats.norm
+
     def __init__(self, loc=0.0, sigma1=None, sigma2=None, sigma=None, gamma=None, kind=None):
         TwoPieceScale.__init__(self, scipy.stats.norm, loc, sigma1, sigma2, sigma, gamma, kind)
 
 
 class tplaplace(TwoPieceScale):
 
+    family = scipy.stats.laplace
+
     def __init__(self, loc=0.0, sigma1=None, sigma2=None, sigma=None, gamma=None, kind=None):
         TwoPieceScale.__init__(self, scipy.stats.laplace, loc, sigma1, sigma2, sigma, gamma, kind)
 
 
 class tpcauchy(TwoPieceScale):
 
+    family = scipy.stats.cauchy
+
     def __init__(self, loc=0.0, sigma1=None, sigma2=None, sigma=None, gamma=None, kind=None):
         TwoPieceScale.__init__(self, scipy.stats.cauchy, loc, sigma1, sigma2, sigma, gamma, kind)
 
 
 class tplogistic(TwoPieceScale):
 
+    family = scipy.stats.logistic
+
     def __init__(self, loc=0.0, sigma1=None, sigma2=None, sigma=None, gamma=None, kind=None):
         TwoPieceScale.__init__(self, scipy.stats.logistic, loc, sigma1, sigma2, sigma, gamma, kind)
 
 
+@instrumented_methods
 class TwoPieceScalewithShape:
 
+    family = None
+
     def __init__(self, f, loc, sigma1, sigma2, sigma, gamma, shape, kind):
 
         if sigma1 is None or sigma2 is None:
@@ -238,10 +494,12 @@ class TwoPieceScalewithShape:
         self.loc = loc
         self.sigma = sigma
         self.gamma = gamma
-        self.f = f(shape)
+        self.family = f
+        self.shape = shape
+        self.f = frozen_base(f, shape)[0]
         self.kind = kind
 
-        if sigma1 and sigma2:
+        if sigma1 is not None and sigma2 is not None:
             self.sigma1 = sigma1
             self.sigma2 = sigma2
         else:
@@ -249,40 +507,121 @@ class TwoPieceScalewithShape:
             self.sigma1 = sigma1
             self.sigma2 = sigma2
 
+    @classmethod
+    def from_params(cls, params):
+        """
+        Fast constructor from validated parameters, skipping the checks and conversions of __init__.
+        :param params: ScaleShapeParams
+        :return: instance of cls
+        """
+        if cls.family is None:
+            raise TypeError(f'{cls.__name__} has no base distribution, use one of its subclasses.')
+        dist = cls.__new__(cls)
+        dist.loc, dist.sigma1, dist.sigma2, dist.shape = params
+        dist.family = cls.family
+        dist.f = frozen_base(cls.family, dist.shape)[0]
+        dist.sigma = dist.gamma = dist.kind = None
+        return dist
+
+    @property
+    def params(self):
+        return ScaleShapeParams._make((self.loc, self.sigma1, self.sigma2, self.shape))
+
 
-class tp_scalesh(TwoPieceScalewithShape):
+@instrumented_methods
+class tp_scalesh(TwoPieceScalewithShape, Streaming, TabulatedPpf, GridEvaluation, Moments, RiskMeasures):
 
-    def pdf(self, x):
-        s = pdf_tp_generic(x, self.f.pdf, self.loc, self.sigma1, self.sigma2)
+    def pdf(self, x, out=None):
+        s = pdf_tp_generic(x, self.f.pdf, self.loc, self.sigma1, self.sigma2, out)
         return s
 
-    def cdf(self, x):
-        s = cdf_tp_generic(x, self.f.cdf, self.loc, self.sigma1, self.sigma2)
+    def cdf(self, x, out=None):
+        s = cdf_tp_generic(x, self.f.cdf, self.loc, self.sigma1, self.sigma2, out)
         return s
 
-    def ppf(self, x):
-        qq = qqf_tp_generic(x, self.f.ppf, self.loc, self.sigma1, self.sigma2)
+    def ppf(self, x, out=None):
+        qq = qqf_tp_generic(x, self.f.ppf, self.loc, self.sigma1, self.sigma2, out)
         return qq
 
-    def random_sample(self, size):
-        sample = random_tp_sample(size, self.f.ppf, self.loc, self.sigma1, self.sigma2)
+    def logpdf(self, x, out=None):
+        s = logpdf_tp_generic(x, self.f.logpdf, self.loc, self.sigma1, self.sigma2, out)
+        return s
+
+    def logcdf(self, x, out=None):
+        s = logcdf_tp_generic(x, self.f.cdf, self.f.logcdf, self.loc, self.sigma1, self.sigma2, out)
+        return s
+
+    def sf(self, x, out=None):
+        s = sf_tp_generic(x, self.f.cdf, self.loc, self.sigma1, self.sigma2, out)
+        return s
+
+    def logsf(self, x, out=None):
+        s = logsf_tp_generic(x, self.f.cdf, self.f.logcdf, self.loc, self.sigma1, self.sigma2, out)
+        return s
+
+    def isf(self, q, out=None):
+        x = isf_tp_generic(q, self.f.ppf, self.loc, self.sigma1, self.sigma2, out)
+        return x
+
+    def random_sample(self, size, random_state=None):
+        sample = random_tp_sample(size, self.f.ppf, self.loc, self.sigma1, self.sigma2, random_state,
+                                  half_sampler(self.family), self.shape)
+        return sample
+
+    def random_sample_chunked(self, size, out=None, random_state=None, chunk_size=CHUNK_SIZE, max_workers=None):
+        """
+        Random sample generated in chunks on a thread pool, see twopiece.rng.chunked_sample. The parameters of
+        the distribution must be scalar.
+        :param size: integer or tuple of integers, sample size
+        :param out: optional C contiguous output array of the given size, e.g. a numpy.memmap
+        :param random_state: None, integer, SeedSequence or numpy.random.Generator
+        :param chunk_size: number of draws per chunk
+        :param max_workers: number of threads
+        :return: out
+        """
+        def sampler(n, generator):
+            return random_tp_sample(n, self.f.ppf, self.loc, self.sigma1, self.sigma2, generator,
+                                    half_sampler(self.family), self.shape)
+
+        sample = chunked_sample(sampler, size, out, random_state, chunk_size, max_workers)
         return sample
 
+    def _pieces(self):
+        return self.family, self.shape, self.shape, self.sigma1 / (self.sigma1 + self.sigma2)
+
+    def _bases(self):
+        return self.f, self.f
+
+    def fit(self, data):
+        """
+        Maximum likelihood estimates of the parameters, starting from the data and the shape of this instance.
+        :param data: array like of observations
+        :return: dict with the estimated loc, sigma1, sigma2 and shape
+        """
+        params = fit_tpd(data, self.family, self.family, shape1=self.shape, shape2=self.shape, tie_shapes=True)
+        return fit_result(('loc', 'sigma1', 'sigma2', 'shape'), params[:4])
+
 
 class tpstudent(tp_scalesh):
 
+    family = scipy.stats.t
+
     def __init__(self, loc=0.0, sigma1=None, sigma2=None, sigma=None, gamma=None, shape=None, kind=None):
         tp_scalesh.__init__(self, scipy.stats.t, loc, sigma1, sigma2, sigma, gamma, shape, kind)
 
 
 class tpgennorm(tp_scalesh):
 
+    family = scipy.stats.gennorm
+
     def __init__(self, loc=0.0, sigma1=None, sigma2=None, sigma=None, gamma=None, shape=None, kind=None):
         tp_scalesh.__init__(self, scipy.stats.gennorm, loc, sigma1, sigma2, sigma, gamma, shape, kind)
 
 
 class tpsas(tp_scalesh):
 
+    family = ssas
+
     def __init__(self, loc=0.0, sigma1=None, sigma2=None, sigma=None, gamma=None, shape=None, kind=None):
         tp_scalesh.__init__(self, ssas, loc, sigma1, sigma2, sigma, gamma, shape, kind)
 
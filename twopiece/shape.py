@@ -10,6 +10,8 @@
 import scipy.stats
 
 from twopiece.double import tpd_continuous
+from twopiece.fit import fit_tpd, fit_result
+from twopiece.params import DoubleParams, ShapeParams
 from twopiece.sinharcsinh import ssas
 from twopiece.utils import display_dist
 
@@ -19,21 +21,51 @@ class TwoPieceShape(tpd_continuous):
     def __init__(self, f, loc=0.0, sigma=1.0, shape1=None, shape2=None):
         tpd_continuous.__init__(self, f, loc, sigma, sigma, None, None, shape1, shape2, None)
 
+    def fit(self, data):
+        """
+        Maximum likelihood estimates of the parameters, starting from the data and the shapes of this instance.
+        :param data: array like of observations
+        :return: dict with the estimated loc, sigma, shape1 and shape2
+        """
+        loc, sigma, _, shape1, shape2 = fit_tpd(data, self.f, self.f, shape1=self.shape1, shape2=self.shape2,
+                                                tie_sigmas=True)
+        return fit_result(('loc', 'sigma', 'shape1', 'shape2'), (loc, sigma, shape1, shape2))
+
+    @classmethod
+    def from_params(cls, params):
+        """
+        Fast constructor from validated parameters, skipping the checks and conversions of __init__.
+        :param params: ShapeParams
+        :return: instance of cls
+        """
+        loc, sigma, shape1, shape2 = params
+        return super().from_params(DoubleParams._make((loc, sigma, sigma, shape1, shape2)))
+
+    @property
+    def params(self):
+        return ShapeParams._make((self.loc, self.sigma1, self.shape1, self.shape2))
+
 
 class tpshastudent(TwoPieceShape):
 
+    family = scipy.stats.t
+
     def __init__(self, loc=0.0, sigma=1.0, shape1=3.0, shape2=3.0):
         TwoPieceShape.__init__(self, scipy.stats.t, loc, sigma, shape1, shape2)
 
 
 class tpshagennorm(TwoPieceShape):
 
+    family = scipy.stats.gennorm
+
     def __init__(self, loc=0.0, sigma=1.0, shape1=3.0, shape2=3.0):
         TwoPieceShape.__init__(self, scipy.stats.gennorm, loc, sigma, shape1, shape2)
 
 
 class tpshasas(TwoPieceShape):
 
+    family = ssas
+
     def __init__(self, loc=0.0, sigma=None, shape1=3.0, shape2=3.0):
         TwoPieceShape.__init__(self, ssas, loc, sigma, shape1, shape2)
 
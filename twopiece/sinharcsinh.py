@@ -1,7 +1,18 @@
 from math import asinh, cosh, sqrt, sinh
 
 import scipy.stats
-from numpy import random, vectorize
+from numpy import isscalar, asarray, arcsinh, sinh as np_sinh, cosh as np_cosh, sqrt as np_sqrt, log, \
+    logaddexp, hypot, abs
+
+from twopiece.backend import get_backend
+from twopiece.closedform import closed_form, base_key
+from twopiece.grid import GridEvaluation
+from twopiece.kernel import result_dtype
+from twopiece.params import SinhArcsinhParams
+from twopiece.profiling import instrumented_methods
+from twopiece.rng import check_random_state, chunked_sample, HALF_SAMPLERS, CHUNK_SIZE
+from twopiece.stream import Streaming
+from twopiece.utils import all_scalar
 
 
 def _pdf_instance(x, pdf, loc, scale, delta, epsilon):
@@ -23,50 +34,228 @@ def _qqf_instance(q, qqf, loc, scale, delta, epsilon):
     return output
 
 
-def _random_sample(size, qqf, loc, scale, delta, epsilon):
-    alpha = random.rand(size)
-    qqfv = vectorize(_qqf_instance)
+def _compiled(name, func, x, loc, scale, delta, epsilon, out):
+    # Compiled kernel of the numba backend, None if it does not apply
+    if get_backend() != 'numba' or not all_scalar(loc, scale, delta, epsilon):
+        return None
+    from twopiece.jit import sinharcsinh_compiled
+    return sinharcsinh_compiled(name, func, x, loc, scale, delta, epsilon, out)
+
+
+def _store(output, x, out):
+    if out is None:
+        return output.astype(result_dtype(x), copy=False)
+    out[...] = output
+    return out
+
+
+def _pdf_array(x, pdf, loc, scale, delta, epsilon, out=None):
+    compiled = _compiled('pdf', pdf, x, loc, scale, delta, epsilon, out)
+    if compiled is not None:
+        return compiled
+    x = asarray(x)
+    z = (x - loc) / scale
+    w = delta * arcsinh(z) - epsilon
+    output = (delta / scale) * pdf(np_sinh(w)) * np_cosh(w) / np_sqrt(1 + z * z)
+    return _store(output, x, out)
+
+
+def _cdf_array(x, cdf, loc, scale, delta, epsilon, out=None):
+    compiled = _compiled('cdf', cdf, x, loc, scale, delta, epsilon, out)
+    if compiled is not None:
+        return compiled
+    x = asarray(x)
+    z = (x - loc) / scale
+    output = cdf(np_sinh(delta * arcsinh(z) - epsilon))
+    return _store(output, x, out)
+
+
+def _qqf_array(q, qqf, loc, scale, delta, epsilon, out=None):
+    compiled = _compiled('ppf', qqf, q, loc, scale, delta, epsilon, out)
+    if compiled is not None:
+        return compiled
+    q = asarray(q)
+    output = loc + scale * np_sinh((arcsinh(qqf(q)) + epsilon) / delta)
+    return _store(output, q, out)
+
+
+def _logpdf_array(x, logpdf, loc, scale, delta, epsilon, out=None):
+    x = asarray(x)
+    z = (x - loc) / scale
+    w = delta * arcsinh(z) - epsilon
+    # log(cosh(w)) = logaddexp(w, -w) - log(2) and log(sqrt(1 + z^2)) = log(hypot(1, z)) avoid overflow
+    output = log(delta / scale) + logpdf(np_sinh(w)) + logaddexp(w, -w) - log(2) - log(hypot(1, z))
+    return _store(output, x, out)
+
+
+def _logcdf_array(x, logcdf, loc, scale, delta, epsilon, out=None):
+    x = asarray(x)
+    z = (x - loc) / scale
+    output = logcdf(np_sinh(delta * arcsinh(z) - epsilon))
+    return _store(output, x, out)
+
+
+def _sf_array(x, cdf, loc, scale, delta, epsilon, out=None):
+    # The base is symmetric, so its survival function at s is cdf(-s).
+    x = asarray(x)
+    z = (x - loc) / scale
+    output = cdf(-np_sinh(delta * arcsinh(z) - epsilon))
+    return _store(output, x, out)
+
+
+def _logsf_array(x, logcdf, loc, scale, delta, epsilon, out=None):
+    x = asarray(x)
+    z = (x - loc) / scale
+    output = logcdf(-np_sinh(delta * arcsinh(z) - epsilon))
+    return _store(output, x, out)
 
-    return qqfv(alpha, qqf, loc, scale, delta, epsilon)
 
+def _isf_array(q, qqf, loc, scale, delta, epsilon, out=None):
+    q = asarray(q)
+    output = loc + scale * np_sinh((epsilon - arcsinh(qqf(q))) / delta)
+    return _store(output, q, out)
 
-class SinhArcsinh:
+
+def _is_scalar_call(x, *params):
+    return isscalar(x) and all(isscalar(p) for p in params)
+
+
+def _random_sample(size, f, qqf, loc, scale, delta, epsilon, random_state=None):
+    generator = check_random_state(random_state)
+    if base_key(f) != 'norm':
+        return _qqf_array(generator.random(size), qqf, loc, scale, delta, epsilon)
+
+    # The quantile function is loc + scale * sinh((asinh(qqf(u)) + epsilon) / delta), and qqf(u) is a standard
+    # normal draw: transforming normal draws directly avoids evaluating the normal quantile function.
+    z = generator.standard_normal(size)
+    if not all_scalar(loc, scale, delta, epsilon):
+        return loc + scale * np_sinh((arcsinh(z) + epsilon) / delta)
+    arcsinh(z, out=z)
+    z += epsilon
+    z /= delta
+    np_sinh(z, out=z)
+    z *= scale
+    z += loc
+    return z
+
+
+def _half_ssas(generator, size, shape):
+    # |X| = sinh(asinh(|Z|) / delta) with Z standard normal
+    z = generator.standard_normal(size)
+    abs(z, out=z)
+    arcsinh(z, out=z)
+    z /= shape
+    return np_sinh(z, out=z)
+
+
+@instrumented_methods
+class SinhArcsinh(Streaming, GridEvaluation):
+
+    family = None
 
     def __init__(self, f, loc, scale, delta, epsilon):
         self.f = f
+        self.base = closed_form(f)
         self.loc = loc
         self.scale = scale
         self.delta = delta
         self.epsilon = epsilon
 
-    def pdf(self, x):
-        _pdf_vector = vectorize(_pdf_instance)
-        s = _pdf_vector(x, self.f.pdf, self.loc, self.scale, self.delta, self.epsilon)
-        return s
+    @classmethod
+    def from_params(cls, params):
+        """
+        Fast constructor from validated parameters.
+        :param params: SinhArcsinhParams
+        :return: instance of cls
+        """
+        if cls.family is None:
+            raise TypeError(f'{cls.__name__} has no base distribution, use one of its subclasses.')
+        dist = cls.__new__(cls)
+        dist.f = cls.family
+        dist.base = closed_form(cls.family)
+        dist.loc, dist.scale, dist.delta, dist.epsilon = params
+        return dist
+
+    @property
+    def params(self):
+        return SinhArcsinhParams._make((self.loc, self.scale, self.delta, self.epsilon))
+
+    def pdf(self, x, out=None):
+        if _is_scalar_call(x, self.loc, self.scale, self.delta, self.epsilon):
+            return _pdf_instance(x, self.base.pdf, self.loc, self.scale, self.delta, self.epsilon)
+        s = _pdf_array(x, self.base.pdf, self.loc, self.scale, self.delta, self.epsilon, out)
+        return s[()] if out is None else s
 
-    def cdf(self, x):
-        _cdf_vector = vectorize(_cdf_instance)
-        s = _cdf_vector(x, self.f.cdf, self.loc, self.scale, self.delta, self.epsilon)
-        return s
+    def cdf(self, x, out=None):
+        if _is_scalar_call(x, self.loc, self.scale, self.delta, self.epsilon):
+            return _cdf_instance(x, self.base.cdf, self.loc, self.scale, self.delta, self.epsilon)
+        s = _cdf_array(x, self.base.cdf, self.loc, self.scale, self.delta, self.epsilon, out)
+        return s[()] if out is None else s
 
-    def ppf(self, q):
-        _qqf_vector = vectorize(_qqf_instance)
-        x = _qqf_vector(q, self.f.ppf, self.loc, self.scale, self.delta, self.epsilon)
+    def ppf(self, q, out=None):
+        if _is_scalar_call(q, self.loc, self.scale, self.delta, self.epsilon):
+            return _qqf_instance(q, self.base.ppf, self.loc, self.scale, self.delta, self.epsilon)
+        x = _qqf_array(q, self.base.ppf, self.loc, self.scale, self.delta, self.epsilon, out)
+        return x[()] if out is None else x
 
-        return x
+    def logpdf(self, x, out=None):
+        s = _logpdf_array(x, self.base.logpdf, self.loc, self.scale, self.delta, self.epsilon, out)
+        return s[()] if out is None else s
 
-    def random_sample(self, size):
-        sample = _random_sample(size, self.f.ppf, self.loc, self.scale, self.delta, self.epsilon)
+    def logcdf(self, x, out=None):
+        s = _logcdf_array(x, self.base.logcdf, self.loc, self.scale, self.delta, self.epsilon, out)
+        return s[()] if out is None else s
+
+    def sf(self, x, out=None):
+        s = _sf_array(x, self.base.cdf, self.loc, self.scale, self.delta, self.epsilon, out)
+        return s[()] if out is None else s
+
+    def logsf(self, x, out=None):
+        s = _logsf_array(x, self.base.logcdf, self.loc, self.scale, self.delta, self.epsilon, out)
+        return s[()] if out is None else s
+
+    def isf(self, q, out=None):
+        x = _isf_array(q, self.base.ppf, self.loc, self.scale, self.delta, self.epsilon, out)
+        return x[()] if out is None else x
+
+    def random_sample(self, size, random_state=None):
+        sample = _random_sample(size, self.f, self.base.ppf, self.loc, self.scale, self.delta, self.epsilon,
+                                random_state)
+        return sample
+
+    def random_sample_chunked(self, size, out=None, random_state=None, chunk_size=CHUNK_SIZE, max_workers=None):
+        """
+        Random sample generated in chunks on a thread pool, see twopiece.rng.chunked_sample. The parameters of
+        the distribution must be scalar.
+        :param size: integer or tuple of integers, sample size
+        :param out: optional C contiguous output array of the given size, e.g. a numpy.memmap
+        :param random_state: None, integer, SeedSequence or numpy.random.Generator
+        :param chunk_size: number of draws per chunk
+        :param max_workers: number of threads
+        :return: out
+        """
+        def sampler(n, generator):
+            return _random_sample(n, self.f, self.base.ppf, self.loc, self.scale, self.delta, self.epsilon,
+                                  generator)
+
+        sample = chunked_sample(sampler, size, out, random_state, chunk_size, max_workers)
         return sample
 
 
 class sinhasinh(SinhArcsinh):
 
+    family = scipy.stats.norm
+
     def __init__(self, loc=0.0, scale=1.0, delta=1.0, epsilon=0.0):
         SinhArcsinh.__init__(self, scipy.stats.norm, loc, scale, delta, epsilon)
 
 
 class ssas(SinhArcsinh):
 
+    family = scipy.stats.norm
+
     def __init__(self, delta=1.0):
         SinhArcsinh.__init__(self, f=scipy.stats.norm, loc=0.0, scale=1.0, delta=delta, epsilon=0.0)
+
+
+HALF_SAMPLERS[ssas] = _half_ssas
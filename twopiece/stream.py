@@ -0,0 +1,85 @@
+# -*- coding: utf-8 -*-
+# name: twopiece.stream.py
+# --
+# coding: utf-8
+
+"""
+Streaming variants of the sampling and evaluation methods.
+
+The generators below yield fixed size blocks written into a single buffer that is reused for every block, so a
+pipeline consuming the blocks one at a time runs at constant memory whatever the length of the stream. The
+evaluation methods write into the buffer through their out argument; the random blocks are drawn by random_sample
+and copied into it, so each draw allocates one temporary block. As a consequence a yielded block is only valid
+until the next one is requested: consumers that keep blocks must copy them.
+"""
+
+from itertools import count
+
+from numpy import asarray, empty, float64
+
+from twopiece.kernel import result_dtype
+from twopiece.rng import check_random_state
+
+
+class Streaming:
+    """
+    Mixin adding iter_random_sample and imap_* to a class with random_sample(size, random_state) and
+    pdf, cdf, ppf, logpdf methods accepting an out argument.
+    """
+
+    def iter_random_sample(self, chunk_size, n_chunks=None, random_state=None):
+        """
+        Random sample in blocks of chunk_size draws.
+        :param chunk_size: number of draws per block
+        :param n_chunks: number of blocks, unbounded by default
+        :param random_state: None, integer, SeedSequence, numpy.random.Generator or numpy.random.RandomState
+        :return: generator of arrays of size chunk_size, all sharing the same buffer
+        """
+        if not isinstance(chunk_size, int) or chunk_size < 1:
+            raise ValueError('chunk_size must be a positive integer.')
+        generator = check_random_state(random_state)
+        buffer = empty(chunk_size, dtype=float64)
+        for _ in (count() if n_chunks is None else range(n_chunks)):
+            buffer[...] = self.random_sample(chunk_size, random_state=generator)
+            yield buffer
+
+    def _imap(self, method, chunks):
+        buffer = None
+        for chunk in chunks:
+            chunk = asarray(chunk)
+            dtype = result_dtype(chunk)
+            if buffer is None or buffer.shape != chunk.shape or buffer.dtype != dtype:
+                buffer = empty(chunk.shape, dtype=dtype)
+            yield method(chunk, out=buffer)
+
+    def imap_pdf(self, chunks):
+        """
+        Probability density function of every block of an iterable.
+        :param chunks: iterable of array like blocks
+        :return: generator of arrays, reusing the same buffer while the block shape does not change
+        """
+        return self._imap(self.pdf, chunks)
+
+    def imap_logpdf(self, chunks):
+        """
+        Log of the probability density function of every block of an iterable.
+        :param chunks: iterable of array like blocks
+        :return: generator of arrays, reusing the same buffer while the block shape does not change
+        """
+        return self._imap(self.logpdf, chunks)
+
+    def imap_cdf(self, chunks):
+        """
+        Cumulative distribution function of every block of an iterable.
+        :param chunks: iterable of array like blocks
+        :return: generator of arrays, reusing the same buffer while the block shape does not change
+        """
+        return self._imap(self.cdf, chunks)
+
+    def imap_ppf(self, chunks):
+        """
+        Quantile function of every block of an iterable.
+        :param chunks: iterable of array like blocks of probabilities
+        :return: generator of arrays, reusing the same buffer while the block shape does not change
+        """
+        return self._imap(self.ppf, chunks)
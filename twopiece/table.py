@@ -0,0 +1,150 @@
+# -*- coding: utf-8 -*-
+# name: twopiece.table.py
+# --
+# coding: utf-8
+
+"""
+Tabulated quantile functions.
+
+The quantile functions of the t and of the generalised normal are computed by scipy with iterative root
+finding, which makes ppf and inverse transform sampling their slowest operations. QuantileTable tabulates the
+quantile function x(u) of a distribution once, on a uniform grid in u = logit(q), so that the nodes are dense
+in both tails, together with its exact derivative dx/du = q (1 - q) / pdf(x). The grid is shifted so that
+the junction of the two pieces is a node, as the quantile function is only once differentiable there. Queries
+are then answered by cubic Hermite interpolation, locating the interval arithmetically on the uniform grid. The
+grid is refined until the error at the midpoints of the intervals, relative to max(1, |x|), is below the
+requested tolerance, and a RuntimeWarning is issued if max_nodes is reached first. Probabilities outside
+[q_min, 1 - q_min], and nan, fall back to the exact quantile function.
+"""
+
+import warnings
+
+from numpy import arange, ceil, floor, clip, intp, abs, maximum, asarray, empty, where, isscalar
+from scipy.special import logit, expit
+
+from twopiece.kernel import result_dtype
+
+
+class QuantileTable:
+
+    def __init__(self, ppf, isf, pdf, knot=None, tol=1e-8, q_min=1e-10, max_nodes=1 << 20):
+        """
+        :param ppf: exact quantile function of a distribution with scalar parameters
+        :param isf: exact inverse survival function of the same distribution, used for the upper half of the
+        table, where q = expit(u) is rounded
+        :param pdf: probability density function of the same distribution
+        :param knot: optional probability at which the quantile function is not twice differentiable (the
+        probability of the left piece), which is made a node of the grid
+        :param tol: error bound, relative to max(1, |x|), at the midpoints of the grid
+        :param q_min: the table covers the probabilities in [q_min, 1 - q_min]
+        :param max_nodes: the grid is not refined beyond this number of nodes
+        """
+        if not 0 < q_min < 0.5:
+            raise ValueError('q_min must be in (0, 0.5).')
+        self.ppf = ppf
+        self.isf = isf
+        self.pdf = pdf
+        self.tol = tol
+        self.u_min = logit(q_min)
+        self.u_max = -self.u_min
+        self.u_knot = 0.0 if knot is None else logit(knot)
+
+        intervals = 256
+        while True:
+            self._build(intervals)
+            u = self.start + self.step * (arange(self.size - 1) + 0.5)
+            exact = self._exact(u)
+            self.error = (abs(self._interpolate(u) - exact) / maximum(1, abs(exact))).max()
+            if self.error <= tol:
+                break
+            if 2 * intervals > max_nodes:
+                warnings.warn(f'Quantile table stopped at {self.size} nodes with error {self.error:.3g} above the '
+                              f'tolerance {tol:.3g}, increase max_nodes.', RuntimeWarning, stacklevel=2)
+                break
+            intervals *= 2
+
+    def _exact(self, u):
+        lower = u < 0
+        x = empty(u.shape)
+        x[lower] = self.ppf(expit(u[lower]))
+        x[~lower] = self.isf(expit(-u[~lower]))
+        return x
+
+    def _build(self, intervals):
+        # Uniform grid with step (u_max - u_min) / intervals covering [u_min, u_max], shifted onto u_knot
+        self.step = (self.u_max - self.u_min) / intervals
+        self.start = self.u_knot - ceil((self.u_knot - self.u_min) / self.step) * self.step
+        u = self.start + self.step * arange(ceil((self.u_max - self.start) / self.step) + 1)
+        q = expit(u)
+        values = self._exact(u)
+        slopes = q * (1 - q) / self.pdf(values) * self.step
+
+        # Cubic Hermite polynomial of every interval in the local variable s in [0, 1], for Horner evaluation
+        y0, y1, m0, m1 = values[:-1], values[1:], slopes[:-1], slopes[1:]
+        self.size = values.size
+        self.coefficients = (y0, m0, 3 * (y1 - y0) - 2 * m0 - m1, 2 * (y0 - y1) + m0 + m1)
+
+    def _interpolate(self, u):
+        t = (u - self.start) / self.step
+        i = floor(t)
+        clip(i, 0, self.size - 2, out=i)
+        t -= i
+        i = i.astype(intp)
+        c0, c1, c2, c3 = self.coefficients
+        output = c3.take(i)
+        output *= t
+        output += c2.take(i)
+        output *= t
+        output += c1.take(i)
+        output *= t
+        output += c0.take(i)
+        return output
+
+    def __call__(self, q, out=None):
+        """
+        Approximate quantile function.
+        :param q: array like
+        :param out: optional output array
+        :return: array
+        """
+        q = asarray(q)
+        if ((q > 1) | (q < 0)).any():
+            raise ValueError('Quantile Function is defined on (0,1).')
+        flat = q.reshape(-1)
+        u = logit(flat)
+        # written so that nan is outside
+        outside = ~((u >= self.u_min) & (u <= self.u_max))
+        if outside.any():
+            output = self._interpolate(where(outside, 0.0, u))
+            output[outside] = self.ppf(flat[outside])
+        else:
+            output = self._interpolate(u)
+        output = output.reshape(q.shape)
+        if out is None:
+            return output.astype(result_dtype(q), copy=False)[()]
+        out[...] = output
+        return out
+
+
+class TabulatedPpf:
+    """
+    Mixin adding ppf_approx to a two piece class with scalar parameters.
+    """
+
+    def ppf_approx(self, q, out=None, tol=1e-8):
+        """
+        Approximate quantile function, interpolated in a table built on the first call (see QuantileTable).
+        :param q: array like
+        :param out: optional output array
+        :param tol: error bound, relative to max(1, |x|); the table is rebuilt when it or the parameters change
+        :return: array
+        """
+        params = self.params
+        if not all(p is None or isscalar(p) for p in params):
+            raise ValueError('Quantile tables require scalar parameters.')
+        table = getattr(self, '_quantile_table', None)
+        if table is None or table.tol != tol or self._quantile_params != params:
+            table = QuantileTable(self.ppf, self.isf, self.pdf, self.cdf(self.loc), tol)
+            self._quantile_table, self._quantile_params = table, params
+        return table(q, out)
+
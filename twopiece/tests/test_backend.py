@@ -0,0 +1,70 @@
+import importlib.util
+import sys
+import unittest
+from unittest import mock
+
+import numpy as np
+from parameterized import parameterized
+
+from twopiece.backend import get_backend, set_backend, use_backend
+from twopiece.scale import tpnorm, tplaplace, tplogistic, tpcauchy, tpgennorm, tpsas, tpstudent
+from twopiece.double import dtpsas
+from twopiece.sinharcsinh import sinhasinh
+
+HAS_NUMBA = importlib.util.find_spec('numba') is not None
+
+
+class TestBackend(unittest.TestCase):
+
+    def test_selection(self):
+        self.assertEqual(get_backend(), 'numpy')
+        self.assertRaises(ValueError, set_backend, 'cython')
+        with self.assertRaises(ValueError):
+            with use_backend('cython'):
+                pass
+        self.assertEqual(get_backend(), 'numpy')
+
+    def test_missing_numba(self):
+        with mock.patch.dict(sys.modules, {'numba': None, 'twopiece.jit': None}):
+            with self.assertRaises(ImportError) as context:
+                set_backend('numba')
+        self.assertIn('twopiece[numba]', str(context.exception))
+        self.assertEqual(get_backend(), 'numpy')
+
+    @unittest.skipUnless(HAS_NUMBA, 'numba is not installed')
+    def test_use_backend(self):
+        with use_backend('numba'):
+            self.assertEqual(get_backend(), 'numba')
+        self.assertEqual(get_backend(), 'numpy')
+        set_backend('numba')
+        try:
+            self.assertEqual(get_backend(), 'numba')
+        finally:
+            set_backend('numpy')
+
+    @parameterized.expand([
+        [tpnorm(loc=0.5, sigma1=1.0, sigma2=2.0)],
+        [tplaplace(loc=0.5, sigma1=1.0, sigma2=2.0)],
+        [tplogistic(loc=0.5, sigma1=1.0, sigma2=2.0)],
+        [tpcauchy(loc=0.5, sigma1=1.0, sigma2=2.0)],
+        [tpgennorm(loc=0.5, sigma1=1.0, sigma2=2.0, shape=1.5)],
+        [tpsas(loc=0.5, sigma1=1.0, sigma2=2.0, shape=0.8)],
+        [tpstudent(loc=0.5, sigma1=1.0, sigma2=2.0, shape=4.0)],
+        [dtpsas(loc=0.5, sigma1=1.0, sigma2=2.0, shape1=0.8, shape2=1.3)],
+        [sinhasinh(loc=0.5, scale=2.0, delta=1.5, epsilon=0.2)], ])
+    @unittest.skipUnless(HAS_NUMBA, 'numba is not installed')
+    def test_numba_matches_numpy(self, dist):
+        x = np.linspace(-20, 20, 1001)
+        q = np.concatenate([np.logspace(-300, -1, 100), np.linspace(0.1, 0.9, 101), 1 - np.logspace(-15, -1, 100),
+                            [0.0, 1.0, np.nan]])
+        for method, values in [('pdf', x), ('logpdf', x), ('cdf', x), ('ppf', q)]:
+            expected = getattr(dist, method)(values)
+            with use_backend('numba'):
+                output = getattr(dist, method)(values)
+                in_place = getattr(dist, method)(values.astype(np.float32))
+            np.testing.assert_allclose(output, expected, rtol=1e-11, atol=1e-300)
+            self.assertEqual(in_place.dtype, np.float32)
+
+
+if __name__ == '__main__':
+    unittest.main()
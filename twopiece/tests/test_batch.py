@@ -0,0 +1,51 @@
+import unittest
+
+import numpy as np
+from parameterized import parameterized
+
+from twopiece.batch import fit_batch
+from twopiece.scale import tpnorm, tpstudent
+
+
+class TestBatch(unittest.TestCase):
+
+    @parameterized.expand([
+        ['thread'],
+        ['process'], ])
+    def test_matches_sequential_fits(self, executor):
+        np.random.seed(0)
+        dist = tpstudent(loc=0.0, sigma1=1.0, sigma2=2.0, shape=5.0)
+        samples = np.array([dist.random_sample(500) for _ in range(7)])
+        calls = []
+
+        result = fit_batch(dist, samples, executor=executor, max_workers=2, chunksize=2,
+                           progress=lambda r: calls.append(r.completed))
+
+        self.assertEqual(result.params, [dist.fit(data) for data in samples])
+        self.assertEqual(result.completed, 7)
+        self.assertEqual(sorted(calls)[-1], 7)
+        self.assertEqual(len(calls), 4)
+        self.assertGreater(result.elapsed, 0.0)
+        self.assertGreater(result.fit_time, 0.0)
+
+    def test_iterator_and_failures(self):
+        np.random.seed(1)
+        dist = tpnorm(loc=0.0, sigma1=1.0, sigma2=1.0)
+        series = [dist.random_sample(100), [0.0, np.nan, 1.0], dist.random_sample(50)]
+
+        result = fit_batch(dist, iter(series), executor='thread', chunksize=1)
+
+        self.assertEqual(result.params[0], dist.fit(series[0]))
+        self.assertIsNone(result.params[1])
+        self.assertEqual(result.params[2], dist.fit(series[2]))
+        self.assertEqual(list(result.errors), [1])
+
+    def test_invalid_arguments(self):
+        dist = tpnorm(loc=0.0, sigma1=1.0, sigma2=1.0)
+        self.assertRaises(ValueError, fit_batch, dist, np.zeros(10), executor='thread')
+        self.assertRaises(ValueError, fit_batch, dist, np.zeros((2, 10)), executor='fork')
+        self.assertRaises(ValueError, fit_batch, dist, np.zeros((2, 10)), chunksize=0)
+
+
+if __name__ == '__main__':
+    unittest.main()
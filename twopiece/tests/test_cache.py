@@ -0,0 +1,59 @@
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import scipy.stats
+
+from twopiece.cache import FrozenCache
+from twopiece.double import dtpstudent
+from twopiece.scale import tpstudent
+
+
+class TestFrozenCache(unittest.TestCase):
+
+    def test_lru(self):
+        cache = FrozenCache(maxsize=2)
+        t3, pdf0 = cache.get(scipy.stats.t, 3.0)
+        self.assertAlmostEqual(pdf0, scipy.stats.t(3.0).pdf(0))
+        self.assertIs(cache.get(scipy.stats.t, 3.0)[0], t3)
+        cache.get(scipy.stats.t, 4.0)
+        cache.get(scipy.stats.t, 3.0)
+        cache.get(scipy.stats.gennorm, 3.0)
+        self.assertEqual(cache.info(), {'hits': 2, 'misses': 3, 'size': 2, 'maxsize': 2})
+        self.assertIs(cache.get(scipy.stats.t, 3.0)[0], t3)
+        self.assertEqual(cache.info()['misses'], 3)
+
+        cache.resize(1)
+        self.assertEqual(cache.info()['size'], 1)
+        cache.clear()
+        self.assertEqual(cache.info(), {'hits': 0, 'misses': 0, 'size': 0, 'maxsize': 1})
+        self.assertRaises(ValueError, cache.resize, -1)
+
+    def test_array_shapes_are_not_cached(self):
+        cache = FrozenCache()
+        frozen, pdf0 = cache.get(scipy.stats.t, np.array([3.0, 5.0]))
+        np.testing.assert_allclose(pdf0, scipy.stats.t([3.0, 5.0]).pdf(0))
+        self.assertEqual(cache.info()['size'], 0)
+
+    def test_threads(self):
+        cache = FrozenCache(maxsize=8)
+        shapes = [float(i % 16 + 1) for i in range(2000)]
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            results = list(pool.map(lambda shape: cache.get(scipy.stats.t, shape), shapes))
+        info = cache.info()
+        self.assertEqual(info['hits'] + info['misses'], len(shapes))
+        self.assertLessEqual(info['size'], 8)
+        for shape, (frozen, pdf0) in zip(shapes, results):
+            self.assertEqual(frozen.args, (shape,))
+
+    def test_instances_share_frozen_bases(self):
+        first = dtpstudent(loc=0.0, sigma1=1.0, sigma2=2.0, shape1=3.0, shape2=5.0)
+        second = dtpstudent(loc=1.0, sigma1=2.0, sigma2=1.0, shape1=5.0, shape2=3.0)
+        self.assertIs(first.f1, second.f2)
+        self.assertIs(tpstudent(loc=0.0, sigma1=1.0, sigma2=1.0, shape=3.0).f, first.f1)
+        self.assertAlmostEqual(first.epsilon, 1 * scipy.stats.t(5).pdf(0) /
+                               (scipy.stats.t(5).pdf(0) + 2 * scipy.stats.t(3).pdf(0)))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,125 @@
+import unittest
+
+import numpy as np
+import scipy.stats
+from parameterized import parameterized
+from scipy.special import gammaln, log_ndtr
+
+from twopiece.closedform import closed_form, frozen_closed_form, student_ppf, StandardStudent, StandardGennorm
+from twopiece.double import dtpstudent, dtpgennorm, pdf_tpd_generic, cdf_tpd_generic, qqf_tpd_generic
+from twopiece.scale import tpnorm, tplaplace, tplogistic, tpcauchy, tpstudent, tpgennorm, pdf_tp_generic, \
+    cdf_tp_generic, qqf_tp_generic
+
+
+class TestClosedForm(unittest.TestCase):
+
+    @parameterized.expand([
+        [scipy.stats.norm],
+        [scipy.stats.laplace],
+        [scipy.stats.logistic],
+        [scipy.stats.cauchy], ])
+    def test_agrees_with_scipy(self, f):
+        base = closed_form(f)
+        self.assertIsNot(base, f)
+        z = np.concatenate([np.linspace(-30, 30, 601), [-1e5, 1e5, 0.0]])
+        q = np.concatenate([np.linspace(0, 1, 501), [1e-300, 1e-12, 1 - 1e-12]])
+
+        np.testing.assert_allclose(base.pdf(z), f.pdf(z), rtol=1e-12, atol=0)
+        np.testing.assert_allclose(base.cdf(z), f.cdf(z), rtol=1e-12, atol=0)
+        np.testing.assert_allclose(base.ppf(q), f.ppf(q), rtol=1e-10, atol=1e-14)
+        self.assertAlmostEqual(base.pdf(0.3), f.pdf(0.3), places=14)
+        self.assertAlmostEqual(base.ppf(0.3), f.ppf(0.3), places=14)
+
+    @parameterized.expand([
+        [tpnorm, scipy.stats.norm],
+        [tplaplace, scipy.stats.laplace],
+        [tplogistic, scipy.stats.logistic],
+        [tpcauchy, scipy.stats.cauchy], ])
+    def test_two_piece_agrees_with_scipy_path(self, dist, f):
+        z = dist(loc=0.5, sigma1=0.5, sigma2=3.0)
+        x = np.linspace(-20, 20, 401)
+        q = np.linspace(0.001, 0.999, 401)
+
+        np.testing.assert_allclose(z.pdf(x), pdf_tp_generic(x, f.pdf, 0.5, 0.5, 3.0), rtol=1e-12)
+        np.testing.assert_allclose(z.cdf(x), cdf_tp_generic(x, f.cdf, 0.5, 0.5, 3.0), rtol=1e-12)
+        np.testing.assert_allclose(z.ppf(q), qqf_tp_generic(q, f.ppf, 0.5, 0.5, 3.0), rtol=1e-10)
+
+    @parameterized.expand([
+        [scipy.stats.t, StandardStudent, 0.7],
+        [scipy.stats.t, StandardStudent, 4.0],
+        [scipy.stats.t, StandardStudent, np.inf],
+        [scipy.stats.t, StandardStudent, np.array([[0.5], [3.0], [50.0]])],
+        [scipy.stats.gennorm, StandardGennorm, 0.5],
+        [scipy.stats.gennorm, StandardGennorm, 3.0],
+        [scipy.stats.gennorm, StandardGennorm, np.array([[0.8], [1.5], [8.0]])], ])
+    def test_shaped_agrees_with_scipy(self, f, cls, shape):
+        base = frozen_closed_form(f, shape)
+        self.assertIsInstance(base, cls)
+        frozen = f(shape)
+        z = np.concatenate([np.linspace(-30, 30, 601), [-1e5, 1e5, 0.0]])
+        q = np.concatenate([np.linspace(0, 1, 501), [1e-20, 1e-12, 1 - 1e-12]])
+
+        for name in ('pdf', 'logpdf', 'cdf'):
+            np.testing.assert_allclose(getattr(base, name)(z), getattr(frozen, name)(z), rtol=1e-12, atol=1e-300)
+        # scipy.stats underflows to -inf in the far lower tail, where logcdf stays finite
+        actual, expected = np.broadcast_arrays(base.logcdf(z), frozen.logcdf(z))
+        finite = np.isfinite(expected)
+        np.testing.assert_allclose(actual[finite], expected[finite], rtol=1e-12)
+        self.assertTrue((actual[~finite] < -700).all())
+        np.testing.assert_allclose(base.ppf(q), frozen.ppf(q), rtol=1e-12, atol=1e-14)
+        self.assertAlmostEqual(np.max(base.ppf(0.3)), np.max(frozen.ppf(0.3)), places=14)
+
+    def test_logcdf_far_tail(self):
+        y = np.array([0.5, 5.0, 26.0, 27.0, 50.0, 800.0, 1e5, 1e150])
+        # exact references: the Laplace, the normal with variance 1 / 2, the Cauchy and the t with 2 degrees of
+        # freedom, for which cdf(-y) = 1 / (sqrt(2 + y^2) (sqrt(2 + y^2) + y))
+        root = y * np.sqrt(1 + 2 / y ** 2)
+        cases = [
+            (StandardGennorm(1.0), -y - np.log(2)),
+            (StandardGennorm(2.0), log_ndtr(-np.sqrt(2) * y)),
+            (StandardStudent(1.0), np.log(np.arctan(1 / y) / np.pi)),
+            (StandardStudent(2.0), -np.log(root) - np.log(root + y)),
+        ]
+        for base, expected in cases:
+            np.testing.assert_allclose(base.logcdf(-y), expected, rtol=1e-13)
+        self.assertEqual(StandardGennorm(2.0).logcdf(-np.inf), -np.inf)
+        self.assertEqual(StandardStudent(3.0).logcdf(-np.inf), -np.inf)
+
+        self.assertAlmostEqual(tpgennorm(sigma1=1.0, sigma2=1.0, shape=2.0).logcdf(-50.0), -2505.177735029, places=8)
+        # cdf(z) ~ K |z|^(-nu), K = 2 sqrt(3) / pi for nu = 3
+        expected = np.log(2 * np.sqrt(3) / np.pi) - 3 * np.log(1e200)
+        self.assertAlmostEqual(tpstudent(sigma1=1.0, sigma2=1.0, shape=3.0).logcdf(-1e200), expected, places=8)
+        self.assertAlmostEqual(tpstudent(sigma1=1.0, sigma2=1.0, shape=3.0).logsf(1e200), expected, places=8)
+
+    @parameterized.expand([
+        [0.5],
+        [1.0],
+        [2.5],
+        [5.0], ])
+    def test_student_lower_tail(self, nu):
+        q = np.logspace(-300, -100, 201)
+        x = student_ppf(q, nu)
+        # cdf(x) ~ K |x|^(-nu), whose relative error is of order |x|^(-2) in the far tail
+        log_k = gammaln((nu + 1) / 2) + (nu / 2 - 1) * np.log(nu) - gammaln(nu / 2) - 0.5 * np.log(np.pi)
+        with np.errstate(over='ignore'):
+            expected = -np.exp((log_k - np.log(q)) / nu)
+        np.testing.assert_allclose(x, expected, rtol=1e-12)
+        self.assertEqual(student_ppf(0.0, nu), -np.inf)
+        self.assertEqual(student_ppf(1e-320, 0.5), -np.inf)
+
+    @parameterized.expand([
+        [dtpstudent, scipy.stats.t],
+        [dtpgennorm, scipy.stats.gennorm], ])
+    def test_double_agrees_with_scipy_path(self, dist, f):
+        z = dist(loc=0.5, sigma1=0.5, sigma2=3.0, shape1=1.5, shape2=6.0)
+        f1, f2 = f(1.5), f(6.0)
+        x = np.linspace(-20, 20, 401)
+        q = np.linspace(0.001, 0.999, 401)
+
+        np.testing.assert_allclose(z.pdf(x), pdf_tpd_generic(x, f1.pdf, f2.pdf, 0.5, 0.5, 3.0, z.epsilon), rtol=1e-12)
+        np.testing.assert_allclose(z.cdf(x), cdf_tpd_generic(x, f1.cdf, f2.cdf, 0.5, 0.5, 3.0, z.epsilon), rtol=1e-12)
+        np.testing.assert_allclose(z.ppf(q), qqf_tpd_generic(q, f1.ppf, f2.ppf, 0.5, 0.5, 3.0, z.epsilon), rtol=1e-10)
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
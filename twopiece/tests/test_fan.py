@@ -0,0 +1,69 @@
+import os
+import tempfile
+import unittest
+
+import numpy as np
+
+from twopiece.fan import fan_chart, fan_chart_from_table, read_fan_parameters, read_fan_history, PERCENTILES
+from twopiece.scale import tpnorm
+
+TABLE = ('Date,Mode,Uncertainty,Skewness\n'
+         '2022Q1,2.0,0.6,0.1\n'
+         '2022Q2,1.8,0.9,0.25\n'
+         '2022Q3,1.5,1.1,-0.3\n')
+
+
+class TestFan(unittest.TestCase):
+
+    def test_fan_chart(self):
+        mode = np.array([2.0, 1.8, 1.5])
+        uncertainty = np.array([0.6, 0.9, 1.1])
+        skewness = np.array([0.1, 0.25, -0.3])
+        quantiles = fan_chart(mode, uncertainty, skewness)
+        self.assertEqual(quantiles.shape, (3, len(PERCENTILES)))
+        for i in range(3):
+            dist = tpnorm(loc=mode[i], sigma=uncertainty[i], gamma=skewness[i], kind='boe')
+            np.testing.assert_allclose(quantiles[i], dist.ppf(np.array(PERCENTILES) / 100), rtol=1e-12)
+        self.assertTrue((np.diff(quantiles, axis=-1) > 0).all())
+
+    def test_scenarios(self):
+        rng = np.random.default_rng(0)
+        mode = rng.normal(2.0, 0.5, (50, 12))
+        quantiles = fan_chart(mode, np.linspace(0.5, 1.5, 12), 0.2, percentiles=(10, 50, 90))
+        self.assertEqual(quantiles.shape, (50, 12, 3))
+        np.testing.assert_allclose(quantiles[7, 3], fan_chart(mode[7, 3], 0.5 + 3 / 11, 0.2, (10, 50, 90)))
+        self.assertRaises(ValueError, fan_chart, mode, 1.0, 0.0, percentiles=(0, 50))
+
+    def test_from_table(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'fan_parameters.csv')
+            with open(path, 'w') as file:
+                file.write(TABLE)
+            dates, quantiles = fan_chart_from_table(path, percentiles=(5, 50, 95))
+        self.assertEqual(list(dates), ['2022Q1', '2022Q2', '2022Q3'])
+        np.testing.assert_allclose(quantiles, fan_chart([2.0, 1.8, 1.5], [0.6, 0.9, 1.1], [0.1, 0.25, -0.3],
+                                                        (5, 50, 95)))
+
+        table = {'mode': [2.0], 'sigma': [0.6], 'gamma': [0.1]}
+        parameters = read_fan_parameters(table, columns={'mode': 'mode', 'uncertainty': 'sigma', 'skewness': 'gamma'})
+        self.assertIsNone(parameters['date'])
+        self.assertRaises(ValueError, read_fan_parameters, table)
+
+    def test_shipped_tables(self):
+        dates, quantiles = fan_chart_from_table()
+        parameters = read_fan_parameters()
+        self.assertEqual(dates[0], '2019-10-01')
+        self.assertEqual(quantiles.shape, (13, len(PERCENTILES)))
+        np.testing.assert_allclose(quantiles, fan_chart(parameters['mode'], parameters['uncertainty'],
+                                                        parameters['skewness']))
+        # the November 2019 projections are symmetric: the median is the mode
+        np.testing.assert_allclose(quantiles[:, PERCENTILES.index(50)], parameters['mode'], rtol=1e-12)
+
+        history = read_fan_history()
+        self.assertEqual(history['date'].shape, history['value'].shape)
+        self.assertTrue(history['date'][-1] < dates[0])
+        self.assertTrue(np.isfinite(history['value']).all())
+
+
+if __name__ == '__main__':
+    unittest.main()
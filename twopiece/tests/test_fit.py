@@ -0,0 +1,92 @@
+import unittest
+from unittest import mock
+
+import numpy as np
+import scipy.stats
+from parameterized import parameterized
+from scipy.optimize import approx_fprime, minimize
+
+from twopiece.fit import score_for, loglikelihood_tpd, fit_tpd, fit_tpnorm
+from twopiece.scale import tpnorm, tplaplace, tpstudent, tpgennorm
+from twopiece.double import dtpstudent, dtpsas
+from twopiece.shape import tpshagennorm
+from twopiece.sinharcsinh import ssas
+
+
+class TestFit(unittest.TestCase):
+
+    @parameterized.expand([
+        [scipy.stats.norm, None, None],
+        [scipy.stats.cauchy, None, None],
+        [scipy.stats.t, 3.0, 7.0],
+        [scipy.stats.gennorm, 1.5, 2.5],
+        [ssas, 0.8, 1.4], ])
+    def test_gradient(self, f, shape1, shape2):
+        x = np.random.RandomState(0).standard_normal(200) * 1.3 + 0.2
+        score = score_for(f)
+        params = np.array([0.1, 0.9, 1.7] + ([] if shape1 is None else [shape1, shape2]))
+
+        def value(p):
+            shapes = (None, None) if shape1 is None else p[3:]
+            return loglikelihood_tpd(x, score, score, p[0], p[1], p[2], *shapes)[0]
+
+        gradient = loglikelihood_tpd(x, score, score, *params[:3], *(() if shape1 is None else params[3:]))[1]
+        np.testing.assert_allclose(gradient, approx_fprime(params, value, 1e-7), rtol=1e-4, atol=1e-3)
+
+    def test_loglikelihood_matches_logpdf(self):
+        x = np.linspace(-5, 5, 101)
+        dist = dtpstudent(loc=0.1, sigma1=0.9, sigma2=1.7, shape1=3.0, shape2=7.0)
+        score = score_for(scipy.stats.t)
+        self.assertAlmostEqual(loglikelihood_tpd(x, score, score, 0.1, 0.9, 1.7, 3.0, 7.0)[0], dist.logpdf(x).sum())
+
+    @parameterized.expand([
+        [tpnorm(loc=0.5, sigma1=1.0, sigma2=2.0), 0.05],
+        [tplaplace(loc=0.5, sigma1=1.0, sigma2=2.0), 0.05],
+        [tpstudent(loc=0.5, sigma1=1.0, sigma2=2.0, shape=5.0), 0.1],
+        [tpgennorm(loc=0.5, sigma1=1.0, sigma2=2.0, shape=1.5), 0.1],
+        [dtpstudent(loc=0.5, sigma1=1.0, sigma2=2.0, shape1=3.0, shape2=8.0), 0.2],
+        [dtpsas(loc=0.5, sigma1=1.0, sigma2=2.0, shape1=0.8, shape2=1.2), 0.1],
+        [tpshagennorm(loc=0.5, sigma=1.5, shape1=1.5, shape2=2.5), 0.1], ])
+    def test_recovers_parameters(self, dist, rtol):
+        np.random.seed(1)
+        data = dist.random_sample(50000)
+        params = dist.fit(data)
+
+        for name, value in params.items():
+            expected = getattr(dist, 'sigma1' if name == 'sigma' else name)
+            self.assertLess(abs(value - expected), rtol * max(abs(expected), 1.0), name)
+
+    def test_profile_tpnorm_matches_direct_fit(self):
+        np.random.seed(2)
+        data = tpnorm(loc=-1.0, sigma1=0.5, sigma2=2.0).random_sample(5000)
+        profile = fit_tpnorm(data)
+        direct = fit_tpd(data, scipy.stats.norm, scipy.stats.norm, 0.0, 1.0, 1.0)[:3]
+        np.testing.assert_allclose(profile, direct, rtol=1e-3, atol=1e-3)
+
+    def test_starts_from_the_data(self):
+        np.random.seed(3)
+        data = tpnorm(loc=1000.0, sigma1=50.0, sigma2=100.0).random_sample(20000)
+        params = tpstudent(loc=0.0, sigma1=1.0, sigma2=1.0, shape=3.0).fit(data)
+
+        self.assertLess(abs(params['loc'] - 1000.0), 5.0)
+        self.assertLess(abs(params['sigma1'] - 50.0), 5.0)
+        self.assertLess(abs(params['sigma2'] - 100.0), 5.0)
+        self.assertGreater(params['shape'], 30.0)
+
+    def test_warns_without_convergence(self):
+        def truncated(*args, **kwargs):
+            return minimize(*args, **kwargs, options={'maxiter': 1})
+
+        np.random.seed(4)
+        data = tpstudent(loc=0.5, sigma1=1.0, sigma2=2.0, shape=5.0).random_sample(1000)
+        with mock.patch('twopiece.fit.minimize', truncated):
+            self.assertWarns(RuntimeWarning, tpstudent(loc=0.0, sigma1=1.0, sigma2=1.0, shape=3.0).fit, data)
+
+    def test_invalid_data(self):
+        dist = tpnorm(loc=0.0, sigma1=1.0, sigma2=1.0)
+        self.assertRaises(ValueError, dist.fit, [0.0, 1.0])
+        self.assertRaises(ValueError, dist.fit, [0.0, 1.0, np.nan])
+
+
+if __name__ == '__main__':
+    unittest.main()
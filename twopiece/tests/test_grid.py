@@ -0,0 +1,88 @@
+import unittest
+
+import numpy as np
+import scipy.stats
+from parameterized import parameterized
+
+from twopiece.grid import grid_points
+from twopiece.scale import tpnorm, tplaplace, tpstudent, tpsas
+from twopiece.double import dtpgennorm
+from twopiece.shape import tpshasas
+from twopiece.sinharcsinh import sinhasinh
+from twopiece.utils import _on_grid
+
+
+def counting(dist):
+    evaluated = []
+    grid_values = dist._grid_values
+
+    def spy(name, x, out):
+        evaluated.append(x.size)
+        return grid_values(name, x, out)
+
+    dist._grid_values = spy
+    return evaluated
+
+
+class TestGrid(unittest.TestCase):
+
+    @parameterized.expand([
+        [tpnorm(loc=0.3, sigma1=1.0, sigma2=2.0)],
+        [tplaplace(loc=0.3, sigma1=1.0, sigma2=2.0)],
+        [tpstudent(loc=0.3, sigma1=1.0, sigma2=2.0, shape=3.0)],
+        [tpsas(loc=0.3, sigma1=1.0, sigma2=2.0, shape=0.8)],
+        [dtpgennorm(loc=0.3, sigma1=1.0, sigma2=2.0, shape1=1.5, shape2=3.0)],
+        [tpshasas(loc=0.3, sigma=1.0, shape1=0.7, shape2=1.4)],
+        [sinhasinh(loc=0.3, scale=2.0, delta=0.8, epsilon=0.3)], ])
+    def test_matches_pointwise(self, dist):
+        for start, step, num in [(-10, 0.01, 2000), (-10, 0.005, 4000), (-12, 0.005, 4800), (-3, 0.0025, 100),
+                                 (0.3, 0.1, 5)]:
+            x = grid_points(start, step, num)
+            np.testing.assert_allclose(dist.pdf_grid(start, step, num), dist.pdf(x), rtol=1e-13, atol=1e-16)
+            np.testing.assert_allclose(dist.cdf_grid(start, step, num), dist.cdf(x), rtol=1e-13, atol=1e-16)
+
+    def test_refinement_reuses_values(self):
+        dist = tpnorm(loc=0.3, sigma1=1.0, sigma2=2.0)
+        evaluated = counting(dist)
+
+        def count(grid, start, step, num):
+            before = sum(evaluated)
+            values = grid(start, step, num)
+            return values, sum(evaluated) - before
+
+        first, n = count(dist.pdf_grid, -10, 0.01, 2000)
+        self.assertEqual(n, 2000)
+        self.assertIs(dist.pdf_grid(-10, 0.01, 2000), first)
+        refined, n = count(dist.pdf_grid, -10, 0.005, 4000)
+        self.assertEqual(n, 2000)
+        np.testing.assert_array_equal(refined[::2], first)
+        self.assertFalse(refined.flags.writeable)
+        self.assertEqual(count(dist.pdf_grid, -12, 0.005, 4800)[1], 800)
+        self.assertEqual(count(dist.pdf_grid, -11, 0.005, 10)[1], 0)
+        self.assertEqual(count(dist.pdf_grid, -11, 0.00125, 100)[1], 90)
+
+        dist.loc = 0.5
+        self.assertEqual(count(dist.pdf_grid, -11, 0.00125, 100)[1], 100)
+        self.assertEqual(count(dist.cdf_grid, -11, 0.00125, 100)[1], 100)
+        self.assertEqual(count(dist.pdf_grid, -11, 0.003, 100)[1], 100)
+
+    def test_invalid(self):
+        dist = tpnorm(loc=0.3, sigma1=1.0, sigma2=2.0)
+        self.assertRaises(ValueError, dist.pdf_grid, 0.0, -0.1, 10)
+        self.assertRaises(ValueError, dist.pdf_grid, 0.0, 0.1, 0)
+        batch = tpnorm(loc=np.zeros(3), sigma1=1.0, sigma2=2.0)
+        self.assertRaises(ValueError, batch.cdf_grid, 0.0, 0.1, 10)
+
+    def test_plotting_fallback(self):
+        dist = tpnorm(loc=0.3, sigma1=1.0, sigma2=2.0)
+        x, y = _on_grid(dist, 'pdf', -10, 0.01, 2000)
+        self.assertIs(y, dist.pdf_grid(-10, 0.01, 2000))
+        np.testing.assert_allclose(x, grid_points(-10, 0.01, 2000))
+
+        batch = tpnorm(loc=np.array([0.3]), sigma1=1.0, sigma2=2.0)
+        np.testing.assert_allclose(_on_grid(batch, 'cdf', -10, 0.01, 2000)[1], batch.cdf(x))
+        np.testing.assert_allclose(_on_grid(scipy.stats.norm, 'pdf', -10, 0.01, 2000)[1], scipy.stats.norm.pdf(x))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,18 @@
+import subprocess
+import sys
+import unittest
+
+CORE = 'twopiece.scale, twopiece.double, twopiece.shape, twopiece.sinharcsinh, twopiece.fit, twopiece.batch'
+
+
+class TestImport(unittest.TestCase):
+
+    def test_no_plotting_modules_at_import(self):
+        code = (f'import sys, {CORE}; '
+                f'print(sorted(m for m in ("matplotlib", "seaborn") if m in sys.modules))')
+        output = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, check=True)
+        self.assertEqual(output.stdout.strip(), '[]')
+
+
+if __name__ == '__main__':
+    unittest.main()
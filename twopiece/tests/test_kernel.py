@@ -0,0 +1,67 @@
+import unittest
+
+import numpy as np
+import scipy.stats
+from parameterized import parameterized
+
+from twopiece.kernel import two_piece
+from twopiece.scale import pdf_tp_generic, cdf_tp_generic, qqf_tp_generic, tpstudent
+from twopiece.double import pdf_tpd_generic, cdf_tpd_generic, qqf_tpd_generic, dtpstudent, dtpgennorm
+
+
+class TestKernel(unittest.TestCase):
+
+    def test_two_piece_matches_masks(self):
+        x = np.linspace(-4, 4, 41)
+        left = x < 0.5
+        expected = np.where(left, 1.0 + 2.0 * np.tanh((x - 0.5) / 3.0), -1.0 + 0.5 * np.sin((x - 0.5) / 0.2))
+
+        np.testing.assert_allclose(two_piece(x, left, np.tanh, (0.5, 3.0, 1.0, 2.0), np.sin, (0.5, 0.2, -1.0, 0.5)),
+                                   expected)
+
+        out = np.empty_like(x)
+        result = two_piece(x, left, np.tanh, (0.5, 3.0, 1.0, 2.0), np.sin, (0.5, 0.2, -1.0, 0.5), out=out)
+        self.assertIs(result, out)
+        np.testing.assert_allclose(out, expected)
+
+    @parameterized.expand([
+        [0.0, 1.0, 1.0],
+        [1.0, 0.5, 2.0],
+        [-2.0, 3.0, 0.25], ])
+    def test_generic_functions_match_scalar_path(self, loc, sigma1, sigma2):
+        norm, t3, t8 = scipy.stats.norm, scipy.stats.t(3), scipy.stats.t(8)
+        epsilon = sigma1 * t8.pdf(0) / (sigma1 * t8.pdf(0) + sigma2 * t3.pdf(0))
+        x = np.linspace(-6, 6, 25)
+        q = np.linspace(0.0, 1.0, 25)
+
+        cases = [
+            (pdf_tp_generic, x, (norm.pdf, loc, sigma1, sigma2)),
+            (cdf_tp_generic, x, (norm.cdf, loc, sigma1, sigma2)),
+            (qqf_tp_generic, q, (norm.ppf, loc, sigma1, sigma2)),
+            (pdf_tpd_generic, x, (t3.pdf, t8.pdf, loc, sigma1, sigma2, epsilon)),
+            (cdf_tpd_generic, x, (t3.cdf, t8.cdf, loc, sigma1, sigma2, epsilon)),
+            (qqf_tpd_generic, q, (t3.ppf, t8.ppf, loc, sigma1, sigma2, epsilon)),
+        ]
+        for function, values, args in cases:
+            out = np.empty(values.shape)
+            function(values, *args, out=out)
+            np.testing.assert_allclose(out, [function(v, *args) for v in values], rtol=1e-12)
+
+    @parameterized.expand([
+        [tpstudent(loc=np.array([0.0, 1.0]), sigma1=1.0, sigma2=2.0, shape=3.0)],
+        [dtpstudent(loc=np.array([0.0, 1.0]), sigma1=1.0, sigma2=2.0, shape1=3.0, shape2=5.0)],
+        [dtpgennorm(loc=np.array([0.0, 1.0]), sigma1=1.0, sigma2=2.0, shape1=1.5, shape2=3.0)], ])
+    def test_array_parameters_at_the_ends_of_the_support(self, dist):
+        q = np.array([[0.0], [1.0]])
+        x = np.array([[-np.inf], [np.inf]])
+        infinite = np.array([[-np.inf, -np.inf], [np.inf, np.inf]])
+        np.testing.assert_array_equal(dist.ppf(q), infinite)
+        np.testing.assert_array_equal(dist.isf(q), -infinite)
+        np.testing.assert_array_equal(dist.cdf(x), [[0.0, 0.0], [1.0, 1.0]])
+        np.testing.assert_array_equal(dist.pdf(x), np.zeros((2, 2)))
+        np.testing.assert_array_equal(dist.logsf(-1e200), [0.0, 0.0])
+        np.testing.assert_array_equal(dist.logcdf(1e200), [0.0, 0.0])
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
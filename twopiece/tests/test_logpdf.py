@@ -0,0 +1,50 @@
+import unittest
+
+import numpy as np
+from parameterized import parameterized
+
+from twopiece.scale import tpnorm, tplaplace, tpstudent, tpgennorm, tpsas
+from twopiece.double import dtpstudent, dtpgennorm, dtpsas
+from twopiece.shape import tpshastudent
+from twopiece.sinharcsinh import sinhasinh
+
+
+class TestLogPdf(unittest.TestCase):
+
+    @parameterized.expand([
+        [tpnorm(loc=0.5, sigma1=0.5, sigma2=3.0)],
+        [tplaplace(loc=0.0, sigma1=2.0, sigma2=1.0)],
+        [tpstudent(loc=0.0, sigma1=1.0, sigma2=2.0, shape=4.0)],
+        [tpgennorm(loc=-1.0, sigma1=1.0, sigma2=0.5, shape=1.5)],
+        [tpsas(loc=0.0, sigma1=1.0, sigma2=2.0, shape=0.7)],
+        [dtpstudent(loc=0.0, sigma1=1.0, sigma2=2.0, shape1=3.0, shape2=6.0)],
+        [dtpgennorm(loc=0.5, sigma1=0.5, sigma2=3.0, shape1=1.5, shape2=2.5)],
+        [dtpsas(loc=0.0, sigma1=2.0, sigma2=1.0, shape1=0.7, shape2=1.5)],
+        [tpshastudent(loc=0.0, sigma=1.0, shape1=3.0, shape2=8.0)],
+        [sinhasinh(loc=0.0, scale=1.5, delta=0.8, epsilon=0.3)], ])
+    def test_consistent_with_pdf_cdf_ppf(self, dist):
+        x = np.linspace(-6, 6, 61)
+        q = np.linspace(0.01, 0.99, 99)
+
+        np.testing.assert_allclose(dist.logpdf(x), np.log(dist.pdf(x)), rtol=1e-10, atol=1e-12)
+        np.testing.assert_allclose(dist.logcdf(x), np.log(dist.cdf(x)), rtol=1e-10, atol=1e-12)
+        np.testing.assert_allclose(dist.sf(x), 1 - dist.cdf(x), rtol=1e-10, atol=1e-12)
+        np.testing.assert_allclose(dist.logsf(x), np.log(dist.sf(x)), rtol=1e-10, atol=1e-12)
+        np.testing.assert_allclose(dist.isf(q), dist.ppf(1 - q), rtol=1e-10, atol=1e-12)
+
+        self.assertAlmostEqual(dist.logpdf(0.3), np.log(dist.pdf(0.3)), places=12)
+        self.assertAlmostEqual(dist.isf(0.3), dist.ppf(0.7), places=12)
+
+    @parameterized.expand([
+        [tpnorm(loc=0.0, sigma1=1.0, sigma2=2.0)],
+        [sinhasinh(loc=0.0, scale=1.0, delta=1.0, epsilon=0.5)], ])
+    def test_tails_are_finite(self, dist):
+        self.assertTrue(np.isfinite(dist.logpdf(np.array([-100.0, 200.0]))).all())
+        self.assertTrue(np.isfinite(dist.logcdf(np.array([-40.0, -60.0]))).all())
+        self.assertTrue(np.isfinite(dist.logsf(np.array([80.0, 120.0]))).all())
+        self.assertGreater(dist.sf(np.array([20.0]))[0], 0.0)
+        self.assertGreater(dist.isf(np.array([1e-20]))[0], dist.ppf(np.array([1 - 1e-15]))[0])
+
+
+if __name__ == '__main__':
+    unittest.main()
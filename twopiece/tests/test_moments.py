@@ -0,0 +1,69 @@
+import unittest
+
+import numpy as np
+import scipy.stats
+from parameterized import parameterized
+
+from twopiece.scale import tpnorm, tplaplace, tplogistic, tpcauchy, tpstudent, tpgennorm, tpsas
+from twopiece.double import dtpstudent, dtpgennorm, dtpsas
+from twopiece.shape import tpshastudent, tpshagennorm, tpshasas
+
+
+def numerical_stats(dist):
+    # Moments by quadrature of the two pieces of the density
+    def moment(k):
+        left = scipy.integrate.quad(lambda x: (x - dist.loc) ** k * dist.pdf(x), -np.inf, dist.loc)[0]
+        right = scipy.integrate.quad(lambda x: (x - dist.loc) ** k * dist.pdf(x), dist.loc, np.inf)[0]
+        return left + right
+
+    m1, m2, m3, m4 = (moment(k) for k in (1, 2, 3, 4))
+    var = m2 - m1 ** 2
+    return (dist.loc + m1, var, (m3 - 3 * m1 * m2 + 2 * m1 ** 3) / var ** 1.5,
+            (m4 - 4 * m1 * m3 + 6 * m1 ** 2 * m2 - 3 * m1 ** 4) / var ** 2 - 3)
+
+
+class TestMoments(unittest.TestCase):
+
+    @parameterized.expand([
+        [tpnorm(loc=0.5, sigma1=1.0, sigma2=2.0)],
+        [tplaplace(loc=0.5, sigma1=1.0, sigma2=2.0)],
+        [tplogistic(loc=0.5, sigma1=1.0, sigma2=2.0)],
+        [tpstudent(loc=0.5, sigma1=1.0, sigma2=2.0, shape=7.0)],
+        [tpgennorm(loc=0.5, sigma1=1.0, sigma2=2.0, shape=1.5)],
+        [tpsas(loc=0.5, sigma1=1.0, sigma2=2.0, shape=0.8)],
+        [dtpstudent(loc=0.5, sigma1=1.0, sigma2=2.0, shape1=6.0, shape2=9.0)],
+        [dtpgennorm(loc=0.5, sigma1=1.0, sigma2=2.0, shape1=1.5, shape2=3.0)],
+        [dtpsas(loc=0.5, sigma1=1.0, sigma2=2.0, shape1=0.8, shape2=1.4)],
+        [tpshastudent(loc=0.5, sigma=1.0, shape1=6.0, shape2=9.0)],
+        [tpshagennorm(loc=0.5, sigma=1.0, shape1=1.5, shape2=3.0)],
+        [tpshasas(loc=0.5, sigma=1.0, shape1=0.8, shape2=1.4)], ])
+    def test_stats(self, dist):
+        mean, var, skew, kurtosis = dist.stats('mvsk')
+        np.testing.assert_allclose((mean, var, skew, kurtosis), numerical_stats(dist), rtol=1e-6, atol=1e-9)
+        self.assertEqual(dist.mean(), mean)
+        self.assertAlmostEqual(dist.std() ** 2, var)
+        self.assertEqual(dist.stats('k'), kurtosis)
+
+    def test_boe_mean(self):
+        dist = tpnorm(loc=1.0, sigma=0.8, gamma=0.3, kind='boe')
+        self.assertAlmostEqual(dist.mean(), 1.3)
+
+    @parameterized.expand([
+        [tpstudent(loc=0.0, sigma1=1.0, sigma2=1.0, shape=1.5), scipy.stats.t(1.5)],
+        [tpstudent(loc=0.0, sigma1=1.0, sigma2=1.0, shape=3.5), scipy.stats.t(3.5)],
+        [tpcauchy(loc=0.0, sigma1=1.0, sigma2=1.0), scipy.stats.cauchy], ])
+    def test_undefined_moments(self, dist, reference):
+        np.testing.assert_allclose(dist.stats('mvsk'), reference.stats(moments='mvsk'), rtol=1e-12)
+
+    def test_broadcast(self):
+        sigma1 = np.array([1.0, 2.0, 0.5])
+        shape = np.array([[4.0], [8.0]])
+        batch = dtpsas(loc=0.0, sigma1=sigma1, sigma2=1.0, shape1=shape, shape2=1.2)
+        mean, var = batch.stats()
+        self.assertEqual(mean.shape, (2, 3))
+        single = dtpsas(loc=0.0, sigma1=2.0, sigma2=1.0, shape1=8.0, shape2=1.2)
+        self.assertAlmostEqual(var[1, 1], single.var())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,52 @@
+import unittest
+
+import numpy as np
+from parameterized import parameterized
+
+from twopiece.params import ScaleParams, ScaleShapeParams, DoubleParams, ShapeParams, SinhArcsinhParams
+from twopiece.scale import TwoPieceScale, tpnorm, tplaplace, tpstudent, tpsas
+from twopiece.double import dtpstudent, dtpgennorm
+from twopiece.shape import tpshastudent
+from twopiece.sinharcsinh import sinhasinh
+
+
+class TestParams(unittest.TestCase):
+
+    @parameterized.expand([
+        [tpnorm(loc=0.5, sigma1=1.0, sigma2=2.0)],
+        [tplaplace(loc=0.5, sigma=1.0, gamma=0.5, kind='boe')],
+        [tpstudent(loc=0.5, sigma1=1.0, sigma2=2.0, shape=4.0)],
+        [tpsas(loc=0.5, sigma1=1.0, sigma2=2.0, shape=0.7)],
+        [dtpstudent(loc=0.5, sigma1=1.0, sigma2=2.0, shape1=3.0, shape2=8.0)],
+        [dtpgennorm(loc=0.5, sigma1=1.0, sigma2=2.0, shape1=1.5, shape2=2.5)],
+        [tpshastudent(loc=0.5, sigma=1.5, shape1=3.0, shape2=8.0)],
+        [sinhasinh(loc=0.5, scale=2.0, delta=0.8, epsilon=0.4)], ])
+    def test_from_params(self, dist):
+        copy = type(dist).from_params(dist.params)
+        x = np.linspace(-5, 5, 21)
+
+        self.assertIs(type(copy), type(dist))
+        self.assertEqual(copy.params, dist.params)
+        np.testing.assert_array_equal(copy.pdf(x), dist.pdf(x))
+        np.testing.assert_array_equal(copy.ppf(np.linspace(0.1, 0.9, 5)), dist.ppf(np.linspace(0.1, 0.9, 5)))
+
+    def test_containers(self):
+        params = DoubleParams(0.0, 1.0, 2.0, 3.0, 8.0)
+        self.assertFalse(hasattr(params, '__dict__'))
+        self.assertRaises(AttributeError, setattr, params, 'loc', 1.0)
+        self.assertEqual(params._replace(loc=1.0).loc, 1.0)
+        self.assertEqual(ScaleParams(0.0, np.array([1.0, 2.0]), 1.0).sigma2, 1.0)
+
+        self.assertRaises(ValueError, ScaleParams, 0.0, -1.0, 1.0)
+        self.assertRaises(ValueError, ScaleParams, 0.0, np.array([1.0, 0.0]), 1.0)
+        self.assertRaises(ValueError, ScaleShapeParams, 0.0, 1.0, 1.0, 0.0)
+        self.assertRaises(ValueError, DoubleParams, 0.0, 1.0, 1.0, 3.0, -3.0)
+        self.assertRaises(ValueError, ShapeParams, 0.0, 0.0, 3.0, 3.0)
+        self.assertRaises(ValueError, SinhArcsinhParams, 0.0, 1.0, -1.0, 0.0)
+
+    def test_generic_classes(self):
+        self.assertRaises(TypeError, TwoPieceScale.from_params, ScaleParams(0.0, 1.0, 1.0))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,93 @@
+import unittest
+
+import numpy as np
+from parameterized import parameterized
+
+from twopiece import scale
+from twopiece.kernel import BLOCK_SIZE
+from twopiece.profiling import profile, snapshot, is_enabled
+from twopiece.scale import tpnorm, tpsas, TwoPieceScale
+from twopiece.double import dtpgennorm
+from twopiece.shape import tpshastudent
+from twopiece.sinharcsinh import sinhasinh
+
+
+class TestProfiling(unittest.TestCase):
+
+    def test_records(self):
+        x = np.linspace(-3, 3, 1000)
+        with profile() as stats:
+            dist = tpnorm(loc=0.5, sigma1=1.0, sigma2=2.0)
+            dist.pdf(x)
+            dist.pdf(0.3)
+            dist.random_sample(100, random_state=1)
+        self.assertEqual(stats['tpnorm.init']['calls'], 1)
+        self.assertEqual(stats['tpnorm.pdf']['calls'], 2)
+        self.assertEqual(stats['tpnorm.pdf']['elements'], 1001)
+        self.assertEqual(stats['scale.pdf_tp_generic']['calls'], 2)
+        self.assertEqual(stats['tpnorm.random_sample']['elements'], 100)
+        self.assertIn('base.StandardNormal.pdf', stats)
+        for record in stats.values():
+            self.assertLessEqual(record['self_time'], record['time'] + 1e-12)
+            self.assertEqual(record['peak_memory'], 0)
+        pdf = stats['tpnorm.pdf']
+        generic = stats['scale.pdf_tp_generic']
+        self.assertAlmostEqual(pdf['time'] - pdf['self_time'], generic['time'], delta=1e-9)
+
+    @parameterized.expand([
+        [lambda: tpsas(loc=0.5, sigma1=1.0, sigma2=2.0, shape=0.8), 'tpsas'],
+        [lambda: dtpgennorm(loc=0.5, sigma1=1.0, sigma2=2.0, shape1=1.5, shape2=3.0), 'dtpgennorm'],
+        [lambda: tpshastudent(loc=0.5, sigma=1.0, shape1=3.0, shape2=6.0), 'tpshastudent'],
+        [lambda: sinhasinh(loc=0.5, scale=2.0, delta=1.5, epsilon=0.2), 'sinhasinh'],
+    ])
+    def test_families(self, make, family):
+        q = np.linspace(0.01, 0.99, 50)
+        with profile() as stats:
+            make().ppf(q)
+        self.assertEqual(stats[f'{family}.init']['calls'], 1)
+        self.assertEqual(stats[f'{family}.ppf']['elements'], 50)
+
+    def test_blockwise_base_calls(self):
+        x = np.linspace(-3, 3, 3 * BLOCK_SIZE + 5)
+        dist = tpnorm(loc=0.5, sigma1=1.0, sigma2=2.0)
+        with profile() as stats:
+            dist.pdf(x)
+        self.assertEqual(stats['base.StandardNormal.pdf']['calls'], 4)
+        self.assertEqual(stats['base.StandardNormal.pdf']['elements'], x.size)
+
+    def test_memory(self):
+        x = np.linspace(-3, 3, 10 ** 5)
+        dist = tpnorm(loc=0.5, sigma1=1.0, sigma2=2.0)
+        with profile(memory=True) as stats:
+            dist.pdf(x)
+        self.assertGreaterEqual(stats['tpnorm.pdf']['peak_memory'], x.nbytes)
+        self.assertGreaterEqual(stats['tpnorm.pdf']['peak_memory'], stats['scale.pdf_tp_generic']['peak_memory'])
+
+    def test_disabled(self):
+        pdf, generic = TwoPieceScale.pdf, scale.pdf_tp_generic
+        with self.assertRaises(AssertionError):
+            with profile():
+                self.assertIsNot(TwoPieceScale.pdf, pdf)
+                tpnorm(loc=0.5, sigma1=-1.0, sigma2=2.0).pdf(0.3)
+        self.assertFalse(is_enabled())
+        self.assertIs(TwoPieceScale.pdf, pdf)
+        self.assertIs(scale.pdf_tp_generic, generic)
+
+        records = snapshot()
+        tpnorm(loc=0.5, sigma1=1.0, sigma2=2.0).pdf(0.3)
+        self.assertEqual(snapshot(), records)
+
+    def test_nested(self):
+        with profile() as stats:
+            tpnorm(loc=0.5, sigma1=1.0, sigma2=2.0).pdf(0.3)
+            with self.assertRaises(RuntimeError):
+                with profile():
+                    pass
+            self.assertTrue(is_enabled())
+            tpnorm(loc=0.5, sigma1=1.0, sigma2=2.0).pdf(0.3)
+        self.assertEqual(stats['tpnorm.pdf']['calls'], 2)
+        self.assertFalse(is_enabled())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,67 @@
+import unittest
+
+import numpy as np
+import scipy.integrate
+from parameterized import parameterized
+
+from twopiece.scale import tpnorm, tplaplace, tplogistic, tpcauchy, tpstudent, tpgennorm, tpsas
+from twopiece.double import dtpstudent, dtpgennorm
+from twopiece.shape import tpshasas
+
+
+def numerical_expected_shortfall(dist, alpha, tail):
+    if tail == 'lower':
+        x = dist.ppf(alpha)
+        return -scipy.integrate.quad(lambda t: t * dist.pdf(t), -np.inf, x, limit=200)[0] / alpha
+    x = dist.isf(alpha)
+    return scipy.integrate.quad(lambda t: t * dist.pdf(t), x, np.inf, limit=200)[0] / alpha
+
+
+class TestRisk(unittest.TestCase):
+
+    @parameterized.expand([
+        [tpnorm(loc=0.5, sigma1=1.0, sigma2=2.0)],
+        [tplaplace(loc=0.5, sigma1=1.0, sigma2=2.0)],
+        [tplogistic(loc=0.5, sigma1=1.0, sigma2=2.0)],
+        [tpstudent(loc=0.5, sigma1=1.0, sigma2=2.0, shape=4.0)],
+        [tpgennorm(loc=0.5, sigma1=1.0, sigma2=2.0, shape=1.5)],
+        [tpsas(loc=0.5, sigma1=1.0, sigma2=2.0, shape=0.8)],
+        [dtpstudent(loc=0.5, sigma1=1.0, sigma2=2.0, shape1=3.0, shape2=6.0)],
+        [dtpgennorm(loc=0.5, sigma1=1.0, sigma2=2.0, shape1=1.5, shape2=3.0)],
+        [tpshasas(loc=0.5, sigma=1.0, shape1=0.8, shape2=1.4)], ])
+    def test_expected_shortfall(self, dist):
+        alpha = np.array([0.01, 0.2, 0.6])
+        for tail in ('lower', 'upper'):
+            expected = [numerical_expected_shortfall(dist, a, tail) for a in alpha]
+            np.testing.assert_allclose(dist.expected_shortfall(alpha, tail), expected, rtol=1e-7)
+            self.assertAlmostEqual(dist.expected_shortfall(0.01, tail), expected[0], places=7)
+        self.assertAlmostEqual(dist.value_at_risk(0.05), -dist.ppf(0.05))
+        self.assertAlmostEqual(dist.value_at_risk(0.05, tail='upper'), dist.ppf(0.95))
+        self.assertTrue(dist.expected_shortfall(0.05) > dist.value_at_risk(0.05))
+
+    def test_undefined_mean(self):
+        self.assertEqual(tpcauchy(loc=0.0, sigma1=1.0, sigma2=1.0).expected_shortfall(0.05), np.inf)
+        # the left tail has a mean even though the right one does not
+        dist = dtpstudent(loc=0.5, sigma1=1.0, sigma2=2.0, shape1=3.0, shape2=0.8)
+        self.assertAlmostEqual(dist.expected_shortfall(0.7), numerical_expected_shortfall(dist, 0.7, 'lower'),
+                               places=7)
+        self.assertEqual(dist.expected_shortfall(0.05, tail='upper'), np.inf)
+
+    def test_broadcast(self):
+        sigma1 = np.array([[1.0], [2.0]])
+        batch = tpstudent(loc=0.0, sigma1=sigma1, sigma2=1.0, shape=5.0)
+        alpha = np.array([0.01, 0.025, 0.05])
+        es = batch.expected_shortfall(alpha)
+        self.assertEqual(es.shape, (2, 3))
+        single = tpstudent(loc=0.0, sigma1=2.0, sigma2=1.0, shape=5.0)
+        np.testing.assert_allclose(es[1], single.expected_shortfall(alpha), rtol=1e-12)
+
+    def test_parameters(self):
+        dist = tpnorm(loc=0.0, sigma1=1.0, sigma2=2.0)
+        self.assertRaises(ValueError, dist.expected_shortfall, 0.0)
+        self.assertRaises(ValueError, dist.value_at_risk, [0.5, 1.2])
+        self.assertRaises(ValueError, dist.value_at_risk, 0.05, tail='left')
+
+
+if __name__ == '__main__':
+    unittest.main()
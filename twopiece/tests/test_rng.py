@@ -0,0 +1,78 @@
+import unittest
+
+import numpy as np
+import scipy.stats
+from parameterized import parameterized
+
+from twopiece.rng import spawn_generators
+from twopiece.scale import tpnorm, tplaplace, tpcauchy, tpstudent, tpgennorm, tpsas
+from twopiece.double import dtpstudent, dtpgennorm, dtpsas
+from twopiece.shape import tpshasas
+from twopiece.sinharcsinh import sinhasinh
+
+
+class TestRandomSample(unittest.TestCase):
+
+    @parameterized.expand([
+        [tpnorm(loc=0.5, sigma1=1.0, sigma2=2.0)],
+        [tplaplace(loc=0.5, sigma1=1.0, sigma2=2.0)],
+        [tpcauchy(loc=0.5, sigma1=1.0, sigma2=2.0)],
+        [tpstudent(loc=0.5, sigma1=1.0, sigma2=2.0, shape=4.0)],
+        [tpgennorm(loc=0.5, sigma1=1.0, sigma2=2.0, shape=1.5)],
+        [tpsas(loc=0.5, sigma1=1.0, sigma2=2.0, shape=0.7)],
+        [dtpstudent(loc=0.5, sigma1=1.0, sigma2=2.0, shape1=3.0, shape2=9.0)],
+        [dtpgennorm(loc=0.5, sigma1=1.0, sigma2=2.0, shape1=1.2, shape2=3.0)],
+        [dtpsas(loc=0.5, sigma1=1.0, sigma2=2.0, shape1=0.6, shape2=1.5)],
+        [tpshasas(loc=0.5, sigma=2.0, shape1=0.6, shape2=1.5)],
+        [sinhasinh(loc=0.5, scale=2.0, delta=0.8, epsilon=0.4)], ])
+    def test_distribution(self, dist):
+        sample = dist.random_sample(20000, random_state=np.random.default_rng(0))
+        self.assertGreater(scipy.stats.kstest(sample, dist.cdf).pvalue, 1e-3)
+
+    def test_sinharcsinh_array_parameters(self):
+        dist = sinhasinh(loc=np.array([0.0, 10.0]), scale=1.0, delta=np.array([0.5, 2.0]), epsilon=0.3)
+        sample = dist.random_sample((20000, 2), random_state=5)
+        for k in range(2):
+            single = sinhasinh(loc=dist.loc[k], scale=1.0, delta=dist.delta[k], epsilon=0.3)
+            self.assertGreater(scipy.stats.kstest(sample[:, k], single.cdf).pvalue, 1e-3)
+
+    def test_random_state(self):
+        dist = tpstudent(loc=0.0, sigma1=1.0, sigma2=2.0, shape=4.0)
+
+        np.testing.assert_array_equal(dist.random_sample(10, random_state=7), dist.random_sample(10, random_state=7))
+        self.assertEqual(dist.random_sample((3, 4), random_state=np.random.RandomState(0)).shape, (3, 4))
+        np.random.seed(3)
+        first = dist.random_sample(10)
+        np.random.seed(3)
+        np.testing.assert_array_equal(first, dist.random_sample(10))
+
+    def test_spawn_generators(self):
+        dist = tpnorm(loc=0.0, sigma1=1.0, sigma2=2.0)
+        streams = [dist.random_sample(5, random_state=g) for g in spawn_generators(42, 3)]
+        again = [dist.random_sample(5, random_state=g) for g in spawn_generators(np.random.SeedSequence(42), 3)]
+
+        np.testing.assert_array_equal(streams, again)
+        self.assertFalse(np.array_equal(streams[0], streams[1]))
+        self.assertEqual(len(spawn_generators(np.random.default_rng(0), 4)), 4)
+        self.assertRaises(ValueError, spawn_generators, np.random.RandomState(0), 2)
+
+    @parameterized.expand([
+        [tpnorm(loc=0.5, sigma1=1.0, sigma2=2.0)],
+        [tpgennorm(loc=0.5, sigma1=1.0, sigma2=2.0, shape=1.5)],
+        [dtpstudent(loc=0.5, sigma1=1.0, sigma2=2.0, shape1=3.0, shape2=9.0)],
+        [sinhasinh(loc=0.5, scale=2.0, delta=0.8, epsilon=0.4)], ])
+    def test_chunked_sample(self, dist):
+        sample = dist.random_sample_chunked(50001, random_state=11, chunk_size=4096, max_workers=4)
+        again = dist.random_sample_chunked(50001, random_state=11, chunk_size=4096, max_workers=1)
+
+        np.testing.assert_array_equal(sample, again)
+        self.assertGreater(scipy.stats.kstest(sample, dist.cdf).pvalue, 1e-3)
+
+        out = np.empty((100, 50))
+        self.assertIs(dist.random_sample_chunked((100, 50), out=out, random_state=1, chunk_size=333), out)
+        self.assertRaises(ValueError, dist.random_sample_chunked, (50, 100), out=out)
+        self.assertRaises(ValueError, dist.random_sample_chunked, (50, 100), out=np.empty((100, 50)).T)
+
+
+if __name__ == '__main__':
+    unittest.main()
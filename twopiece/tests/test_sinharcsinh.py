@@ -0,0 +1,57 @@
+import importlib.util
+import unittest
+
+import numpy as np
+import scipy.stats
+from parameterized import parameterized
+
+from twopiece.backend import use_backend
+from twopiece.sinharcsinh import sinhasinh, ssas, _pdf_instance, _cdf_instance, _qqf_instance
+
+
+class TestSinhArcsinh(unittest.TestCase):
+
+    @parameterized.expand([
+        [0.0, 1.0, 1.0, 0.0],
+        [0.5, 2.0, 0.5, 0.3],
+        [-1.0, 0.7, 3.0, -0.8], ])
+    def test_array_path_matches_scalar_path(self, loc, scale, delta, epsilon):
+        dist = sinhasinh(loc=loc, scale=scale, delta=delta, epsilon=epsilon)
+        norm = scipy.stats.norm
+        x = np.linspace(-8, 8, 101)
+        q = np.linspace(0.001, 0.999, 101)
+
+        pdf = [_pdf_instance(v, norm.pdf, loc, scale, delta, epsilon) for v in x]
+        cdf = [_cdf_instance(v, norm.cdf, loc, scale, delta, epsilon) for v in x]
+        ppf = [_qqf_instance(v, norm.ppf, loc, scale, delta, epsilon) for v in q]
+
+        np.testing.assert_allclose(dist.pdf(x), pdf, rtol=1e-12, atol=1e-300)
+        np.testing.assert_allclose(dist.cdf(x), cdf, rtol=1e-12)
+        np.testing.assert_allclose(dist.ppf(q), ppf, rtol=1e-12)
+
+        self.assertEqual(dist.pdf(0.3), _pdf_instance(0.3, norm.pdf, loc, scale, delta, epsilon))
+        self.assertEqual(dist.ppf(0.3), _qqf_instance(0.3, norm.ppf, loc, scale, delta, epsilon))
+
+    def test_shape_preserved(self):
+        dist = ssas(delta=2.0)
+        x = np.linspace(-3, 3, 12).reshape(3, 4)
+        self.assertEqual(dist.pdf(x).shape, (3, 4))
+        self.assertEqual(dist.random_sample(50).shape, (50,))
+
+    @parameterized.expand([
+        ['numpy'],
+        ['numba'], ])
+    def test_scalar_results(self, backend):
+        if backend == 'numba' and importlib.util.find_spec('numba') is None:
+            self.skipTest('numba is not installed')
+        dist = sinhasinh(loc=0.5, scale=2.0, delta=1.5, epsilon=0.2)
+        batch = sinhasinh(loc=np.array(0.5), scale=2.0, delta=1.5, epsilon=0.2)
+        with use_backend(backend):
+            for name in ('pdf', 'cdf', 'ppf', 'logpdf', 'logcdf', 'sf', 'logsf', 'isf'):
+                for value in (getattr(dist, name)(np.asarray(0.3)), getattr(batch, name)(0.3)):
+                    self.assertNotIsInstance(value, np.ndarray, name)
+                    self.assertAlmostEqual(value, getattr(dist, name)(0.3), places=12)
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -0,0 +1,56 @@
+import unittest
+
+import numpy as np
+from parameterized import parameterized
+
+from twopiece.scale import tpnorm, tpstudent
+from twopiece.double import dtpgennorm
+from twopiece.sinharcsinh import sinhasinh
+
+
+class TestStream(unittest.TestCase):
+
+    @parameterized.expand([
+        [tpnorm(loc=0.5, sigma1=1.0, sigma2=2.0)],
+        [tpstudent(loc=0.5, sigma1=1.0, sigma2=2.0, shape=4.0)],
+        [dtpgennorm(loc=0.5, sigma1=1.0, sigma2=2.0, shape1=1.5, shape2=3.0)],
+        [sinhasinh(loc=0.5, scale=2.0, delta=0.8, epsilon=0.4)], ])
+    def test_blocks_reuse_buffer(self, dist):
+        blocks = dist.iter_random_sample(1000, n_chunks=3, random_state=0)
+        first = next(blocks)
+        first_values = first.copy()
+        rest = list(blocks)
+        self.assertTrue(all(block is first for block in rest))
+        self.assertFalse(np.array_equal(first, first_values))
+
+        chunks = [np.linspace(-3, 3, 10), np.linspace(3, 6, 10), np.linspace(-6, 0, 7)]
+        for method, imap in ((dist.pdf, dist.imap_pdf), (dist.cdf, dist.imap_cdf), (dist.logpdf, dist.imap_logpdf)):
+            outputs = [(block, block.copy()) for block in imap(iter(chunks))]
+            self.assertIs(outputs[0][0], outputs[1][0])
+            for chunk, (_, values) in zip(chunks, outputs):
+                np.testing.assert_allclose(values, method(chunk))
+
+        q = [np.linspace(0.1, 0.9, 5)]
+        np.testing.assert_allclose(next(dist.imap_ppf(q)), dist.ppf(q[0]))
+
+    def test_unbounded_stream(self):
+        dist = tpnorm(loc=0.0, sigma1=1.0, sigma2=1.0)
+        blocks = dist.iter_random_sample(10, random_state=np.random.default_rng(1))
+        total = sum(next(blocks).sum() for _ in range(100))
+        self.assertTrue(np.isfinite(total))
+        self.assertRaises(ValueError, next, dist.iter_random_sample(0))
+
+    @parameterized.expand([
+        [tpnorm(loc=0.5, sigma1=1.0, sigma2=2.0)],
+        [tpstudent(loc=0.5, sigma1=1.0, sigma2=2.0, shape=4.0)],
+        [dtpgennorm(loc=0.5, sigma1=1.0, sigma2=2.0, shape1=1.5, shape2=3.0)],
+        [sinhasinh(loc=0.5, scale=2.0, delta=0.8, epsilon=0.4)], ])
+    def test_global_random_state(self, dist):
+        np.random.seed(3)
+        first = next(dist.iter_random_sample(5)).copy()
+        np.random.seed(3)
+        np.testing.assert_array_equal(next(dist.iter_random_sample(5)), first)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,68 @@
+import unittest
+
+import numpy as np
+from parameterized import parameterized
+
+from twopiece.scale import tpnorm, tpstudent
+from twopiece.double import dtpgennorm
+from twopiece.shape import tpshastudent
+from twopiece.table import QuantileTable
+
+
+class TestQuantileTable(unittest.TestCase):
+
+    @parameterized.expand([
+        [tpnorm(loc=0.0, sigma1=1.0, sigma2=3.0), 1e-8],
+        [tpstudent(loc=0.5, sigma1=1.0, sigma2=2.0, shape=3.0), 1e-8],
+        [dtpgennorm(loc=0.0, sigma1=1.0, sigma2=2.0, shape1=1.2, shape2=3.0), 1e-6],
+        [tpshastudent(loc=0.0, sigma=1.0, shape1=1.5, shape2=10.0), 1e-10], ])
+    def test_accuracy(self, dist, tol):
+        q = np.concatenate([np.random.RandomState(0).random_sample(20000), [0.0, 1e-15, 0.5, 1 - 1e-12, 1.0]])
+        exact = dist.ppf(q)
+        approx = dist.ppf_approx(q, tol=tol)
+
+        finite = np.isfinite(exact)
+        np.testing.assert_array_equal(approx[~finite], exact[~finite])
+        error = np.abs(approx[finite] - exact[finite]) / np.maximum(1, np.abs(exact[finite]))
+        self.assertLess(error.max(), 10 * tol)
+        self.assertAlmostEqual(dist.ppf_approx(0.3, tol=tol), dist.ppf(0.3), delta=10 * tol)
+
+    def test_table_is_reused(self):
+        dist = tpstudent(loc=0.0, sigma1=1.0, sigma2=2.0, shape=4.0)
+        dist.ppf_approx(0.5)
+        table = dist._quantile_table
+        out = np.empty(5)
+        self.assertIs(dist.ppf_approx(np.linspace(0.1, 0.9, 5), out=out), out)
+        self.assertIs(dist._quantile_table, table)
+        dist.ppf_approx(0.5, tol=1e-6)
+        self.assertIsNot(dist._quantile_table, table)
+
+    def test_parameters_changed(self):
+        dist = tpnorm(loc=0.0, sigma1=1.0, sigma2=2.0)
+        dist.ppf_approx(0.3)
+        dist.loc = 5.0
+        self.assertAlmostEqual(dist.ppf_approx(0.3), dist.ppf(0.3), delta=1e-7)
+        dist.sigma2 = 4.0
+        self.assertAlmostEqual(dist.ppf_approx(0.9), dist.ppf(0.9), delta=1e-7)
+
+    def test_nan_and_range(self):
+        dist = tpstudent(loc=0.0, sigma1=1.0, sigma2=2.0, shape=4.0)
+        q = np.array([0.5, np.nan, 0.0, 1.0, 0.2])
+        np.testing.assert_array_equal(dist.ppf_approx(q, tol=1e-6)[1:4], dist.ppf(q)[1:4])
+        self.assertTrue(np.isnan(dist.ppf_approx(np.nan)))
+        self.assertRaises(ValueError, dist.ppf_approx, [0.5, 1.1])
+        self.assertRaises(ValueError, dist.ppf_approx, -0.1)
+
+    def test_max_nodes(self):
+        dist = tpstudent(loc=0.0, sigma1=1.0, sigma2=2.0, shape=4.0)
+        with self.assertWarns(RuntimeWarning):
+            table = QuantileTable(dist.ppf, dist.isf, dist.pdf, dist.cdf(0.0), tol=1e-14, max_nodes=512)
+        self.assertGreater(table.error, 1e-14)
+
+    def test_array_parameters(self):
+        dist = tpnorm(loc=np.array([0.0, 1.0]), sigma1=1.0, sigma2=2.0)
+        self.assertRaises(ValueError, dist.ppf_approx, 0.5)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,5 +1,10 @@
 import unittest
-from twopiece.scale import tpnorm, get_sigma1_sigma2
+from twopiece.scale import tpnorm, tpstudent, tpsas, get_sigma1_sigma2
+from twopiece.utils import get_sigma_gamma, InvalidParameterError
+from twopiece.double import dtpstudent, dtpgennorm, dtpsas
+from twopiece.shape import tpshasas
+from twopiece.sinharcsinh import sinhasinh
+from twopiece.fan import read_fan_parameters
 import numpy as np
 from parameterized import parameterized
 
@@ -37,6 +42,127 @@ class TestTwoPiece(unittest.TestCase):
         self.assertRaises(ValueError, tpnorm, loc=0.0, sigma=1.0, gamma=-1.0, kind='epsilon_skew')
         self.assertRaises(ValueError, tpnorm, loc=0.0, sigma=1.0, gamma=0.0, kind='percentile')
 
+    @parameterized.expand([
+        [tpnorm, {}],
+        [tpstudent, {'shape': np.array([[3.0], [5.0], [10.0]])}],
+        [tpsas, {'shape': np.array([[0.5], [1.0], [2.0]])}],
+        [dtpstudent, {'shape1': np.array([[3.0], [5.0], [10.0]]), 'shape2': 4.0}],
+        [dtpgennorm, {'shape1': 1.5, 'shape2': 2.5}], ])
+    def test_broadcast_parameters(self, dist, shapes):
+        loc = np.array([[0.0], [0.5], [-1.0]])
+        sigma1 = np.array([[1.0], [2.0], [0.5]])
+        sigma2 = np.array([[0.7], [1.0], [3.0]])
+        x = np.linspace(-5, 5, 11)
+        q = np.linspace(0.01, 0.99, 11)
+
+        batch = dist(loc=loc, sigma1=sigma1, sigma2=sigma2, **shapes)
+        pdf, cdf, ppf = batch.pdf(x), batch.cdf(x), batch.ppf(q)
+        self.assertEqual(pdf.shape, (3, 11))
+
+        for i in range(3):
+            params = {k: np.ravel(v)[i] if np.ndim(v) else v for k, v in shapes.items()}
+            single = dist(loc=loc[i, 0], sigma1=sigma1[i, 0], sigma2=sigma2[i, 0], **params)
+            np.testing.assert_allclose(pdf[i], single.pdf(x), rtol=1e-12)
+            np.testing.assert_allclose(cdf[i], single.cdf(x), rtol=1e-12)
+            np.testing.assert_allclose(ppf[i], single.ppf(q), rtol=1e-12)
+
+        self.assertEqual(batch.random_sample((5, 3, 1)).shape, (5, 3, 1))
+
+    def test_broadcast_parametrisation(self):
+        sigma = np.array([0.61, 0.88, 1.11])
+        gamma = np.array([0.0, 0.3, -0.2])
+        sigma1, sigma2 = get_sigma1_sigma2(sigma, gamma, kind='boe')
+        for i in range(3):
+            s1, s2 = get_sigma1_sigma2(sigma[i], gamma[i], kind='boe')
+            self.assertAlmostEqual(sigma1[i], s1)
+            self.assertAlmostEqual(sigma2[i], s2)
+
+        dist = tpnorm(loc=0.0, sigma=sigma, gamma=gamma, kind='boe')
+        self.assertEqual(dist.ppf(0.5).shape, (3,))
+
+    @parameterized.expand([
+        ['inverse_scale', np.array([0.4, 1.0, 2.5])],
+        ['epsilon_skew', np.array([-0.6, 0.0, 0.3])],
+        ['percentile', np.array([0.2, 0.5, 0.9])],
+        ['boe', np.array([-1.5, 0.0, 0.4])], ])
+    def test_parametrisation_inverse(self, kind, gamma):
+        sigma = np.array([0.61, 0.88, 1.11])
+        sigma1, sigma2 = get_sigma1_sigma2(sigma, gamma, kind=kind)
+        sigma_back, gamma_back = get_sigma_gamma(sigma1, sigma2, kind=kind)
+        np.testing.assert_allclose(sigma_back, sigma, rtol=1e-12)
+        np.testing.assert_allclose(gamma_back, gamma, atol=1e-9)
+
+        s, g = get_sigma_gamma(sigma1[1], sigma2[1], kind=kind)
+        self.assertTrue(np.isscalar(s) and np.isscalar(g))
+
+    def test_parametrisation_shipped_table(self):
+        parameters = read_fan_parameters()
+        sigma, gamma = parameters['uncertainty'], parameters['skewness']
+        sigma1, sigma2 = get_sigma1_sigma2(sigma, gamma, kind='boe')
+        self.assertEqual(sigma1.shape, sigma.shape)
+        sigma_back, gamma_back = get_sigma_gamma(sigma1, sigma2, kind='boe')
+        np.testing.assert_allclose(sigma_back, sigma, rtol=1e-12)
+        np.testing.assert_allclose(gamma_back, gamma, atol=1e-12)
+
+        # the same horizons with a skew of a quarter of the uncertainty, alternating in sign
+        gamma = 0.25 * sigma * (-1) ** np.arange(sigma.size)
+        sigma_back, gamma_back = get_sigma_gamma(*get_sigma1_sigma2(sigma, gamma, kind='boe'), kind='boe')
+        np.testing.assert_allclose(sigma_back, sigma, rtol=1e-12)
+        np.testing.assert_allclose(gamma_back, gamma, rtol=1e-9)
+
+    def test_parametrisation_offending_indices(self):
+        gamma = np.array([0.2, 0.0, 0.7, 1.3, np.nan])
+        with self.assertRaises(InvalidParameterError) as context:
+            get_sigma1_sigma2(1.0, gamma, kind='percentile')
+        self.assertEqual(context.exception.indices, [1, 3, 4])
+        self.assertIn('[1, 3, 4]', str(context.exception))
+
+        with self.assertRaises(ValueError) as context:
+            get_sigma_gamma(np.array([[1.0, -1.0], [2.0, 1.0]]), 1.0, kind='boe')
+        self.assertEqual(context.exception.indices, [(0, 1)])
+
+        self.assertRaises(ValueError, get_sigma1_sigma2, 0.0, 0.5, kind='inverse_scale')
+
+    @parameterized.expand([
+        [tpnorm(loc=0.5, sigma1=1.0, sigma2=2.0)],
+        [tpstudent(loc=0.5, sigma1=1.0, sigma2=2.0, shape=4.0)],
+        [tpsas(loc=0.5, sigma1=1.0, sigma2=2.0, shape=1.5)],
+        [dtpstudent(loc=0.5, sigma1=1.0, sigma2=2.0, shape1=3.0, shape2=8.0)],
+        [dtpsas(loc=0.5, sigma1=1.0, sigma2=2.0, shape1=0.5, shape2=2.0)],
+        [tpshasas(loc=0.5, sigma=1.0, shape1=0.5, shape2=2.0)],
+        [sinhasinh(loc=0.5, scale=2.0, delta=1.5, epsilon=0.2)], ])
+    def test_shape_and_dtype(self, dist):
+        x = np.linspace(-4, 4, 24).reshape(2, 3, 4)
+        q = np.linspace(0.01, 0.99, 24).reshape(2, 3, 4)
+
+        for method, values in ((dist.pdf, x), (dist.cdf, x), (dist.ppf, q)):
+            expected = method(values.ravel())
+            output = method(values)
+            self.assertEqual(output.shape, (2, 3, 4))
+            self.assertEqual(output.dtype, np.float64)
+            np.testing.assert_allclose(output.ravel(), expected, rtol=1e-12)
+
+            output32 = method(values.astype(np.float32))
+            self.assertEqual(output32.dtype, np.float32)
+            np.testing.assert_allclose(output32.ravel(), expected, rtol=1e-4, atol=1e-6)
+
+            out = np.empty((2, 3, 4), dtype=np.float32)
+            self.assertIs(method(values, out=out), out)
+            np.testing.assert_allclose(out.ravel(), expected, rtol=1e-4, atol=1e-6)
+
+    @parameterized.expand([
+        [tpnorm, {}],
+        [tpstudent, {'shape': 4.0}],
+        [dtpstudent, {'shape1': 3.0, 'shape2': 8.0}],
+        [dtpgennorm, {'shape1': 1.5, 'shape2': 2.5}], ])
+    def test_scalar_results(self, family, shapes):
+        dist = family(loc=0.5, sigma1=1.0, sigma2=2.0, **shapes)
+        batch = family(loc=np.array(0.5), sigma1=1.0, sigma2=2.0, **shapes)
+        for name in ('pdf', 'cdf', 'ppf', 'logpdf', 'logcdf', 'sf', 'logsf', 'isf'):
+            for value in (getattr(dist, name)(np.asarray(0.3)), getattr(batch, name)(0.3)):
+                self.assertNotIsInstance(value, np.ndarray, name)
+                self.assertAlmostEqual(value, getattr(dist, name)(0.3), places=12)
+
 
 if __name__ == '__main__':
     unittest.main(verbosity=2)
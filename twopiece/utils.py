@@ -1,50 +1,146 @@
-import math
+from numpy import min, max, arange, pi, asarray, isscalar, sqrt, where, abs, isnan, argwhere, broadcast_arrays
 
-import matplotlib.pyplot as plt
-from numpy import min, max, arange, pi
-from seaborn import distplot
-from seaborn import set
+from twopiece.grid import grid_points
 
-set(style='whitegrid', rc={"grid.linewidth": 0.75, "figure.figsize": (9, 6)})
+_plotting = None
+
+
+def _plotting_modules():
+    """
+    Imports matplotlib and seaborn on first use and sets the plotting style, so that importing the package does
+    not depend on them.
+    :return: tuple (matplotlib.pyplot, seaborn)
+    """
+    global _plotting
+    if _plotting is None:
+        import matplotlib.pyplot as plt
+        import seaborn
+
+        seaborn.set(style='whitegrid', rc={"grid.linewidth": 0.75, "figure.figsize": (9, 6)})
+        _plotting = plt, seaborn
+    return _plotting
+
+
+def all_scalar(*args):
+    """
+    Checks whether every argument is a scalar, in which case the scalar code paths apply.
+    :param args: values and parameters
+    :return: boolean
+    """
+    return all(isscalar(arg) for arg in args)
+
+
+class InvalidParameterError(ValueError):
+
+    def __init__(self, message, indices=()):
+        """
+        Invalid parameter values.
+        :param message: error message
+        :param indices: indices of the offending entries when the parameters are arrays
+        """
+        self.indices = indices
+        if len(indices):
+            shown = ', '.join(str(i) for i in indices[:10]) + (', ...' if len(indices) > 10 else '')
+            message = f'{message} Offending indices: [{shown}].'
+        super().__init__(message)
+
+
+def _check_parameter(invalid, message):
+    # invalid is a boolean array flagging the offending entries; NaN values must be flagged by the caller
+    if invalid.any():
+        if invalid.ndim == 0:
+            raise InvalidParameterError(message)
+        indices = [tuple(int(j) for j in i) if invalid.ndim > 1 else int(i[0]) for i in argwhere(invalid)]
+        raise InvalidParameterError(message, indices)
+
+
+def _check_kind(kind):
+    if kind not in {'inverse_scale', 'epsilon_skew', 'percentile', 'boe'}:
+        raise ValueError('Invalid value of kind provided. Valid values '
+                         'are boe, inverse_scale, epsilon_skew, percentile.')
 
 
 def get_sigma1_sigma2(sigma, gamma, kind):
     """
     Gets the scale parameters sigma1, sigma2 from sigma and gamma
-    :param sigma: scale parameter
-    :param gamma: skewness or asymmetry parameter
+    :param sigma: scale parameter, scalar or array like
+    :param gamma: skewness or asymmetry parameter, scalar or array like
     :param kind: Parametrisation name
-    :return: sigma1 and sigma2 scale parameters
+    :return: sigma1 and sigma2 scale parameters, broadcast against each other
+    :raises InvalidParameterError: a ValueError listing the indices of the invalid entries
     """
+    _check_kind(kind)
+    sigma = asarray(sigma, dtype=float)
+    gamma = asarray(gamma, dtype=float)
+    _check_parameter(~(sigma > 0), 'Sigma parameter must be positive.')
+
     if kind == 'inverse_scale':
-        if gamma <= 0:
-            raise ValueError(f'Gamma parameter must be positive under {kind} parametrisation')
+        _check_parameter(~(gamma > 0), f'Gamma parameter must be positive under {kind} parametrisation.')
         sigma1 = sigma / gamma
         sigma2 = sigma * gamma
     elif kind == 'epsilon_skew':
-        if gamma >= 1 or gamma <= -1:
-            raise ValueError(f'Gamma parameter must be in (-1, 1) under {kind} parametrisation')
+        _check_parameter(~(abs(gamma) < 1), f'Gamma parameter must be in (-1, 1) under {kind} parametrisation.')
         sigma1 = sigma * (1 + gamma)
         sigma2 = sigma * (1 - gamma)
     elif kind == 'percentile':
-        if gamma >= 1 or gamma <= 0:
-            raise ValueError(f'Gamma parameter must be in (0,1) under {kind} parametrisation')
+        _check_parameter(~((gamma > 0) & (gamma < 1)), f'Gamma parameter must be in (0,1) under {kind} '
+                                                       f'parametrisation.')
         sigma1 = sigma * gamma
         sigma2 = sigma * (1 - gamma)
-    elif kind == 'boe':
-        if gamma == 0:
-            actual_gamma = 0
-        else:
-            s = gamma / sigma
-            actual_gamma_unsigned = math.sqrt(1 - 4 * ((math.sqrt(1 + pi * s ** 2) - 1) / (pi * s ** 2)) ** 2)
-            actual_gamma = actual_gamma_unsigned if gamma > 0 else -actual_gamma_unsigned
-        sigma1 = sigma / math.sqrt(1 + actual_gamma)
-        sigma2 = sigma / math.sqrt(1 - actual_gamma)
     else:
-        raise ValueError('Invalid value of kind provided. Valid values '
-                         'are boe, inverse_scale, epsilon_skew, percentile.')
+        _check_parameter(isnan(gamma), f'Gamma parameter must be a number under {kind} parametrisation.')
+        s = gamma / sigma
+        ps2 = pi * s ** 2
+        # 1 - 4 ratio^2 with ratio = (sqrt(1 + ps2) - 1) / ps2, written without cancellation for small ps2
+        root = sqrt(1 + ps2)
+        actual_gamma_unsigned = sqrt(ps2 * (root + 3) / (root + 1) ** 3)
+        actual_gamma = where(gamma > 0, actual_gamma_unsigned, -actual_gamma_unsigned)
+        sigma1 = sigma / sqrt(1 + actual_gamma)
+        sigma2 = sigma / sqrt(1 - actual_gamma)
 
-    return sigma1, sigma2
+    return sigma1[()], sigma2[()]
+
+
+def get_sigma_gamma(sigma1, sigma2, kind):
+    """
+    Gets sigma and gamma from the scale parameters sigma1, sigma2; the inverse of get_sigma1_sigma2.
+    :param sigma1: scale parameter, scalar or array like
+    :param sigma2: scale parameter, scalar or array like
+    :param kind: Parametrisation name
+    :return: sigma and gamma parameters, broadcast against each other
+    :raises InvalidParameterError: a ValueError listing the indices of the invalid entries
+    """
+    _check_kind(kind)
+    sigma1 = asarray(sigma1, dtype=float)
+    sigma2 = asarray(sigma2, dtype=float)
+    sigma1, sigma2 = broadcast_arrays(sigma1, sigma2)
+    _check_parameter(~((sigma1 > 0) & (sigma2 > 0)), 'Scale parameters must be positive.')
+
+    if kind == 'inverse_scale':
+        sigma = sqrt(sigma1 * sigma2)
+        gamma = sqrt(sigma2 / sigma1)
+    elif kind == 'epsilon_skew':
+        sigma = (sigma1 + sigma2) / 2
+        gamma = (sigma1 - sigma2) / (sigma1 + sigma2)
+    elif kind == 'percentile':
+        sigma = sigma1 + sigma2
+        gamma = sigma1 / (sigma1 + sigma2)
+    else:
+        # sigma is the scale of the normal with the same mode density, gamma = mean - mode
+        sigma = sqrt(2 / (1 / sigma1 ** 2 + 1 / sigma2 ** 2))
+        gamma = sqrt(2 / pi) * (sigma2 - sigma1)
+
+    return sigma[()], gamma[()]
+
+
+def _on_grid(dist, name, start, step, num):
+    # Values of dist.pdf or dist.cdf on a regular grid, through the cached pdf_grid and cdf_grid when dist has them
+    # and scalar parameters
+    x = grid_points(start, step, num)
+    params = getattr(dist, 'params', None)
+    if hasattr(dist, name + '_grid') and params is not None and all(p is None or isscalar(p) for p in params):
+        return x, getattr(dist, name + '_grid')(start, step, num)
+    return x, getattr(dist, name)(x)
 
 
 def display_dist(dist, name='', color='dodgerblue', bound=False, show='random_sample', xlim=None):
@@ -58,11 +154,11 @@ def display_dist(dist, name='', color='dodgerblue', bound=False, show='random_sa
     :param xlim: overwrites the xlim for the plots
     :return: 1
     """
+    plt, seaborn = _plotting_modules()
 
     if show in ['All', 'pdf']:
 
-        x = arange(-10, 10, 0.01)
-        y = dist.pdf(x)
+        x, y = _on_grid(dist, 'pdf', -10, 0.01, 2000)
         plt.figure('Probability Density Function')
         plt.plot(x, y, marker='', linestyle='solid', color=color)
         if xlim:
@@ -71,8 +167,7 @@ def display_dist(dist, name='', color='dodgerblue', bound=False, show='random_sa
         plt.show()
 
     if show in ['All', 'cdf']:
-        x = arange(-10, 10, 0.01)
-        y = dist.cdf(x)
+        x, y = _on_grid(dist, 'cdf', -10, 0.01, 2000)
         plt.figure('Cumulative Distribution Function')
         plt.plot(x, y, marker='', linestyle='solid', color=color)
         if xlim:
@@ -96,8 +191,8 @@ def display_dist(dist, name='', color='dodgerblue', bound=False, show='random_sa
             sample = sample[abs(sample) < 25]
 
         plt.figure('Random Sample')
-        distplot(sample, bins=50, kde=False, norm_hist=True,
-                 hist_kws=dict(edgecolor="white", color=color, linewidth=1.0, alpha=0.60))
+        seaborn.distplot(sample, bins=50, kde=False, norm_hist=True,
+                         hist_kws=dict(edgecolor="white", color=color, linewidth=1.0, alpha=0.60))
         x = arange(min(sample) - 2, max(sample) + 2, 0.01)
         y = dist.pdf(x)
         plt.plot(x, y, marker='', linestyle='solid', color=color)